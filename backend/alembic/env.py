@@ -0,0 +1,90 @@
+"""
+Alembic migration environment for ProofPals
+
+Uses the application's DATABASE_URL and model metadata. Runs either from
+the command line (``alembic upgrade head``) or in-process from
+``database.run_migrations`` with an existing connection.
+"""
+
+import asyncio
+from logging.config import fileConfig
+
+from sqlalchemy import pool, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from alembic import context
+
+from database import Base, DATABASE_URL
+import models  # noqa: F401  (registers all tables on Base.metadata)
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Serializes concurrent upgrades (e.g. several workers migrating at boot)
+MIGRATION_LOCK_ID = 7301942
+
+
+def run_migrations_offline() -> None:
+    """Emit migration SQL without a database connection"""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection) -> None:
+    """Run migrations on a sync connection, holding the migration lock"""
+    is_postgres = connection.dialect.name == "postgresql"
+    if is_postgres:
+        # Rewrites, backfills and index builds may outlast any request-sized
+        # timeout set on the role or connection
+        connection.execute(text("SET statement_timeout = 0"))
+        connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        connection.commit()
+
+    try:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    finally:
+        if is_postgres:
+            connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+            connection.commit()
+
+
+async def run_async_migrations() -> None:
+    """Create a throwaway engine and run migrations through it"""
+    connectable = create_async_engine(DATABASE_URL, poolclass=pool.NullPool)
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    """Run migrations against the live database"""
+    connection = config.attributes.get("connection")
+    if connection is None:
+        asyncio.run(run_async_migrations())
+    else:
+        do_run_migrations(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
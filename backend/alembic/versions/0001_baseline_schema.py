@@ -0,0 +1,252 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+Captures the schema previously produced by ``Base.metadata.create_all`` plus
+the ad-hoc ``migrate_add_crypto_keys.py`` / ``migrate_add_user_to_submissions.py``
+scripts. Databases created before migrations existed already have these
+tables; for those the revision only fills in the ad-hoc columns and is then
+stamped.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# Statements from the pre-migration ad-hoc scripts, all idempotent
+LEGACY_STATEMENTS = [
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS public_key_hex VARCHAR(128)",
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS private_key_hex VARCHAR(128)",
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS key_seed_hex VARCHAR(64)",
+    "ALTER TABLE submissions ADD COLUMN IF NOT EXISTS user_id INTEGER REFERENCES users(id)",
+    "CREATE INDEX IF NOT EXISTS ix_submissions_user_id ON submissions(user_id)",
+]
+
+
+def _upgrade_legacy() -> None:
+    """Bring a create_all-era database up to the baseline"""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for statement in LEGACY_STATEMENTS:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("users"):
+        _upgrade_legacy()
+        return
+
+    op.create_table('audit_logs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('entity_type', sa.String(length=50), nullable=False),
+    sa.Column('entity_id', sa.String(length=100), nullable=False),
+    sa.Column('details', sa.JSON(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_audit_entity', 'audit_logs', ['entity_type', 'entity_id'], unique=False)
+    op.create_index('idx_audit_event_timestamp', 'audit_logs', ['event_type', 'timestamp'], unique=False)
+    op.create_index('idx_audit_timestamp', 'audit_logs', ['timestamp'], unique=False)
+    op.create_index(op.f('ix_audit_logs_event_type'), 'audit_logs', ['event_type'], unique=False)
+    op.create_index(op.f('ix_audit_logs_id'), 'audit_logs', ['id'], unique=False)
+    op.create_index(op.f('ix_audit_logs_timestamp'), 'audit_logs', ['timestamp'], unique=False)
+    op.create_table('reviewers',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('credential_hash', sa.String(length=64), nullable=False),
+    sa.Column('profile_hash', sa.String(length=64), nullable=True),
+    sa.Column('credential_meta', sa.JSON(), nullable=True),
+    sa.Column('reputation_score', sa.Integer(), nullable=False),
+    sa.Column('reputation_history', sa.JSON(), nullable=True),
+    sa.Column('revoked', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_reviewer_revoked', 'reviewers', ['revoked'], unique=False)
+    op.create_index(op.f('ix_reviewers_credential_hash'), 'reviewers', ['credential_hash'], unique=True)
+    op.create_index(op.f('ix_reviewers_id'), 'reviewers', ['id'], unique=False)
+    op.create_index(op.f('ix_reviewers_reputation_score'), 'reviewers', ['reputation_score'], unique=False)
+    op.create_index(op.f('ix_reviewers_revoked'), 'reviewers', ['revoked'], unique=False)
+    op.create_table('rings',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('genre', sa.String(length=100), nullable=False),
+    sa.Column('pubkeys', sa.JSON(), nullable=False),
+    sa.Column('epoch', sa.Integer(), nullable=False),
+    sa.Column('active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_ring_epoch', 'rings', ['epoch'], unique=False)
+    op.create_index('idx_ring_genre_epoch_active', 'rings', ['genre', 'epoch', 'active'], unique=False)
+    op.create_index(op.f('ix_rings_active'), 'rings', ['active'], unique=False)
+    op.create_index(op.f('ix_rings_epoch'), 'rings', ['epoch'], unique=False)
+    op.create_index(op.f('ix_rings_genre'), 'rings', ['genre'], unique=False)
+    op.create_index(op.f('ix_rings_id'), 'rings', ['id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('public_key_hex', sa.String(length=128), nullable=True),
+    sa.Column('private_key_hex', sa.String(length=128), nullable=True),
+    sa.Column('key_seed_hex', sa.String(length=64), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('last_login_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_user_email_active', 'users', ['email', 'is_active'], unique=False)
+    op.create_index('idx_user_role', 'users', ['role'], unique=False)
+    op.create_index('idx_user_username_active', 'users', ['username', 'is_active'], unique=False)
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_is_active'), 'users', ['is_active'], unique=False)
+    op.create_index(op.f('ix_users_public_key_hex'), 'users', ['public_key_hex'], unique=True)
+    op.create_index(op.f('ix_users_role'), 'users', ['role'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('api_keys',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('key_hash', sa.String(length=64), nullable=False),
+    sa.Column('scopes', sa.JSON(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_apikey_hash_active', 'api_keys', ['key_hash', 'is_active'], unique=False)
+    op.create_index('idx_apikey_user', 'api_keys', ['user_id'], unique=False)
+    op.create_index(op.f('ix_api_keys_id'), 'api_keys', ['id'], unique=False)
+    op.create_index(op.f('ix_api_keys_is_active'), 'api_keys', ['is_active'], unique=False)
+    op.create_index(op.f('ix_api_keys_key_hash'), 'api_keys', ['key_hash'], unique=True)
+    op.create_index(op.f('ix_api_keys_user_id'), 'api_keys', ['user_id'], unique=False)
+    op.create_table('revocations',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('credential_hash', sa.String(length=64), nullable=False),
+    sa.Column('reason', sa.String(length=200), nullable=False),
+    sa.Column('evidence', sa.Text(), nullable=True),
+    sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('revoked_by', sa.String(length=100), nullable=True),
+    sa.ForeignKeyConstraint(['credential_hash'], ['reviewers.credential_hash'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_revocation_credential', 'revocations', ['credential_hash'], unique=False)
+    op.create_index('idx_revocation_date', 'revocations', ['revoked_at'], unique=False)
+    op.create_index(op.f('ix_revocations_credential_hash'), 'revocations', ['credential_hash'], unique=False)
+    op.create_index(op.f('ix_revocations_id'), 'revocations', ['id'], unique=False)
+    op.create_table('submissions',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('genre', sa.String(length=100), nullable=False),
+    sa.Column('content_ref', sa.String(length=500), nullable=False),
+    sa.Column('submitter_ip_hash', sa.String(length=64), nullable=False),
+    sa.Column('submitter_mac_hash', sa.String(length=64), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'APPROVED', 'REJECTED', 'ESCALATED', 'FLAGGED', name='submissionstatus'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('last_tallied_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_submission_created', 'submissions', ['created_at'], unique=False)
+    op.create_index('idx_submission_genre_status', 'submissions', ['genre', 'status'], unique=False)
+    op.create_index(op.f('ix_submissions_genre'), 'submissions', ['genre'], unique=False)
+    op.create_index(op.f('ix_submissions_id'), 'submissions', ['id'], unique=False)
+    op.create_index(op.f('ix_submissions_status'), 'submissions', ['status'], unique=False)
+    op.create_index(op.f('ix_submissions_user_id'), 'submissions', ['user_id'], unique=False)
+    op.create_table('tokens',
+    sa.Column('token_id', sa.String(length=64), nullable=False),
+    sa.Column('credential_hash', sa.String(length=64), nullable=False),
+    sa.Column('epoch', sa.Integer(), nullable=False),
+    sa.Column('redeemed', sa.Boolean(), nullable=False),
+    sa.Column('redeemed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['credential_hash'], ['reviewers.credential_hash'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('token_id')
+    )
+    op.create_index('idx_token_credential', 'tokens', ['credential_hash'], unique=False)
+    op.create_index('idx_token_redeemed_epoch', 'tokens', ['redeemed', 'epoch'], unique=False)
+    op.create_index(op.f('ix_tokens_credential_hash'), 'tokens', ['credential_hash'], unique=False)
+    op.create_index(op.f('ix_tokens_epoch'), 'tokens', ['epoch'], unique=False)
+    op.create_index(op.f('ix_tokens_redeemed'), 'tokens', ['redeemed'], unique=False)
+    op.create_table('escalations',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('submission_id', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.String(length=200), nullable=False),
+    sa.Column('evidence_blob', sa.JSON(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'UNDER_REVIEW', 'RESOLVED', 'DISMISSED', name='escalationstatus'), nullable=False),
+    sa.Column('requested_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('resolver_notes', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['submission_id'], ['submissions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_escalation_requested', 'escalations', ['requested_at'], unique=False)
+    op.create_index('idx_escalation_status', 'escalations', ['status'], unique=False)
+    op.create_index(op.f('ix_escalations_id'), 'escalations', ['id'], unique=False)
+    op.create_index(op.f('ix_escalations_status'), 'escalations', ['status'], unique=False)
+    op.create_index(op.f('ix_escalations_submission_id'), 'escalations', ['submission_id'], unique=False)
+    op.create_table('tallies',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('submission_id', sa.Integer(), nullable=False),
+    sa.Column('count_approve', sa.Integer(), nullable=False),
+    sa.Column('count_escalate', sa.Integer(), nullable=False),
+    sa.Column('count_reject', sa.Integer(), nullable=False),
+    sa.Column('count_flag', sa.Integer(), nullable=False),
+    sa.Column('final_decision', sa.String(length=20), nullable=True),
+    sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['submission_id'], ['submissions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('submission_id')
+    )
+    op.create_index('idx_tally_computed', 'tallies', ['computed_at'], unique=False)
+    op.create_index('idx_tally_decision', 'tallies', ['final_decision'], unique=False)
+    op.create_index(op.f('ix_tallies_final_decision'), 'tallies', ['final_decision'], unique=False)
+    op.create_index(op.f('ix_tallies_id'), 'tallies', ['id'], unique=False)
+    op.create_table('votes',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('submission_id', sa.Integer(), nullable=False),
+    sa.Column('ring_id', sa.Integer(), nullable=False),
+    sa.Column('signature_blob', sa.Text(), nullable=False),
+    sa.Column('key_image', sa.String(length=64), nullable=False),
+    sa.Column('vote_type', sa.Enum('APPROVE', 'ESCALATE', 'REJECT', 'FLAG', name='votetype'), nullable=False),
+    sa.Column('token_id', sa.String(length=64), nullable=False),
+    sa.Column('verified', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['ring_id'], ['rings.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['submission_id'], ['submissions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('submission_id', 'key_image', name='uq_vote_submission_keyimage')
+    )
+    op.create_index('idx_vote_keyimage', 'votes', ['key_image'], unique=False)
+    op.create_index('idx_vote_submission_created', 'votes', ['submission_id', 'created_at'], unique=False)
+    op.create_index('idx_vote_submission_keyimage', 'votes', ['submission_id', 'key_image'], unique=False)
+    op.create_index('idx_vote_token', 'votes', ['token_id'], unique=False)
+    op.create_index(op.f('ix_votes_id'), 'votes', ['id'], unique=False)
+    op.create_index(op.f('ix_votes_key_image'), 'votes', ['key_image'], unique=False)
+    op.create_index(op.f('ix_votes_ring_id'), 'votes', ['ring_id'], unique=False)
+    op.create_index(op.f('ix_votes_submission_id'), 'votes', ['submission_id'], unique=False)
+    op.create_index(op.f('ix_votes_token_id'), 'votes', ['token_id'], unique=False)
+    op.create_index(op.f('ix_votes_vote_type'), 'votes', ['vote_type'], unique=False)
+
+
+def downgrade() -> None:
+    for table in (
+        'votes', 'tallies', 'escalations', 'tokens', 'submissions',
+        'revocations', 'api_keys', 'users', 'rings', 'reviewers', 'audit_logs',
+    ):
+        op.drop_table(table)
+    for enum_name in ('votetype', 'escalationstatus', 'submissionstatus'):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
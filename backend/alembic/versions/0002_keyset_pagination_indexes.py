@@ -0,0 +1,42 @@
+"""keyset pagination indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 11:00:00.000000
+
+Composite (created_at, id) indexes backing cursor pagination. Built
+concurrently so votes and submissions stay writable during the deploy.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('idx_submission_created_id', 'submissions', ['created_at', 'id']),
+    ('idx_submission_status_created_id', 'submissions', ['status', 'created_at', 'id']),
+    ('idx_submission_user_created_id', 'submissions', ['user_id', 'created_at', 'id']),
+    ('idx_vote_created_id', 'votes', ['created_at', 'id']),
+    ('idx_escalation_status_requested_id', 'escalations', ['status', 'requested_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+        # Superseded by idx_submission_created_id
+        op.drop_index('idx_submission_created', table_name='submissions', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('idx_submission_created', 'submissions', ['created_at'], postgresql_concurrently=True)
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
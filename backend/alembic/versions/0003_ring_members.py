@@ -0,0 +1,99 @@
+"""ring_members table replacing rings.pubkeys
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 13:00:00.000000
+
+Moves ring membership from the rings.pubkeys JSON array into one row per
+key, and adds rings.version / rings.member_count.
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+rings = sa.table(
+    'rings',
+    sa.column('id', sa.Integer),
+    sa.column('pubkeys', sa.JSON),
+    sa.column('version', sa.Integer),
+    sa.column('member_count', sa.Integer),
+)
+ring_members = sa.table(
+    'ring_members',
+    sa.column('ring_id', sa.Integer),
+    sa.column('position', sa.Integer),
+    sa.column('pubkey', sa.LargeBinary),
+)
+
+
+def upgrade() -> None:
+    op.create_table('ring_members',
+    sa.Column('ring_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('pubkey', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['ring_id'], ['rings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ring_id', 'position'),
+    sa.UniqueConstraint('ring_id', 'pubkey', name='uq_ring_member_pubkey')
+    )
+    op.add_column('rings', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('rings', sa.Column('member_count', sa.Integer(), server_default='0', nullable=False))
+
+    bind = op.get_bind()
+    for ring_id, pubkeys in bind.execute(sa.select(rings.c.id, rings.c.pubkeys)).all():
+        members = []
+        for pk in pubkeys or []:
+            try:
+                pubkey = bytes.fromhex(pk)
+            except (TypeError, ValueError):
+                logger.warning(f"Ring {ring_id}: skipping malformed public key {pk!r}")
+                continue
+            if pubkey not in members:
+                members.append(pubkey)
+        if members:
+            bind.execute(ring_members.insert(), [
+                {"ring_id": ring_id, "position": position, "pubkey": pubkey}
+                for position, pubkey in enumerate(members)
+            ])
+        bind.execute(
+            rings.update().where(rings.c.id == ring_id)
+            .values(member_count=len(members), version=1)
+        )
+
+    op.create_index('idx_ring_member_pubkey', 'ring_members', ['pubkey'], unique=False)
+    with op.batch_alter_table('rings') as batch_op:
+        batch_op.drop_column('pubkeys')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('rings') as batch_op:
+        batch_op.add_column(sa.Column('pubkeys', sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    members = {}
+    for ring_id, pubkey in bind.execute(
+        sa.select(ring_members.c.ring_id, ring_members.c.pubkey)
+        .order_by(ring_members.c.ring_id, ring_members.c.position)
+    ).all():
+        members.setdefault(ring_id, []).append(pubkey.hex())
+    for ring_id, in bind.execute(sa.select(rings.c.id)).all():
+        bind.execute(
+            rings.update().where(rings.c.id == ring_id)
+            .values(pubkeys=members.get(ring_id, []))
+        )
+
+    with op.batch_alter_table('rings') as batch_op:
+        batch_op.alter_column('pubkeys', existing_type=sa.JSON(), nullable=False)
+        batch_op.drop_column('member_count')
+        batch_op.drop_column('version')
+    op.drop_index('idx_ring_member_pubkey', table_name='ring_members')
+    op.drop_table('ring_members')
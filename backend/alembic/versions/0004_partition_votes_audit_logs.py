@@ -0,0 +1,160 @@
+"""monthly partitions for votes and audit_logs
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 15:00:00.000000
+
+Converts votes (created_at) and audit_logs (timestamp) into range
+partitioned tables with one partition per month plus a default partition.
+Partitioned tables cannot hold a unique constraint that omits the partition
+key, so double-vote protection moves to the new vote_nullifiers table.
+
+On PostgreSQL this rewrites both tables under an exclusive lock; run it in
+a maintenance window. Other databases only get vote_nullifiers.
+"""
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+# Rewrites votes and audit_logs under an exclusive lock; never run at startup
+MAINTENANCE_WINDOW = True
+
+# Months created ahead of the current one; partition_service keeps this topped up
+PREMAKE_MONTHS = 3
+
+PARTITIONED = {
+    'votes': {
+        'key': 'created_at',
+        'foreign_keys': [
+            ('votes_submission_id_fkey', 'submissions', ['submission_id'], ['id']),
+            ('votes_ring_id_fkey', 'rings', ['ring_id'], ['id']),
+        ],
+        'indexes': [
+            ('ix_votes_id', ['id']),
+            ('ix_votes_submission_id', ['submission_id']),
+            ('ix_votes_ring_id', ['ring_id']),
+            ('ix_votes_key_image', ['key_image']),
+            ('ix_votes_vote_type', ['vote_type']),
+            ('ix_votes_token_id', ['token_id']),
+            ('idx_vote_submission_keyimage', ['submission_id', 'key_image']),
+            ('idx_vote_submission_created', ['submission_id', 'created_at']),
+            ('idx_vote_token', ['token_id']),
+            ('idx_vote_keyimage', ['key_image']),
+            ('idx_vote_created_id', ['created_at', 'id']),
+        ],
+    },
+    'audit_logs': {
+        'key': 'timestamp',
+        'foreign_keys': [],
+        'indexes': [
+            ('ix_audit_logs_id', ['id']),
+            ('ix_audit_logs_event_type', ['event_type']),
+            ('ix_audit_logs_timestamp', ['timestamp']),
+            ('idx_audit_event_timestamp', ['event_type', 'timestamp']),
+            ('idx_audit_entity', ['entity_type', 'entity_id']),
+            ('idx_audit_timestamp', ['timestamp']),
+        ],
+    },
+}
+
+
+def _add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_partitions(table: str, key: str) -> None:
+    """One partition per month from the oldest row through PREMAKE_MONTHS ahead"""
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text(f'SELECT min("{key}") FROM {table}_legacy')).scalar()
+    today = datetime.now(timezone.utc).date().replace(day=1)
+    month = (oldest.date() if oldest else today).replace(day=1)
+    last = _add_months(today, PREMAKE_MONTHS)
+
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {table}_y{month.year:04d}m{month.month:02d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{upper.isoformat()} 00:00:00+00')"
+        )
+        month = upper
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _finish_table(table: str, spec: dict, primary_key: list) -> None:
+    """Primary key, foreign keys and indexes for a freshly created votes/audit_logs"""
+    op.create_primary_key(f'{table}_pkey', table, primary_key)
+    for name, referent, local_cols, remote_cols in spec['foreign_keys']:
+        op.create_foreign_key(name, table, referent, local_cols, remote_cols, ondelete='CASCADE')
+    for name, columns in spec['indexes']:
+        op.create_index(name, table, columns)
+
+
+def _partition(table: str, spec: dict) -> None:
+    key = spec['key']
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {table}_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f'PARTITION BY RANGE ("{key}")'
+    )
+    _create_partitions(table, key)
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_legacy")
+    op.execute(f"DROP TABLE {table}_legacy")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    _finish_table(table, spec, ['id', key])
+
+
+def _unpartition(table: str, spec: dict) -> None:
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {table}_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_partitioned")
+    op.execute(f"DROP TABLE {table}_partitioned CASCADE")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    _finish_table(table, spec, ['id'])
+
+
+def upgrade() -> None:
+    op.create_table('vote_nullifiers',
+    sa.Column('submission_id', sa.Integer(), nullable=False),
+    sa.Column('key_image', sa.String(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['submission_id'], ['submissions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('submission_id', 'key_image')
+    )
+    op.execute(
+        "INSERT INTO vote_nullifiers (submission_id, key_image, created_at) "
+        "SELECT submission_id, key_image, min(created_at) FROM votes "
+        "GROUP BY submission_id, key_image"
+    )
+
+    if op.get_bind().dialect.name != 'postgresql':
+        with op.batch_alter_table('votes') as batch_op:
+            batch_op.drop_constraint('uq_vote_submission_keyimage', type_='unique')
+        return
+
+    for table, spec in PARTITIONED.items():
+        _partition(table, spec)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        for table, spec in PARTITIONED.items():
+            _unpartition(table, spec)
+        op.create_unique_constraint('uq_vote_submission_keyimage', 'votes', ['submission_id', 'key_image'])
+    else:
+        with op.batch_alter_table('votes') as batch_op:
+            batch_op.create_unique_constraint('uq_vote_submission_keyimage', ['submission_id', 'key_image'])
+
+    op.drop_table('vote_nullifiers')
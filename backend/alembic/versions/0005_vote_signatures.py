@@ -0,0 +1,72 @@
+"""move vote signatures to vote_signatures
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 16:00:00.000000
+
+Signatures are only read for audits and re-verification, so they move out
+of votes into their own table. Existing signatures are copied uncompressed
+(PostgreSQL TOAST still compresses large values); new ones are written
+zlib-compressed when VOTE_SIGNATURE_COMPRESSION is set.
+"""
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('vote_signatures',
+    sa.Column('vote_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('submission_id', sa.Integer(), nullable=False),
+    sa.Column('signature', sa.LargeBinary(), nullable=False),
+    sa.Column('compression', sa.String(length=8), nullable=True),
+    sa.ForeignKeyConstraint(['submission_id'], ['submissions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('vote_id')
+    )
+    op.create_index(op.f('ix_vote_signatures_submission_id'), 'vote_signatures', ['submission_id'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        signature = "convert_to(signature_blob, 'UTF8')"
+    else:
+        signature = "CAST(signature_blob AS BLOB)"
+    op.execute(
+        "INSERT INTO vote_signatures (vote_id, submission_id, signature, compression) "
+        f"SELECT id, submission_id, {signature}, NULL FROM votes"
+    )
+
+    with op.batch_alter_table('votes') as batch_op:
+        batch_op.drop_column('signature_blob')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('votes') as batch_op:
+        batch_op.add_column(sa.Column('signature_blob', sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT vote_id, signature, compression FROM vote_signatures"
+    ))
+    for vote_id, signature, compression in rows.fetchall():
+        data = bytes(signature)
+        if compression == 'zlib':
+            data = zlib.decompress(data)
+        bind.execute(
+            sa.text("UPDATE votes SET signature_blob = :blob WHERE id = :id"),
+            {"blob": data.decode('utf-8'), "id": vote_id}
+        )
+
+    # Votes whose signature row is missing get an empty placeholder
+    op.execute("UPDATE votes SET signature_blob = '' WHERE signature_blob IS NULL")
+    with op.batch_alter_table('votes') as batch_op:
+        batch_op.alter_column('signature_blob', existing_type=sa.Text(), nullable=False)
+
+    op.drop_index(op.f('ix_vote_signatures_submission_id'), table_name='vote_signatures')
+    op.drop_table('vote_signatures')
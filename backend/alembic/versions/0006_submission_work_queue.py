@@ -0,0 +1,50 @@
+"""reviewer work queue leases
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 17:00:00.000000
+
+Lease columns on submissions and partial indexes over pending rows only,
+so claiming the oldest unleased item stays an index scan however many
+submissions have already been decided.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+PENDING = sa.text("status = 'PENDING'")
+
+INDEXES = [
+    ('idx_submission_pending_queue', ['created_at', 'id']),
+    ('idx_submission_pending_genre_queue', ['genre', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    op.add_column('submissions', sa.Column('lease_owner', sa.String(length=64), nullable=True))
+    op.add_column('submissions', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name, 'submissions', columns,
+                postgresql_where=PENDING, sqlite_where=PENDING,
+                postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='submissions', postgresql_concurrently=True)
+
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.drop_column('lease_expires_at')
+        batch_op.drop_column('lease_owner')
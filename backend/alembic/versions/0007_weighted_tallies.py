@@ -0,0 +1,84 @@
+"""materialized reputation weights
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 18:00:00.000000
+
+Each vote keeps the reputation weight it was accepted with, and
+weighted_tallies holds the running per-submission sums, so the weighted
+tally endpoint no longer joins votes, tokens and reviewers on every read.
+Existing votes are backfilled from current reputations.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+VOTE_TYPES = ['approve', 'escalate', 'reject', 'flag']
+
+# Mirrors tally_service.reputation_weight; votes without a reviewer stay NULL
+BACKFILL_WEIGHTS = """
+UPDATE votes SET weight = (
+    SELECT CASE
+        WHEN r.reputation_score IS NULL OR r.reputation_score = 0 THEN 1.0
+        WHEN r.reputation_score < 1 THEN 0.01
+        WHEN r.reputation_score > 200 THEN 2.0
+        ELSE r.reputation_score / 100.0
+    END
+    FROM tokens t JOIN reviewers r ON r.credential_hash = t.credential_hash
+    WHERE t.token_id = votes.token_id
+)
+"""
+
+BACKFILL_TALLIES = """
+INSERT INTO weighted_tallies (submission_id, {weight_columns}, {count_columns}, updated_at)
+SELECT submission_id, {weight_sums}, {counts}, CURRENT_TIMESTAMP
+FROM votes
+WHERE verified AND weight IS NOT NULL
+GROUP BY submission_id
+""".format(
+    weight_columns=', '.join(f'weight_{v}' for v in VOTE_TYPES),
+    count_columns=', '.join(f'count_{v}' for v in VOTE_TYPES),
+    weight_sums=', '.join(
+        f"SUM(CASE WHEN vote_type = '{v.upper()}' THEN weight ELSE 0 END)" for v in VOTE_TYPES
+    ),
+    counts=', '.join(
+        f"SUM(CASE WHEN vote_type = '{v.upper()}' THEN 1 ELSE 0 END)" for v in VOTE_TYPES
+    ),
+)
+
+
+def upgrade() -> None:
+    op.add_column('votes', sa.Column('weight', sa.Float(), nullable=True))
+
+    op.create_table(
+        'weighted_tallies',
+        sa.Column('submission_id', sa.Integer(), nullable=False),
+        *[
+            sa.Column(f'weight_{v}', sa.Float(), server_default='0', nullable=False)
+            for v in VOTE_TYPES
+        ],
+        *[
+            sa.Column(f'count_{v}', sa.Integer(), server_default='0', nullable=False)
+            for v in VOTE_TYPES
+        ],
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['submission_id'], ['submissions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('submission_id'),
+    )
+
+    op.execute(BACKFILL_WEIGHTS)
+    op.execute(BACKFILL_TALLIES)
+
+
+def downgrade() -> None:
+    op.drop_table('weighted_tallies')
+
+    with op.batch_alter_table('votes') as batch_op:
+        batch_op.drop_column('weight')
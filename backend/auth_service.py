@@ -4,14 +4,19 @@ Handles user authentication, JWT tokens, and authorization
 """
 
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
+import asyncio
 import hashlib
 import secrets
+import threading
+import time
+from collections import OrderedDict
 import jwt
 import bcrypt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, or_
+from sqlalchemy.exc import IntegrityError
 from pydantic import BaseModel, EmailStr, Field
 
 from config import settings
@@ -66,6 +71,114 @@ class User(BaseModel):
     created_at: datetime
 
 
+# ============================================================================
+# Token Verification Cache
+# ============================================================================
+
+class TokenCache:
+    """
+    Bounded LRU of decoded JWT claims keyed by token digest
+
+    Entries live until the token's own ``exp`` claim, so a cache hit never
+    extends a token's lifetime. Revocation is process-local: revoked digests
+    and per-user cutoffs are kept only until the affected tokens would have
+    expired anyway.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._revoked: Dict[bytes, float] = {}
+        # subject -> (issued-at cutoff, time after which the cutoff is moot)
+        self._user_cutoffs: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        """Digest used as cache key so raw tokens are never held in memory"""
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get cached claims for a token digest
+
+        Args:
+            key: Token digest
+            now: Current unix time (defaults to time.time())
+
+        Returns:
+            Decoded claims or None on miss/expiry
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            if payload["exp"] <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, key: bytes, payload: Dict[str, Any]) -> None:
+        """Cache decoded claims; tokens without a numeric exp are not cached"""
+        if not isinstance(payload.get("exp"), (int, float)):
+            return
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def is_revoked(self, key: bytes, payload: Dict[str, Any]) -> bool:
+        """Check a token against revoked digests and per-user cutoffs"""
+        if key in self._revoked:
+            return True
+        cutoff = self._user_cutoffs.get(str(payload.get("sub")))
+        return cutoff is not None and payload.get("iat", 0) <= cutoff[0]
+
+    def revoke(self, key: bytes, expires_at: float) -> None:
+        """Revoke a single token until its expiry"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._revoked[key] = expires_at
+            self._prune(time.time())
+
+    def revoke_subject(self, subject: str, max_lifetime: float) -> None:
+        """
+        Revoke every token issued to a subject up to now
+
+        The cutoff is compared with sub-second ``iat`` claims; tokens with
+        whole-second ``iat`` from the same second are revoked too.
+        """
+        now = time.time()
+        with self._lock:
+            self._user_cutoffs[subject] = (now, now + max_lifetime)
+            for key in [k for k, p in self._entries.items() if str(p.get("sub")) == subject]:
+                del self._entries[key]
+            self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """Drop revocation records whose tokens have expired anyway"""
+        for key in [k for k, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[key]
+        for subject in [s for s, (_, until) in self._user_cutoffs.items() if until <= now]:
+            del self._user_cutoffs[subject]
+
+    def clear(self) -> None:
+        """Drop all cached claims (revocations are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 # ============================================================================
 # Authentication Service
 # ============================================================================
@@ -78,7 +191,12 @@ class AuthService:
         self.secret_key = settings.SECRET_KEY
         self.algorithm = settings.ALGORITHM
         self.access_token_expire = settings.ACCESS_TOKEN_EXPIRE_MINUTES
-
+        self.token_cache = TokenCache(max_size=settings.JWT_CACHE_SIZE)
+        # key_hash -> (key data, monotonic time the entry goes stale), LRU order
+        self._api_key_cache: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        # key id -> latest use not yet written to the database
+        self._api_key_last_used: Dict[int, datetime] = {}
+        self._usage_flush_task: Optional[asyncio.Task] = None
     
     # ========================================================================
     # Password Hashing
@@ -158,7 +276,7 @@ class AuthService:
             "username": username,
             "role": role,
             "exp": expire,
-            "iat": datetime.utcnow(),
+            "iat": time.time(),  # sub-second, so revocation cutoffs are exact
             "type": "access"
         }
         
@@ -186,7 +304,7 @@ class AuthService:
             "sub": str(user_id),
             "username": username,
             "exp": expire,
-            "iat": datetime.utcnow(),
+            "iat": time.time(),  # sub-second, so revocation cutoffs are exact
             "type": "refresh"
         }
         
@@ -197,25 +315,70 @@ class AuthService:
         """
         Verify and decode JWT token
         
+        Decoded claims are cached per token until ``exp``; a cache hit skips
+        the signature check and JSON decode. The returned dict is shared with
+        the cache and must not be mutated.
+        
         Args:
             token: JWT token
             
         Returns:
             Decoded token payload or None if invalid
         """
-        try:
-            payload = jwt.decode(
-                token,
-                self.secret_key,
-                algorithms=[self.algorithm]
-            )
-            return payload
-        except jwt.ExpiredSignatureError:
-            self.logger.warning("Token has expired")
-            return None
-        except jwt.InvalidTokenError as e:
-            self.logger.warning(f"Invalid token: {e}")
+        key = self.token_cache.digest(token)
+        payload = self.token_cache.get(key)
+        if payload is None:
+            try:
+                payload = jwt.decode(
+                    token,
+                    self.secret_key,
+                    algorithms=[self.algorithm]
+                )
+            except jwt.ExpiredSignatureError:
+                self.logger.warning("Token has expired")
+                return None
+            except jwt.InvalidTokenError as e:
+                self.logger.warning(f"Invalid token: {e}")
+                return None
+            self.token_cache.put(key, payload)
+        
+        if self.token_cache.is_revoked(key, payload):
+            self.logger.warning("Token has been revoked")
             return None
+        return payload
+    
+    def revoke_token(self, token: str) -> bool:
+        """
+        Revoke a single token in this process until it expires
+        
+        Args:
+            token: JWT token
+            
+        Returns:
+            True if the token was valid and is now revoked
+        """
+        payload = self.verify_token(token)
+        if not payload:
+            return False
+        self.token_cache.revoke(self.token_cache.digest(token), payload["exp"])
+        return True
+    
+    def revoke_user_tokens(self, user_id: int) -> None:
+        """
+        Revoke every token issued to a user up to now
+        
+        Tokens issued after the call (e.g. on the next login) stay valid.
+        Like revoke_token this only affects the calling worker process:
+        other workers keep accepting the tokens until they expire. Nothing
+        calls it yet; a multi-worker deployment needs the cutoff shared
+        (e.g. through Redis) before relying on it.
+        
+        Args:
+            user_id: User ID
+        """
+        # Refresh tokens are the longest-lived tokens we issue
+        max_lifetime = timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS).total_seconds()
+        self.token_cache.revoke_subject(str(user_id), max_lifetime)
     
     # ========================================================================
     # User Management
@@ -237,24 +400,22 @@ class AuthService:
             Tuple of (success, user_id, error_message)
         """
         try:
-            # Check if username already exists
             from models import User as UserModel
             
+            # Check username and email uniqueness in one round trip
             result = await db.execute(
-                select(UserModel).where(UserModel.username == user_data.username)
+                select(UserModel.username, UserModel.email)
+                .where(or_(
+                    UserModel.username == user_data.username,
+                    UserModel.email == user_data.email
+                ))
+                .limit(2)
             )
-            existing_user = result.scalar_one_or_none()
+            conflicts = result.all()
             
-            if existing_user:
+            if any(row.username == user_data.username for row in conflicts):
                 return False, None, "Username already exists"
-            
-            # Check if email already exists
-            result = await db.execute(
-                select(UserModel).where(UserModel.email == user_data.email)
-            )
-            existing_email = result.scalar_one_or_none()
-            
-            if existing_email:
+            if conflicts:
                 return False, None, "Email already exists"
             
             # Validate role
@@ -262,16 +423,16 @@ class AuthService:
             if user_data.role not in valid_roles:
                 return False, None, f"Invalid role. Must be one of: {', '.join(valid_roles)}"
             
-            # Hash password
-            hashed_password = self.hash_password(user_data.password)
+            # Hash password off the event loop (bcrypt is deliberately slow)
+            hashed_password = await asyncio.to_thread(self.hash_password, user_data.password)
             
-            # Generate crypto keys for the user
+            # Take pre-generated crypto keys for the user
             try:
                 from crypto_service import get_crypto_service
                 crypto_service = get_crypto_service()
                 if crypto_service:
-                    seed_hex, private_key_hex, public_key_hex = crypto_service.generate_keypair()
-                    self.logger.info(f"Generated crypto keys for user: {user_data.username}")
+                    seed_hex, private_key_hex, public_key_hex = crypto_service.take_keypair()
+                    self.logger.info(f"Assigned crypto keys for user: {user_data.username}")
                 else:
                     # Fallback if crypto service is not available
                     seed_hex = private_key_hex = public_key_hex = None
@@ -301,6 +462,12 @@ class AuthService:
             
             return True, user.id, None
             
+        except IntegrityError as e:
+            # Lost a race with a concurrent registration for the same name/email
+            await db.rollback()
+            if "email" in str(e.orig).lower():
+                return False, None, "Email already exists"
+            return False, None, "Username already exists"
         except Exception as e:
             self.logger.error(f"Error creating user: {e}", exc_info=True)
             await db.rollback()
@@ -473,6 +640,10 @@ class AuthService:
         """
         Verify an API key
         
+        Active keys are cached for API_KEY_CACHE_TTL seconds in an LRU of
+        at most API_KEY_CACHE_SIZE entries, and usage is recorded in memory;
+        last_used_at is written by flush_api_key_usage.
+        
         Args:
             api_key: API key to verify
             db: Database session
@@ -485,35 +656,144 @@ class AuthService:
             
             api_key_hash = self.hash_api_key(api_key)
             
-            result = await db.execute(
-                select(ApiKey).where(
-                    ApiKey.key_hash == api_key_hash,
-                    ApiKey.is_active == True
+            cached = self._api_key_cache.get(api_key_hash)
+            if cached and cached[1] > time.monotonic():
+                key_data = cached[0]
+                self._api_key_cache.move_to_end(api_key_hash)
+            else:
+                # A stale entry is dropped whether or not the key is still active
+                self._api_key_cache.pop(api_key_hash, None)
+                result = await db.execute(
+                    select(ApiKey.id, ApiKey.name, ApiKey.user_id, ApiKey.scopes).where(
+                        ApiKey.key_hash == api_key_hash,
+                        ApiKey.is_active == True
+                    )
                 )
-            )
-            key_record = result.scalar_one_or_none()
-            
-            if not key_record:
-                return None
+                key_record = result.first()
+                
+                if not key_record:
+                    return None
+                
+                key_data = {
+                    "id": key_record.id,
+                    "name": key_record.name,
+                    "user_id": key_record.user_id,
+                    "scopes": key_record.scopes
+                }
+                self._api_key_cache[api_key_hash] = (
+                    key_data, time.monotonic() + settings.API_KEY_CACHE_TTL
+                )
+                while len(self._api_key_cache) > settings.API_KEY_CACHE_SIZE:
+                    self._api_key_cache.popitem(last=False)
             
-            # Update last used timestamp
-            await db.execute(
-                update(ApiKey)
-                .where(ApiKey.id == key_record.id)
-                .values(last_used_at=datetime.utcnow())
-            )
-            await db.commit()
+            # Coalesce last-used updates; flushed in one batch later
+            self._api_key_last_used[key_data["id"]] = datetime.utcnow()
             
-            return {
-                "id": key_record.id,
-                "name": key_record.name,
-                "user_id": key_record.user_id,
-                "scopes": key_record.scopes
-            }
+            return dict(key_data)
             
         except Exception as e:
             self.logger.error(f"Error verifying API key: {e}", exc_info=True)
             return None
+    
+    def invalidate_api_key(self, key_id: int) -> None:
+        """
+        Drop a key from the verification cache
+        
+        Args:
+            key_id: API key ID
+        """
+        for key_hash in [h for h, (data, _) in self._api_key_cache.items() if data["id"] == key_id]:
+            del self._api_key_cache[key_hash]
+    
+    async def revoke_api_key(self, key_id: int, db: AsyncSession) -> bool:
+        """
+        Deactivate an API key and evict it from the cache
+        
+        Other workers drop the key once their cache entry goes stale
+        (at most API_KEY_CACHE_TTL seconds).
+        
+        Args:
+            key_id: API key ID
+            db: Database session
+            
+        Returns:
+            True if a key was revoked
+        """
+        from models import ApiKey
+        
+        result = await db.execute(
+            update(ApiKey)
+            .where(ApiKey.id == key_id, ApiKey.is_active == True)
+            .values(is_active=False)
+        )
+        await db.commit()
+        self.invalidate_api_key(key_id)
+        self._api_key_last_used.pop(key_id, None)
+        return result.rowcount > 0
+    
+    async def flush_api_key_usage(self, db: AsyncSession) -> int:
+        """
+        Write coalesced last_used_at values in one batched UPDATE
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Number of keys updated
+        """
+        from models import ApiKey
+        
+        if not self._api_key_last_used:
+            return 0
+        
+        pending, self._api_key_last_used = self._api_key_last_used, {}
+        try:
+            await db.execute(
+                update(ApiKey),
+                [{"id": key_id, "last_used_at": used_at} for key_id, used_at in pending.items()]
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            # Keep newer timestamps recorded while the flush was running
+            for key_id, used_at in pending.items():
+                self._api_key_last_used.setdefault(key_id, used_at)
+            raise
+        return len(pending)
+    
+    async def _api_key_usage_flush_loop(self, interval: float) -> None:
+        """Periodically flush API key usage until cancelled"""
+        from database import AsyncSessionLocal
+        
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self.flush_api_key_usage(db)
+            except Exception as e:
+                self.logger.error(f"Failed to flush API key usage: {e}")
+    
+    def start_api_key_usage_flusher(self) -> None:
+        """Start the background last_used_at flusher"""
+        if self._usage_flush_task is None or self._usage_flush_task.done():
+            self._usage_flush_task = asyncio.create_task(
+                self._api_key_usage_flush_loop(settings.API_KEY_USAGE_FLUSH_INTERVAL)
+            )
+    
+    async def stop_api_key_usage_flusher(self) -> None:
+        """Stop the background flusher and write any pending usage"""
+        from database import AsyncSessionLocal
+        
+        if self._usage_flush_task is not None:
+            self._usage_flush_task.cancel()
+            try:
+                await self._usage_flush_task
+            except asyncio.CancelledError:
+                pass
+            self._usage_flush_task = None
+        
+        async with AsyncSessionLocal() as db:
+            await self.flush_api_key_usage(db)
 
 
 # Global auth service instance
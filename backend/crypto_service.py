@@ -3,11 +3,15 @@ ProofPals Crypto Service
 Wrapper for Rust pp_clsag_core library
 """
 
+import asyncio
 import json
 import logging
+from collections import deque
 from typing import Tuple, List, Optional
 from dataclasses import dataclass
 
+from config import settings
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -26,6 +30,89 @@ class SignatureVerificationResult:
     error: Optional[str] = None
 
 
+class KeypairPool:
+    """
+    Pool of pre-generated (seed_hex, private_key_hex, public_key_hex) keypairs
+
+    Registration pops a ready keypair; the pool is refilled in batches on a
+    worker thread once it drops below its low-water mark.
+    """
+    
+    def __init__(self, crypto_service: "CryptoService", target_size: int, batch_size: int):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.crypto_service = crypto_service
+        self.target_size = target_size
+        self.batch_size = max(1, batch_size)
+        self.low_water = target_size // 2
+        self._keypairs: deque = deque()
+        self._refill_task: Optional[asyncio.Task] = None
+    
+    def __len__(self) -> int:
+        return len(self._keypairs)
+    
+    def take(self) -> Optional[Tuple[str, str, str]]:
+        """
+        Pop a pre-generated keypair
+        
+        Returns:
+            Keypair tuple, or None if the pool is empty
+        """
+        try:
+            keypair = self._keypairs.popleft()
+        except IndexError:
+            keypair = None
+        if len(self._keypairs) <= self.low_water:
+            self.schedule_refill()
+        return keypair
+    
+    def schedule_refill(self) -> None:
+        """Start a background refill if one is not already running"""
+        if self.target_size <= 0:
+            return
+        if self._refill_task is not None and not self._refill_task.done():
+            return
+        try:
+            self._refill_task = asyncio.get_running_loop().create_task(self.refill())
+        except RuntimeError:
+            # No running event loop (scripts, tests); callers fall back to inline generation
+            pass
+    
+    async def refill(self) -> None:
+        """Generate keypairs off the event loop until the pool is full"""
+        try:
+            while len(self._keypairs) < self.target_size:
+                count = min(self.batch_size, self.target_size - len(self._keypairs))
+                batch = await asyncio.to_thread(self._generate_batch, count)
+                self._keypairs.extend(batch)
+            self.logger.debug(f"Keypair pool refilled to {len(self._keypairs)}")
+        except Exception as e:
+            self.logger.error(f"Keypair pool refill failed: {e}", exc_info=True)
+    
+    async def stop(self) -> None:
+        """Cancel any in-flight refill"""
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
+    
+    def _generate_batch(self, count: int) -> List[Tuple[str, str, str]]:
+        """Generate a batch of keypairs (runs in a worker thread)"""
+        if CRYPTO_AVAILABLE and hasattr(pp_clsag_core, "derive_keypairs"):
+            return [
+                (_to_hex(seed), _to_hex(sk), _to_hex(pk))
+                for seed, sk, pk in pp_clsag_core.derive_keypairs(count)
+            ]
+        return [self.crypto_service.generate_keypair() for _ in range(count)]
+
+
+def _to_hex(value) -> str:
+    """Hex-encode bytes returned by pp_clsag_core (bytes or list of ints)"""
+    return bytes(value).hex() if isinstance(value, list) else value.hex()
+
+
 class CryptoService:
     """Service for cryptographic operations"""
     
@@ -36,6 +123,11 @@ class CryptoService:
                 "pp_clsag_core library not available. "
                 "Using fallback key generation for testing purposes."
             )
+        self.keypair_pool = KeypairPool(
+            self,
+            target_size=settings.KEYPAIR_POOL_SIZE,
+            batch_size=settings.KEYPAIR_POOL_BATCH_SIZE
+        )
     
     def verify_clsag_signature(
         self, 
@@ -337,6 +429,18 @@ class CryptoService:
             self.logger.error(f"Keypair generation failed: {e}", exc_info=True)
             raise RuntimeError(f"Failed to generate keypair: {str(e)}")
 
+    def take_keypair(self) -> tuple[str, str, str]:
+        """
+        Get a keypair for a new user, preferring the pre-generated pool
+        
+        Returns:
+            Tuple of (seed_hex, private_key_hex, public_key_hex)
+        """
+        keypair = self.keypair_pool.take()
+        if keypair is None:
+            keypair = self.generate_keypair()
+        return keypair
+
     def create_canonical_message(
         self,
         submission_id: str,
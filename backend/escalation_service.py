@@ -7,13 +7,15 @@ Handles content escalation, evidence packaging, and trustee notifications
 import logging
 import json
 import hashlib
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from models import Escalation, Submission, Vote, AuditLog, EscalationStatus
 from config import settings
+from pagination import Cursor, keyset_page, split_page
+from event_bus import get_event_bus
 
 logger = logging.getLogger(__name__)
 
@@ -80,10 +82,12 @@ class EscalationService:
             db.add(escalation)
             
             # Update submission status
+            old_status = submission.status
             submission.status = "escalated"
             
             await db.commit()
             await db.refresh(escalation)
+            await get_event_bus().publish_status(submission_id, old_status, "escalated")
             
             # Log escalation
             await self._log_audit(
@@ -135,11 +139,12 @@ class EscalationService:
             )
             submission = result.scalar_one()
             
-            # Get all votes
+            # Get the vote columns evidence needs (signatures stay cold)
             result = await db.execute(
-                select(Vote).where(Vote.submission_id == submission_id)
+                select(Vote.key_image, Vote.vote_type, Vote.created_at)
+                .where(Vote.submission_id == submission_id)
             )
-            votes = result.scalars().all()
+            votes = result.all()
             
             # Count votes by type
             vote_counts = {
@@ -232,6 +237,7 @@ class EscalationService:
                 select(Submission).where(Submission.id == escalation.submission_id)
             )
             submission = result.scalar_one()
+            old_status = submission.status
             
             if resolution == "approved":
                 submission.status = "approved"
@@ -241,6 +247,7 @@ class EscalationService:
                 submission.status = "pending"
             
             await db.commit()
+            await get_event_bus().publish_status(submission.id, old_status, submission.status)
             
             # Log resolution
             await self._log_audit(
@@ -304,9 +311,11 @@ class EscalationService:
                 select(Submission).where(Submission.id == escalation.submission_id)
             )
             submission = result.scalar_one()
+            old_status = submission.status
             submission.status = "pending"
             
             await db.commit()
+            await get_event_bus().publish_status(submission.id, old_status, "pending")
             
             await self._log_audit(
                 db,
@@ -363,17 +372,28 @@ class EscalationService:
     async def list_pending_escalations(
         self,
         db: AsyncSession,
-        limit: int = 50
-    ) -> List[Dict[str, Any]]:
-        """List pending escalations"""
+        limit: int = 50,
+        cursor: Optional[Cursor] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List pending escalations, newest first
+        
+        Args:
+            db: Database session
+            limit: Page size
+            cursor: Decoded cursor from the previous page
+            
+        Returns:
+            Tuple of (escalations, next page cursor or None)
+        """
         try:
-            result = await db.execute(
-                select(Escalation)
-                .where(Escalation.status == EscalationStatus.PENDING)
-                .order_by(Escalation.requested_at.desc())
-                .limit(limit)
+            result = await db.execute(keyset_page(
+                select(Escalation).where(Escalation.status == EscalationStatus.PENDING),
+                Escalation.requested_at, Escalation.id, cursor, limit
+            ))
+            escalations, next_cursor = split_page(
+                result.scalars().all(), limit, lambda e: (e.requested_at, e.id)
             )
-            escalations = result.scalars().all()
             
             return [
                 {
@@ -383,11 +403,11 @@ class EscalationService:
                     "requested_at": e.requested_at.isoformat()
                 }
                 for e in escalations
-            ]
+            ], next_cursor
             
         except Exception as e:
             self.logger.error(f"Error listing escalations: {e}", exc_info=True)
-            return []
+            return [], None
     
     async def check_auto_escalation_triggers(
         self,
@@ -0,0 +1,245 @@
+"""
+ProofPals Event Bus
+In-process pub/sub of live submission updates (votes, tallies, status
+transitions), fanned out across workers through Redis pub/sub
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from config import settings
+
+# Queued in place of events when a subscriber is evicted
+EVICTED = object()
+
+
+def _status(value: Any) -> Optional[str]:
+    return getattr(value, "value", value)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Encode an event as a server-sent events message"""
+    return f"event: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+class Subscription:
+    """
+    One client's feed: a bounded queue of events for the submissions it follows
+    """
+
+    def __init__(self, submission_ids: Iterable[int], buffer: int):
+        self.submission_ids = frozenset(submission_ids)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+        self.evicted = False
+
+
+class EventBus:
+    """
+    Fan-out of submission events to streaming clients
+
+    Publishing never blocks on a client: each subscription has a bounded
+    queue and a subscriber whose queue is full is evicted (its stream ends
+    with an ``evicted`` event so the client can reconnect) instead of
+    letting events pile up in memory. With Redis attached, every event is
+    also published on EVENT_BUS_CHANNEL and a listener task delivers other
+    workers' events to local subscribers.
+    """
+
+    def __init__(self, buffer: Optional[int] = None):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.buffer = settings.EVENT_STREAM_BUFFER if buffer is None else buffer
+        self.origin = uuid.uuid4().hex
+        self.redis_client = None
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.delivered = 0
+        self.evictions = 0
+
+    # ========================================================================
+    # Subscriptions
+    # ========================================================================
+
+    def subscribe(self, submission_ids: Iterable[int]) -> Subscription:
+        """Start following events for the given submissions"""
+        subscription = Subscription(submission_ids, self.buffer)
+        for submission_id in subscription.submission_ids:
+            self._subscribers.setdefault(submission_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering events to a subscription"""
+        for submission_id in subscription.submission_ids:
+            subscribers = self._subscribers.get(submission_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[submission_id]
+
+    def _evict(self, subscription: Subscription) -> None:
+        self.unsubscribe(subscription)
+        subscription.evicted = True
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(EVICTED)
+        self.evictions += 1
+        self.logger.warning(
+            f"Evicted slow event stream subscriber "
+            f"({len(subscription.submission_ids)} submissions, buffer {self.buffer})"
+        )
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        subscribers = self._subscribers.get(event["submission_id"])
+        if not subscribers:
+            return
+        for subscription in list(subscribers):
+            try:
+                subscription.queue.put_nowait(event)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                self._evict(subscription)
+
+    async def stream(self, submission_ids: Iterable[int], heartbeat: float) -> AsyncIterator[str]:
+        """
+        Server-sent events for the given submissions until the client goes
+        away or is evicted; a comment line is sent when idle for
+        ``heartbeat`` seconds to keep proxies from closing the connection.
+        """
+        subscription = self.subscribe(submission_ids)
+        try:
+            yield f"retry: 3000\nevent: subscribed\ndata: {json.dumps(sorted(subscription.submission_ids))}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is EVICTED:
+                    yield "event: evicted\ndata: {}\n\n"
+                    return
+                yield format_sse(event)
+        finally:
+            self.unsubscribe(subscription)
+
+    # ========================================================================
+    # Publishing
+    # ========================================================================
+
+    async def publish_many(self, events: List[Dict[str, Any]]) -> None:
+        """Deliver events locally and hand them to other workers"""
+        if not events:
+            return
+        for event in events:
+            self._deliver(event)
+        self.published += len(events)
+
+        if self.redis_client is not None:
+            try:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for event in events:
+                        pipe.publish(
+                            settings.EVENT_BUS_CHANNEL,
+                            json.dumps({"origin": self.origin, "event": event})
+                        )
+                    await pipe.execute()
+            except Exception as e:
+                self.logger.warning(f"Failed to publish events to Redis: {e}")
+
+    @staticmethod
+    def _event(event_type: str, submission_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {"type": event_type, "submission_id": submission_id, "data": data, "ts": time.time()}
+
+    async def publish_vote(self, submission_id: int, vote_type: Any) -> None:
+        """A vote was accepted: one more vote of ``vote_type``"""
+        await self.publish_many([self._event("vote", submission_id, {"delta": {_status(vote_type): 1}})])
+
+    async def publish_tally(self, submission_id: int, counts: Dict[str, int], decision: str) -> None:
+        """A tally was (re)computed"""
+        await self.publish_many([self._event("tally", submission_id, {
+            "counts": counts,
+            "total_votes": sum(counts.values()),
+            "decision": decision
+        })])
+
+    def status_event(self, submission_id: int, old_status: Any, new_status: Any) -> Optional[Dict[str, Any]]:
+        """Event for a status transition, or None if the status did not change"""
+        old_status, new_status = _status(old_status), _status(new_status)
+        if old_status == new_status:
+            return None
+        return self._event("status", submission_id, {"from": old_status, "to": new_status})
+
+    async def publish_status(self, submission_id: int, old_status: Any, new_status: Any) -> None:
+        """A submission moved between statuses"""
+        event = self.status_event(submission_id, old_status, new_status)
+        if event is not None:
+            await self.publish_many([event])
+
+    # ========================================================================
+    # Cross-worker fan-out
+    # ========================================================================
+
+    async def _listen(self) -> None:
+        """Deliver events published by other workers to local subscribers"""
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(settings.EVENT_BUS_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload.get("origin") != self.origin:
+                        self._deliver(payload["event"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"Event bus Redis listener failed, retrying: {e}")
+                await asyncio.sleep(5)
+            finally:
+                await pubsub.aclose()
+
+    def start_listener(self, redis_client) -> None:
+        """Attach Redis and start receiving other workers' events"""
+        if redis_client is None:
+            return
+        self.redis_client = redis_client
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop_listener(self) -> None:
+        """Stop the Redis listener"""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        self.redis_client = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Subscriber and delivery counters"""
+        return {
+            "subscribers": len({s for subs in self._subscribers.values() for s in subs}),
+            "followed_submissions": len(self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "evictions": self.evictions,
+            "redis": self.redis_client is not None
+        }
+
+
+# Global event bus instance
+_event_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    """Get global event bus instance"""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = EventBus()
+    return _event_bus
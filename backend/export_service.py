@@ -0,0 +1,158 @@
+"""
+ProofPals Export Service
+Streams whole tables as NDJSON or CSV with constant memory
+"""
+
+import csv
+import enum
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional, Sequence
+
+from sqlalchemy import select
+
+from database import get_read_sessionmaker
+from models import Submission, Vote, Tally, AuditLog
+
+
+# Columns exported per resource. IP addresses (raw or hashed), MAC hashes and
+# signature blobs stay out: the former are only released through escalations,
+# the latter are large and verifiable only together with the ring.
+EXPORT_COLUMNS = {
+    "submissions": [
+        Submission.id, Submission.user_id, Submission.genre, Submission.content_ref,
+        Submission.status, Submission.created_at, Submission.last_tallied_at,
+    ],
+    "votes": [
+        Vote.id, Vote.submission_id, Vote.ring_id, Vote.key_image, Vote.vote_type,
+        Vote.token_id, Vote.verified, Vote.created_at,
+    ],
+    "tallies": [
+        Tally.id, Tally.submission_id, Tally.count_approve, Tally.count_escalate,
+        Tally.count_reject, Tally.count_flag, Tally.final_decision, Tally.computed_at,
+    ],
+    "audit_logs": [
+        AuditLog.id, AuditLog.event_type, AuditLog.entity_type, AuditLog.entity_id,
+        AuditLog.details, AuditLog.timestamp,
+    ],
+}
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def json_default(value: Any) -> Any:
+    """JSON encoder fallback for datetimes, enums and binary columns"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value).hex()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value: Any) -> Any:
+    """Flatten a column value into a CSV cell"""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+class ExportService:
+    """
+    Streams table exports over a server-side cursor
+
+    Each export opens its own session (the request session is closed before
+    a streaming body finishes) and reads rows in batches of ``batch_size``,
+    encoding and yielding one chunk per batch.
+    """
+
+    def __init__(self, batch_size: int = 1000):
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def columns(self, resource: str) -> List[Any]:
+        """
+        Exported columns for a resource
+
+        Raises:
+            KeyError: If the resource is not exportable
+        """
+        return EXPORT_COLUMNS[resource]
+
+    async def stream(self, resource: str, fmt: str = "ndjson") -> AsyncIterator[bytes]:
+        """
+        Yield an export of ``resource`` in ``fmt``, ordered by id
+
+        Args:
+            resource: One of EXPORT_COLUMNS
+            fmt: "ndjson" or "csv"
+
+        Yields:
+            Encoded chunks, one per fetched batch
+        """
+        columns = self.columns(resource)
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        names = [column.key for column in columns]
+
+        session_factory = await get_read_sessionmaker()
+        exported = 0
+        async with session_factory() as session:
+            result = await session.stream(
+                select(*columns)
+                .order_by(columns[0])
+                .execution_options(yield_per=self.batch_size)
+            )
+
+            if fmt == "csv":
+                yield self._encode_csv([names])
+
+            async for partition in result.partitions():
+                exported += len(partition)
+                if fmt == "csv":
+                    yield self._encode_csv(
+                        [[_csv_value(value) for value in row] for row in partition]
+                    )
+                else:
+                    yield self._encode_ndjson(names, partition)
+
+        self.logger.info(f"Exported {exported} {resource} rows as {fmt}")
+
+    @staticmethod
+    def _encode_ndjson(names: List[str], rows: Sequence[Sequence[Any]]) -> bytes:
+        """One JSON object per line"""
+        return "".join(
+            json.dumps(dict(zip(names, row)), default=json_default, separators=(",", ":")) + "\n"
+            for row in rows
+        ).encode()
+
+    @staticmethod
+    def _encode_csv(rows: List[List[Any]]) -> bytes:
+        """CSV lines for a batch of already-flattened rows"""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+
+
+# Global export service instance
+_export_service: Optional[ExportService] = None
+
+
+def get_export_service() -> ExportService:
+    """Get global export service instance"""
+    global _export_service
+    if _export_service is None:
+        _export_service = ExportService()
+    return _export_service
@@ -1,8 +1,8 @@
 
 
-from fastapi import FastAPI, Depends, HTTPException, Request, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 from typing import Optional, List
@@ -13,7 +13,14 @@ import sys
 
 # Import configuration and database
 from config import settings
-from database import get_db, init_db, close_db
+from database import get_db, get_read_db, init_db, close_db
+from stats_service import get_stats_service
+from partition_service import get_partition_service
+from work_queue_service import get_work_queue_service
+from event_bus import get_event_bus
+from pagination import (
+    Cursor, NEXT_CURSOR_HEADER, clamp_limit, cursor_param, keyset_page, split_page
+)
 
 # Import services
 try:
@@ -58,6 +65,9 @@ except ImportError:
     def get_monitoring_service():
         return None
 
+from middleware.query_metrics import QueryMetricsMiddleware
+from middleware.request_metrics import RequestMetricsMiddleware
+
 # Import auth middleware
 from middleware.auth_middleware import (
     get_current_user,
@@ -107,8 +117,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Per-route database query counts and timings
+app.add_middleware(QueryMetricsMiddleware)
+
+# Per-route latency, status codes, body sizes and requests in flight (outermost)
+app.add_middleware(RequestMetricsMiddleware)
+
 
 # ============================================================================
 # Pydantic Models for API
@@ -222,10 +239,24 @@ async def startup_event():
         try:
             token_service = get_token_service()
             await token_service.init_redis()
+            get_tally_service().cache.attach_redis(token_service.redis_client)
+            get_event_bus().start_listener(token_service.redis_client)
             logger.info("✓ Redis connection established")
         except Exception as e:
             logger.warning(f"⚠ Redis connection failed: {e}")
         
+        # Start API key usage flusher
+        get_auth_service().start_api_key_usage_flusher()
+        
+        # Keep the dashboard statistics snapshot warm
+        get_stats_service().start_refresher()
+        
+        # Keep vote/audit log partitions created ahead and apply retention
+        get_partition_service().start_maintenance()
+        
+        # Share this worker's metrics with the others (multi-process mode)
+        get_monitoring_service().start_snapshot_writer()
+        
         # Initialize vetter service with RSA keypair
         try:
             vetter_service = get_vetter_service()
@@ -255,6 +286,7 @@ async def startup_event():
                     logger.info("✓ Crypto library loaded")
                 else:
                     logger.error(f"✗ Crypto library unhealthy: {health.get('error')}")
+                crypto_service.keypair_pool.schedule_refill()
             else:
                 logger.warning("⚠ Crypto library not available (running in test mode)")
         except Exception as e:
@@ -273,6 +305,24 @@ async def shutdown_event():
     logger.info("Shutting down ProofPals Backend...")
     
     try:
+        # Flush pending API key usage
+        await get_auth_service().stop_api_key_usage_flusher()
+        
+        # Stop statistics refresher
+        await get_stats_service().stop_refresher()
+        
+        # Stop partition maintenance
+        await get_partition_service().stop_maintenance()
+        
+        # Stop keypair pool refills
+        await get_crypto_service().keypair_pool.stop()
+        
+        # Stop cross-worker event fan-out
+        await get_event_bus().stop_listener()
+        
+        # Write the final metrics snapshot
+        await get_monitoring_service().stop_snapshot_writer()
+        
         # Close Redis
         token_service = get_token_service()
         await token_service.close_redis()
@@ -617,7 +667,8 @@ async def get_vetter_public_key():
     
     return {
         "public_key": public_key.hex(),
-        "algorithm": "RSA-2048",
+        "key_id": vetter_service.key_id,
+        "algorithm": f"RSA-{vetter_service.server_keypair.bits}",
         "purpose": "blind_signature"
     }
 
@@ -658,6 +709,7 @@ async def blind_sign(
         return {
             "success": True,
             "blind_signature": signature_bytes.hex(),
+            "key_id": vetter_service.key_id,
             "issued_by": current_user.username,
             "issued_at": datetime.utcnow().isoformat()
         }
@@ -675,6 +727,125 @@ async def blind_sign(
         )
 
 
+@app.post("/api/v1/vetter/blind-sign/batch", tags=["Vetter"])
+async def blind_sign_batch(
+    blinded_data: dict,
+    current_user: CurrentUser = Depends(require_vetter),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Issue blind signatures for many blinded messages (vetter only)
+    
+    Request body:
+    {
+        "blinded_messages": ["hex-encoded blinded message", ...],
+        "metadata": {"optional": "metadata"}
+    }
+    """
+    try:
+        hex_messages = blinded_data.get("blinded_messages")
+        if not isinstance(hex_messages, list) or not hex_messages:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="blinded_messages must be a non-empty list"
+            )
+        if len(hex_messages) > settings.VETTER_MAX_BATCH_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Batch too large (max {settings.VETTER_MAX_BATCH_SIZE})"
+            )
+        
+        blinded_messages = []
+        for index, message in enumerate(hex_messages):
+            try:
+                blinded_messages.append(bytes.fromhex(message))
+            except (ValueError, TypeError) as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid hex encoding in blinded_messages[{index}]: {str(e)}"
+                )
+        metadata = blinded_data.get("metadata", {})
+        
+        vetter_service = get_vetter_service()
+        success, signatures, error = await vetter_service.issue_blind_signatures_batch(
+            blinded_messages,
+            current_user.id,
+            db,
+            metadata
+        )
+        
+        if not success:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=error
+            )
+        
+        return {
+            "success": True,
+            "blind_signatures": [signature.hex() for signature in signatures],
+            "count": len(signatures),
+            "key_id": vetter_service.key_id,
+            "issued_by": current_user.username,
+            "issued_at": datetime.utcnow().isoformat()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in blind_sign_batch: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Blind signing failed: {str(e)}"
+        )
+
+
+@app.post("/api/v1/admin/vetter/rotate-key", tags=["Admin"])
+async def rotate_vetter_key(
+    current_user: CurrentUser = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Rotate the blind-signature issuer key (admin only)"""
+    try:
+        from models import AuditLog
+
+        vetter_service = get_vetter_service()
+        old_key_id, new_key_id = vetter_service.rotate_server_keypair()
+
+        db.add(AuditLog(
+            event_type="vetter_key_rotated",
+            entity_type="blind_signature",
+            entity_id=new_key_id,
+            details={
+                "admin_id": current_user.id,
+                "old_key_id": old_key_id,
+                "new_key_id": new_key_id
+            },
+            timestamp=datetime.utcnow()
+        ))
+        await db.commit()
+
+        logger.info(f"Admin {current_user.username} rotated issuer key {old_key_id} -> {new_key_id}")
+
+        return {
+            "success": True,
+            "old_key_id": old_key_id,
+            "key_id": new_key_id,
+            "public_key": vetter_service.get_public_key().hex()
+        }
+
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error rotating issuer key: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Key rotation failed: {str(e)}"
+        )
+
+
 @app.post("/api/v1/vetter/register-credential", tags=["Vetter"])
 async def register_credential(
     credential_data: dict,
@@ -778,16 +949,20 @@ async def get_vetter_statistics(
 async def list_escalations(
     current_user: CurrentUser = Depends(require_admin),
     limit: int = 50,
+    cursor: Optional[Cursor] = Depends(cursor_param),
     db: AsyncSession = Depends(get_db)
 ):
-    """List pending escalations (admin only)"""
+    """List pending escalations (admin only), newest first"""
     escalation_service = get_escalation_service()
-    escalations = await escalation_service.list_pending_escalations(db, limit)
+    escalations, next_cursor = await escalation_service.list_pending_escalations(
+        db, clamp_limit(limit), cursor
+    )
     
     return {
         "success": True,
         "escalations": escalations,
-        "count": len(escalations)
+        "count": len(escalations),
+        "next_cursor": next_cursor
     }
 
 
@@ -939,35 +1114,69 @@ async def prometheus_metrics(
     
     Returns metrics in Prometheus text format
     """
-    monitoring_service = get_monitoring_service()
-    metrics = monitoring_service.metrics.get_metrics()
-    
-    # Convert to Prometheus format
-    lines = []
-    
-    # Counters
-    for name, value in metrics["counters"].items():
-        lines.append(f"# TYPE {name} counter")
-        lines.append(f"{name} {value}")
-    
-    # Gauges
-    for name, value in metrics["gauges"].items():
-        lines.append(f"# TYPE {name} gauge")
-        lines.append(f"{name} {value}")
-    
-    # Histograms (as summaries)
-    for name, hist in metrics["histograms"].items():
-        lines.append(f"# TYPE {name} summary")
-        lines.append(f"{name}_count {hist['count']}")
-        lines.append(f"{name}_sum {hist['count'] * hist['avg']}")
-        lines.append(f"{name}_min {hist['min']}")
-        lines.append(f"{name}_max {hist['max']}")
-    
     return Response(
-        content="\n".join(lines) + "\n",
+        content=get_monitoring_service().render_prometheus(),
         media_type="text/plain; version=0.0.4"
     )
 
+
+@app.get("/api/v1/admin/metrics/queries", tags=["Monitoring"])
+async def route_query_metrics(
+    current_user: CurrentUser = Depends(require_admin)
+):
+    """
+    Database queries per route (admin only)
+    
+    Routes with the most queries per request come first; a jump in
+    avg_queries or max_queries after a deploy usually means an N+1 query.
+    """
+    return {"routes": get_monitoring_service().get_route_query_stats()}
+
+
+@app.get("/api/v1/admin/metrics/routes", tags=["Monitoring"])
+async def route_latency_metrics(
+    current_user: CurrentUser = Depends(require_admin)
+):
+    """
+    Request latency quantiles and status codes per route (admin only)
+    
+    Slowest p95 first.
+    """
+    return {"routes": get_monitoring_service().get_route_latency_stats()}
+
+
+@app.get("/api/v1/admin/metrics/timeseries", tags=["Monitoring"])
+async def timing_timeseries(
+    metric: Optional[str] = None,
+    window: int = Query(3600, ge=1, le=7 * 24 * 3600, description="Seconds of history"),
+    resolution: Optional[int] = Query(None, description="Bucket size in seconds: 1, 60 or 3600"),
+    current_user: CurrentUser = Depends(require_admin)
+):
+    """
+    Timing history with count/avg/min/max per bucket (admin only)
+    
+    Without ``metric``, lists the metrics that have history. The finest
+    resolution that still covers ``window`` is used unless one is given.
+    """
+    monitoring_service = get_monitoring_service()
+    if metric is None:
+        return {"metrics": monitoring_service.list_timeseries()}
+    try:
+        result = monitoring_service.get_timeseries(metric, window, resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No timeseries for metric {metric}")
+    return result
+
+
+@app.get("/api/v1/admin/metrics/events", tags=["Monitoring"])
+async def event_stream_metrics(
+    current_user: CurrentUser = Depends(require_admin)
+):
+    """Live event stream subscribers, deliveries and slow-consumer evictions (admin only)"""
+    return get_event_bus().get_stats()
+
 @app.post("/api/v1/vote/debug")
 async def debug_vote_request(
     request: Request,
@@ -1062,7 +1271,7 @@ async def check_vote_requirements(
                     "id": r.id,
                     "genre": r.genre,
                     "epoch": r.epoch,
-                    "member_count": len(r.pubkeys) if r.pubkeys else 0,
+                    "member_count": r.member_count,
                     "active": r.active
                 } for r in rings
             ],
@@ -1085,53 +1294,24 @@ async def check_vote_requirements(
 
 
 @app.get("/api/v1/system/status")
-async def system_status(db: AsyncSession = Depends(get_db)):
-    """Get system status for debugging"""
+async def system_status():
+    """Get system status for debugging (cached snapshot)"""
     try:
-        from models import Submission, Ring, Token, Reviewer
-        from sqlalchemy import func
-        
-        # Count submissions
-        result = await db.execute(select(func.count(Submission.id)))
-        total_submissions = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Submission.id)).where(Submission.status == "pending"))
-        pending_submissions = result.scalar() or 0
-        
-        # Count rings
-        result = await db.execute(select(func.count(Ring.id)))
-        total_rings = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Ring.id)).where(Ring.active == True))
-        active_rings = result.scalar() or 0
-        
-        # Count tokens
-        result = await db.execute(select(func.count(Token.token_id)))
-        total_tokens = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Token.token_id)).where(Token.redeemed == False))
-        available_tokens = result.scalar() or 0
-        
-        # Count reviewers
-        result = await db.execute(select(func.count(Reviewer.id)))
-        total_reviewers = result.scalar() or 0
+        snapshot = await get_stats_service().get_snapshot()
+        pending_submissions = snapshot["submissions"]["pending"]
+        active_rings = snapshot["rings"]["active"]
+        available_tokens = snapshot["tokens"]["available"]
         
         return {
             "success": True,
             "submissions": {
-                "total": total_submissions,
+                "total": snapshot["submissions"]["total"],
                 "pending": pending_submissions
             },
-            "rings": {
-                "total": total_rings,
-                "active": active_rings
-            },
-            "tokens": {
-                "total": total_tokens,
-                "available": available_tokens
-            },
+            "rings": snapshot["rings"],
+            "tokens": snapshot["tokens"],
             "reviewers": {
-                "total": total_reviewers
+                "total": snapshot["reviewers"]["total"]
             },
             "ready_to_vote": pending_submissions > 0 and active_rings > 0 and available_tokens > 0
         }
@@ -1147,22 +1327,22 @@ async def system_status(db: AsyncSession = Depends(get_db)):
 @app.get("/api/v1/submissions/approved")
 async def get_approved_submissions(
     limit: int = 20,
-    offset: int = 0,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[Cursor] = Depends(cursor_param),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get approved submissions for home page (public access)"""
     try:
         from models import Submission
         
-        # Get approved submissions
-        result = await db.execute(
-            select(Submission)
-            .where(Submission.status == "approved")
-            .order_by(Submission.created_at.desc())
-            .limit(limit)
-            .offset(offset)
+        # Get approved submissions, one page after the cursor
+        limit = clamp_limit(limit)
+        result = await db.execute(keyset_page(
+            select(Submission).where(Submission.status == "approved"),
+            Submission.created_at, Submission.id, cursor, limit
+        ))
+        submissions, next_cursor = split_page(
+            result.scalars().all(), limit, lambda s: (s.created_at, s.id)
         )
-        submissions = result.scalars().all()
         
         # Format for frontend
         formatted_submissions = []
@@ -1181,7 +1361,7 @@ async def get_approved_submissions(
             "submissions": formatted_submissions,
             "total": len(formatted_submissions),
             "limit": limit,
-            "offset": offset
+            "next_cursor": next_cursor
         }
         
     except Exception as e:
@@ -1194,18 +1374,26 @@ async def get_approved_submissions(
 
 @app.get("/api/v1/submissions")
 async def get_all_submissions(
+    response: Response,
     current_user: CurrentUser = Depends(require_admin),
+    limit: int = 100,
+    cursor: Optional[Cursor] = Depends(cursor_param),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all submissions for admin dashboard"""
+    """Get submissions for admin dashboard; next page cursor in X-Next-Cursor"""
     try:
         from models import Submission
         
-        # Get all submissions
-        result = await db.execute(
-            select(Submission).order_by(Submission.created_at.desc())
+        # Get one page of submissions
+        limit = clamp_limit(limit)
+        result = await db.execute(keyset_page(
+            select(Submission), Submission.created_at, Submission.id, cursor, limit
+        ))
+        all_submissions, next_cursor = split_page(
+            result.scalars().all(), limit, lambda s: (s.created_at, s.id)
         )
-        all_submissions = result.scalars().all()
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         
         # Format for frontend
         formatted_submissions = []
@@ -1231,20 +1419,27 @@ async def get_all_submissions(
 
 @app.get("/api/v1/submissions/my")
 async def get_my_submissions(
+    response: Response,
     current_user: CurrentUser = Depends(get_current_user),
+    limit: int = 100,
+    cursor: Optional[Cursor] = Depends(cursor_param),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get current user's submissions"""
+    """Get current user's submissions; next page cursor in X-Next-Cursor"""
     try:
         from models import Submission
         
         # Filter submissions by current user's ID
-        result = await db.execute(
-            select(Submission)
-            .where(Submission.user_id == current_user.id)
-            .order_by(Submission.created_at.desc())
+        limit = clamp_limit(limit)
+        result = await db.execute(keyset_page(
+            select(Submission).where(Submission.user_id == current_user.id),
+            Submission.created_at, Submission.id, cursor, limit
+        ))
+        user_submissions_raw, next_cursor = split_page(
+            result.scalars().all(), limit, lambda s: (s.created_at, s.id)
         )
-        user_submissions_raw = result.scalars().all()
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         
         # Format for frontend
         user_submissions = []
@@ -1270,37 +1465,39 @@ async def get_my_submissions(
         )
 
 
+def _format_queue_items(items: List[dict]) -> List[dict]:
+    """Work queue rows in the shape the reviewer dashboard expects"""
+    return [
+        {
+            "id": item["id"],
+            "genre": item["genre"],
+            "content_ref": item["content_ref"],
+            "status": "pending",
+            "created_at": item["created_at"].isoformat(),
+            "updated_at": item["created_at"].isoformat(),
+            "lease_expires_at": item["lease_expires_at"].isoformat() if item["lease_expires_at"] else None
+        }
+        for item in items
+    ]
+
+
 @app.get("/api/v1/reviewer/submissions")
 async def get_reviewer_submissions(
-    current_user: CurrentUser = Depends(get_current_user),
+    genre: Optional[str] = None,
+    current_user: CurrentUser = Depends(require_reviewer),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get submissions available for reviewer to review"""
+    """
+    Pending submissions available to this reviewer (read-only)
+    
+    Lists free submissions and those already leased to the caller; use
+    POST /api/v1/reviewer/submissions/claim to reserve them.
+    """
     try:
-        from models import Submission
-        
-        # Get pending submissions for review
-        result = await db.execute(
-            select(Submission)
-            .where(Submission.status == "pending")
-            .order_by(Submission.created_at.desc())
-            .limit(10)
+        available = await get_work_queue_service().list_available(
+            db, str(current_user.id), genre=genre, limit=settings.WORK_QUEUE_MAX_CLAIM
         )
-        pending_submissions = result.scalars().all()
-        
-        # Format for frontend
-        formatted_submissions = []
-        for sub in pending_submissions:
-            formatted_submissions.append({
-                "id": sub.id,
-                "genre": sub.genre,
-                "content_ref": sub.content_ref,
-                "status": sub.status,
-                "created_at": sub.created_at.isoformat(),
-                "updated_at": sub.created_at.isoformat()
-            })
-        
-        return formatted_submissions
+        return _format_queue_items(available)
         
     except Exception as e:
         logger.error(f"Error getting reviewer submissions: {e}", exc_info=True)
@@ -1310,6 +1507,35 @@ async def get_reviewer_submissions(
         )
 
 
+@app.post("/api/v1/reviewer/submissions/claim")
+async def claim_reviewer_submissions(
+    genre: Optional[str] = None,
+    exclude: List[int] = Query(default=[]),
+    current_user: CurrentUser = Depends(require_reviewer),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Lease a batch of pending submissions to this reviewer
+    
+    Other reviewers do not receive these submissions until the lease is
+    released, the reviewer's vote on them is accepted, or the lease
+    expires. Pass already handled IDs in ``exclude``.
+    """
+    try:
+        leased = await get_work_queue_service().claim(
+            db, str(current_user.id), genre=genre,
+            limit=settings.WORK_QUEUE_MAX_CLAIM, exclude=exclude
+        )
+        return _format_queue_items(leased)
+        
+    except Exception as e:
+        logger.error(f"Error claiming reviewer submissions: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
 @app.get("/api/v1/submissions/{submission_id}")
 async def get_submission_by_id(
     submission_id: int,
@@ -1354,7 +1580,7 @@ async def get_rings(
     genre: str = None,
     active: bool = None,
     current_user: CurrentUser = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get rings with optional filtering"""
     try:
@@ -1381,7 +1607,7 @@ async def get_rings(
                 "active": ring.active,
                 "public_keys": ring.pubkeys,
                 "created_at": ring.created_at.isoformat(),
-                "member_count": len(ring.pubkeys) if ring.pubkeys else 0
+                "member_count": ring.member_count
             })
         
         return {
@@ -1407,7 +1633,7 @@ async def submit_test_vote(
 ):
     """Submit a test vote (bypasses crypto verification for development)"""
     try:
-        from models import Vote, Submission, Ring
+        from models import Vote, VoteNullifier, Submission, Ring
         
         # Validate submission exists
         result = await db.execute(
@@ -1435,18 +1661,18 @@ async def submit_test_vote(
         key_image = f"test_key_image_{vote_data['submission_id']}_{current_user.id}"
         
         existing_vote_result = await db.execute(
-            select(Vote).where(
+            select(Vote.id).where(
                 Vote.submission_id == vote_data["submission_id"],
                 Vote.key_image == key_image
             )
         )
-        existing_vote = existing_vote_result.scalar_one_or_none()
+        existing_vote_id = existing_vote_result.scalar_one_or_none()
         
-        if existing_vote:
+        if existing_vote_id:
             logger.info(f"User {current_user.username} already voted on submission {vote_data['submission_id']}")
             return {
                 "success": True,
-                "vote_id": existing_vote.id,
+                "vote_id": existing_vote_id,
                 "message": "Vote already recorded",
                 "already_voted": True
             }
@@ -1464,8 +1690,14 @@ async def submit_test_vote(
         )
         
         db.add(vote)
+        db.add(VoteNullifier(submission_id=vote.submission_id, key_image=key_image))
+        await get_tally_service().record_vote_weight(db, vote)
         await db.commit()
         await db.refresh(vote)
+        await get_tally_service().cache.invalidate(vote.submission_id)
+        await get_event_bus().publish_vote(vote.submission_id, vote.vote_type)
+        get_stats_service().record_vote(vote.vote_type)
+        await get_work_queue_service().release(db, vote.submission_id, str(current_user.id))
         
         logger.info(f"Test vote submitted: {vote.id} by {current_user.username}")
         
@@ -1506,12 +1738,12 @@ async def get_user_vote_status(
         key_image = f"test_key_image_{submission_id}_{current_user.id}"
         
         result = await db.execute(
-            select(Vote).where(
+            select(Vote.vote_type, Vote.created_at).where(
                 Vote.submission_id == submission_id,
                 Vote.key_image == key_image
             )
         )
-        vote = result.scalar_one_or_none()
+        vote = result.first()
         
         if vote:
             return {
@@ -1632,9 +1864,249 @@ async def admin_compute_tally(
         )
 
 
+@app.delete("/api/v1/admin/api-keys/{key_id}", tags=["Admin"])
+async def admin_revoke_api_key(
+    key_id: int,
+    current_user: CurrentUser = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Revoke an API key (admin only)"""
+    try:
+        auth_service = get_auth_service()
+
+        if not await auth_service.revoke_api_key(key_id, db):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="API key not found or already revoked"
+            )
+
+        logger.info(f"Admin {current_user.username} revoked API key {key_id}")
+
+        return {
+            "success": True,
+            "key_id": key_id,
+            "message": "API key revoked"
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error revoking API key {key_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to revoke API key: {str(e)}"
+        )
+
+
+@app.get("/api/v1/admin/export/{resource}", tags=["Admin"])
+async def admin_export(
+    resource: str,
+    format: str = "ndjson",
+    current_user: CurrentUser = Depends(require_admin)
+):
+    """
+    Stream a full table export (admin only)
+    
+    resource: submissions, votes, tallies or audit_logs
+    format: ndjson or csv
+    """
+    from export_service import get_export_service, EXPORT_COLUMNS, EXPORT_FORMATS
+    
+    if resource not in EXPORT_COLUMNS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown export resource: {resource}"
+        )
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format: {format}"
+        )
+    
+    logger.info(f"Admin {current_user.username} exporting {resource} as {format}")
+    filename = f"{resource}-{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.{format}"
+    return StreamingResponse(
+        get_export_service().stream(resource, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@app.get("/api/v1/admin/votes/{vote_id}/signature", tags=["Admin"])
+async def admin_get_vote_signature(
+    vote_id: int,
+    current_user: CurrentUser = Depends(require_admin),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Fetch the stored ring signature of a vote for audit (admin only)"""
+    try:
+        from models import Vote
+        
+        result = await db.execute(
+            select(Vote.submission_id, Vote.ring_id, Vote.key_image).where(Vote.id == vote_id)
+        )
+        vote = result.first()
+        if not vote:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Vote not found"
+            )
+        
+        signature_blob = await get_vote_service().get_vote_signature(vote_id, db)
+        if signature_blob is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Signature not stored for this vote"
+            )
+        
+        logger.info(f"Admin {current_user.username} read signature of vote {vote_id}")
+        return {
+            "vote_id": vote_id,
+            "submission_id": vote.submission_id,
+            "ring_id": vote.ring_id,
+            "key_image": vote.key_image,
+            "signature_blob": signature_blob
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching signature for vote {vote_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch vote signature: {str(e)}"
+        )
+
+
+@app.get("/api/v1/admin/partitions", tags=["Admin"])
+async def admin_list_partitions(
+    current_user: CurrentUser = Depends(require_admin)
+):
+    """List monthly partitions of votes and audit_logs (admin only)"""
+    try:
+        from partition_service import PARTITIONED_TABLES
+        
+        partition_service = get_partition_service()
+        return {
+            "supported": partition_service.supported,
+            "retention_months": partition_service.retention_months,
+            "tables": {
+                table: await partition_service.list_partitions(table)
+                for table in PARTITIONED_TABLES
+            }
+        }
+        
+    except Exception as e:
+        logger.error(f"Error listing partitions: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to list partitions: {str(e)}"
+        )
+
+
+@app.post("/api/v1/admin/partitions/maintain", tags=["Admin"])
+async def admin_run_partition_maintenance(
+    current_user: CurrentUser = Depends(require_admin)
+):
+    """Create upcoming partitions and archive expired ones now (admin only)"""
+    try:
+        logger.info(f"Admin {current_user.username} triggered partition maintenance")
+        return await get_partition_service().run_maintenance()
+        
+    except Exception as e:
+        logger.error(f"Error running partition maintenance: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Partition maintenance failed: {str(e)}"
+        )
+
+
+@app.post("/api/v1/admin/tally/recompute", status_code=status.HTTP_202_ACCEPTED, tags=["Admin"])
+async def admin_bulk_recompute_tallies(
+    genre: Optional[str] = None,
+    status_filter: Optional[List[str]] = Query(None, alias="status"),
+    min_votes: Optional[int] = Query(None, ge=0),
+    current_user: CurrentUser = Depends(require_admin)
+):
+    """
+    Re-tally all (or filtered) submissions in the background (admin only)
+    
+    Poll GET /api/v1/admin/tally/recompute for progress.
+    """
+    try:
+        from models import SubmissionStatus
+        
+        statuses = status_filter or None
+        valid = {s.value for s in SubmissionStatus}
+        if statuses and not set(statuses) <= valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"status must be one of {sorted(valid)}"
+            )
+        
+        try:
+            job = get_tally_service().start_bulk_recompute(
+                genre=genre, statuses=statuses, min_votes=min_votes
+            )
+        except RuntimeError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        
+        logger.info(f"Admin {current_user.username} started bulk tally recompute")
+        return job
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error starting bulk tally recompute: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to start bulk tally recompute: {str(e)}"
+        )
+
+
+@app.get("/api/v1/admin/tally/recompute", tags=["Admin"])
+async def admin_bulk_tally_progress(
+    current_user: CurrentUser = Depends(require_admin)
+):
+    """Progress of the current or most recent bulk re-tally (admin only)"""
+    job = get_tally_service().get_bulk_progress()
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No bulk tally recompute has run"
+        )
+    return job
+
+
+@app.post("/api/v1/admin/tally/weights/recompute", tags=["Admin"])
+async def admin_recompute_vote_weights(
+    credential_hash: Optional[str] = None,
+    current_user: CurrentUser = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Re-derive stored vote weights from current reputations (admin only)
+    
+    Run after reputation scores change; pass credential_hash to limit the
+    rebuild to one reviewer's votes.
+    """
+    try:
+        logger.info(f"Admin {current_user.username} triggered vote weight recompute")
+        return await get_tally_service().recompute_vote_weights(db, credential_hash)
+        
+    except Exception as e:
+        logger.error(f"Error recomputing vote weights: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Vote weight recompute failed: {str(e)}"
+        )
+
+
 @app.get("/api/v1/admin/escalations")
 async def get_escalated_submissions(
     current_user: CurrentUser = Depends(require_admin),
+    limit: int = 100,
+    cursor: Optional[Cursor] = Depends(cursor_param),
     db: AsyncSession = Depends(get_db)
 ):
     """Get escalated submissions for admin review"""
@@ -1642,12 +2114,14 @@ async def get_escalated_submissions(
         from models import Submission
         
         # Get escalated submissions
-        result = await db.execute(
-            select(Submission)
-            .where(Submission.status == "escalated")
-            .order_by(Submission.created_at.desc())
+        limit = clamp_limit(limit)
+        result = await db.execute(keyset_page(
+            select(Submission).where(Submission.status == "escalated"),
+            Submission.created_at, Submission.id, cursor, limit
+        ))
+        escalated_submissions, next_cursor = split_page(
+            result.scalars().all(), limit, lambda s: (s.created_at, s.id)
         )
-        escalated_submissions = result.scalars().all()
         
         # Format for frontend
         formatted_submissions = []
@@ -1664,7 +2138,8 @@ async def get_escalated_submissions(
         return {
             "success": True,
             "escalated_submissions": formatted_submissions,
-            "count": len(formatted_submissions)
+            "count": len(formatted_submissions),
+            "next_cursor": next_cursor
         }
         
     except Exception as e:
@@ -1678,6 +2153,8 @@ async def get_escalated_submissions(
 @app.get("/api/v1/admin/flagged")
 async def get_flagged_submissions(
     current_user: CurrentUser = Depends(require_admin),
+    limit: int = 100,
+    cursor: Optional[Cursor] = Depends(cursor_param),
     db: AsyncSession = Depends(get_db)
 ):
     """Get flagged submissions with submitter IP/MAC for admin review"""
@@ -1685,12 +2162,14 @@ async def get_flagged_submissions(
         from models import Submission
         
         # Get flagged submissions
-        result = await db.execute(
-            select(Submission)
-            .where(Submission.status == "flagged")
-            .order_by(Submission.created_at.desc())
+        limit = clamp_limit(limit)
+        result = await db.execute(keyset_page(
+            select(Submission).where(Submission.status == "flagged"),
+            Submission.created_at, Submission.id, cursor, limit
+        ))
+        flagged_submissions, next_cursor = split_page(
+            result.scalars().all(), limit, lambda s: (s.created_at, s.id)
         )
-        flagged_submissions = result.scalars().all()
         
         # Format for frontend with submitter information
         formatted_submissions = []
@@ -1716,6 +2195,7 @@ async def get_flagged_submissions(
             "success": True,
             "flagged_submissions": formatted_submissions,
             "count": len(formatted_submissions),
+            "next_cursor": next_cursor,
             "warning": "Flagged content includes submitter IP/MAC hashes for investigation"
         }
         
@@ -1804,6 +2284,7 @@ async def admin_review_submission(
             )
         
         # Update submission status (only for escalated/flagged or no tally)
+        old_status = submission.status
         if action == "approve":
             submission.status = "approved"
         elif action == "reject":
@@ -1818,6 +2299,8 @@ async def admin_review_submission(
         
         await db.commit()
         await db.refresh(submission)
+        get_stats_service().record_status_change(old_status, submission.status)
+        await get_event_bus().publish_status(submission.id, old_status, submission.status)
         
         logger.info(f"Admin {current_user.username} {action}ed submission {submission_id}")
         
@@ -1879,9 +2362,12 @@ async def resolve_escalation(
         
         # Update submission status
         new_status = "approved" if resolution == "approve" else "rejected"
+        old_status = submission.status
         submission.status = new_status
         
         await db.commit()
+        get_stats_service().record_status_change(old_status, new_status)
+        await get_event_bus().publish_status(submission_id, old_status, new_status)
         
         logger.info(f"Admin {current_user.username} resolved escalation {submission_id} as {new_status}")
         
@@ -1909,36 +2395,40 @@ async def resolve_escalation(
 async def get_audit_logs(
     current_user: CurrentUser = Depends(require_admin),
     limit: int = 50,
-    offset: int = 0,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[Cursor] = Depends(cursor_param),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get audit logs for admin review"""
     try:
         from models import Vote, Submission
         
         # Get recent votes as audit logs
-        result = await db.execute(
-            select(Vote, Submission)
-            .join(Submission, Vote.submission_id == Submission.id)
-            .order_by(Vote.created_at.desc())
-            .limit(limit)
-            .offset(offset)
+        limit = clamp_limit(limit)
+        result = await db.execute(keyset_page(
+            select(
+                Vote.id, Vote.vote_type, Vote.key_image, Vote.created_at,
+                Submission.id.label("submission_id"), Submission.genre, Submission.status
+            )
+            .join(Submission, Vote.submission_id == Submission.id),
+            Vote.created_at, Vote.id, cursor, limit
+        ))
+        vote_rows, next_cursor = split_page(
+            result.all(), limit, lambda row: (row.created_at, row.id)
         )
-        vote_submissions = result.all()
         
         # Format audit logs
         audit_logs = []
-        for vote, submission in vote_submissions:
+        for row in vote_rows:
             audit_logs.append({
-                "id": vote.id,
-                "action": f"Vote: {vote.vote_type}",
-                "submission_id": submission.id,
-                "submission_genre": submission.genre,
-                "submission_status": submission.status,
-                "timestamp": vote.created_at.isoformat(),
-                "details": f"Submission #{submission.id} ({submission.genre}) voted as {vote.vote_type}",
-                "vote_id": vote.id,
-                "key_image": vote.key_image[:16] + "..." if vote.key_image else "N/A"
+                "id": row.id,
+                "action": f"Vote: {row.vote_type}",
+                "submission_id": row.submission_id,
+                "submission_genre": row.genre,
+                "submission_status": row.status,
+                "timestamp": row.created_at.isoformat(),
+                "details": f"Submission #{row.submission_id} ({row.genre}) voted as {row.vote_type}",
+                "vote_id": row.id,
+                "key_image": row.key_image[:16] + "..." if row.key_image else "N/A"
             })
         
         return {
@@ -1946,7 +2436,7 @@ async def get_audit_logs(
             "logs": audit_logs,
             "total": len(audit_logs),
             "limit": limit,
-            "offset": offset
+            "next_cursor": next_cursor
         }
         
     except Exception as e:
@@ -1959,103 +2449,43 @@ async def get_audit_logs(
 
 @app.get("/api/v1/admin/statistics")
 async def get_admin_statistics(
-    current_user: CurrentUser = Depends(require_admin),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(require_admin)
 ):
-    """Get detailed statistics for admin dashboard"""
+    """Get detailed statistics for admin dashboard (cached snapshot)"""
     try:
-        from models import Submission, Vote, Ring, Token, Reviewer
-        from sqlalchemy import func, distinct
-        
-        # Submission statistics
-        result = await db.execute(select(func.count(Submission.id)))
-        total_submissions = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Submission.id)).where(Submission.status == "pending"))
-        pending_submissions = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Submission.id)).where(Submission.status == "approved"))
-        approved_submissions = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Submission.id)).where(Submission.status == "rejected"))
-        rejected_submissions = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Submission.id)).where(Submission.status == "escalated"))
-        escalated_submissions = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Submission.id)).where(Submission.status == "flagged"))
-        flagged_submissions = result.scalar() or 0
-        
-        # Vote statistics
-        result = await db.execute(select(func.count(Vote.id)))
-        total_votes = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Vote.id)).where(Vote.vote_type == "approve"))
-        approve_votes = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Vote.id)).where(Vote.vote_type == "reject"))
-        reject_votes = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Vote.id)).where(Vote.vote_type == "escalate"))
-        escalate_votes = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Vote.id)).where(Vote.vote_type == "flag"))
-        flag_votes = result.scalar() or 0
-        
-        # Ring and Token statistics
-        result = await db.execute(select(func.count(Ring.id)))
-        total_rings = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Ring.id)).where(Ring.active == True))
-        active_rings = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Token.token_id)))
-        total_tokens = result.scalar() or 0
-        
-        result = await db.execute(select(func.count(Token.token_id)).where(Token.redeemed == False))
-        available_tokens = result.scalar() or 0
-        
-        # Reviewer statistics
-        result = await db.execute(select(func.count(Reviewer.id)))
-        total_reviewers = result.scalar() or 0
-        
-        # Genre breakdown
-        result = await db.execute(
-            select(Submission.genre, func.count(Submission.id))
-            .group_by(Submission.genre)
-        )
-        genre_stats = {genre: count for genre, count in result.all()}
+        snapshot = await get_stats_service().get_snapshot()
+        submissions = snapshot["submissions"]
+        votes = snapshot["votes"]
+        tokens = snapshot["tokens"]
         
         return {
             "success": True,
             "submissions": {
-                "total": total_submissions,
-                "pending": pending_submissions,
-                "approved": approved_submissions,
-                "rejected": rejected_submissions,
-                "escalated": escalated_submissions,
-                "flagged": flagged_submissions,
-                "by_genre": genre_stats
+                "total": submissions["total"],
+                "pending": submissions["pending"],
+                "approved": submissions["approved"],
+                "rejected": submissions["rejected"],
+                "escalated": submissions["escalated"],
+                "flagged": submissions["flagged"],
+                "by_genre": submissions["by_genre"]
             },
             "votes": {
-                "total": total_votes,
-                "approve": approve_votes,
-                "reject": reject_votes,
-                "escalate": escalate_votes,
-                "flag": flag_votes
-            },
-            "rings": {
-                "total": total_rings,
-                "active": active_rings
+                "total": votes["total"],
+                "approve": votes["approve"],
+                "reject": votes["reject"],
+                "escalate": votes["escalate"],
+                "flag": votes["flag"]
             },
+            "rings": snapshot["rings"],
             "tokens": {
-                "total": total_tokens,
-                "available": available_tokens,
-                "used": total_tokens - available_tokens
+                "total": tokens["total"],
+                "available": tokens["available"],
+                "used": tokens["total"] - tokens["available"]
             },
             "reviewers": {
-                "total": total_reviewers
-            }
+                "total": snapshot["reviewers"]["total"]
+            },
+            "generated_at": snapshot["generated_at"]
         }
         
     except Exception as e:
@@ -2105,7 +2535,7 @@ async def submit_test_vote(
             )
         
         # Create a test vote record
-        from models import Vote
+        from models import Vote, VoteNullifier
         import uuid
         
         vote = Vote(
@@ -2120,10 +2550,17 @@ async def submit_test_vote(
         )
         
         db.add(vote)
+        db.add(VoteNullifier(submission_id=vote.submission_id, key_image=vote.key_image))
+        await get_tally_service().record_vote_weight(db, vote)
         await db.commit()
         await db.refresh(vote)
+        await get_tally_service().cache.invalidate(vote.submission_id)
+        await get_event_bus().publish_vote(vote.submission_id, vote.vote_type)
+        get_stats_service().record_vote(vote.vote_type)
+        await get_work_queue_service().release(db, vote.submission_id, str(current_user.id))
         
         # Update submission status based on vote
+        old_status = submission.status
         if vote_request.vote_type == "approve":
             submission.status = "approved"
         elif vote_request.vote_type == "reject":
@@ -2134,6 +2571,8 @@ async def submit_test_vote(
             submission.status = "flagged"
         
         await db.commit()
+        get_stats_service().record_status_change(old_status, submission.status)
+        await get_event_bus().publish_status(submission.id, old_status, submission.status)
         
         logger.info(f"Test vote {vote.id} created successfully, submission {submission.id} status updated to {submission.status}")
         
@@ -2238,6 +2677,9 @@ async def submit_vote(
                 detail=result.get("error", "Vote submission failed")
             )
         
+        # The reviewer is done with this submission; let others have it
+        await get_work_queue_service().release(db, vote_request.submission_id, str(current_user.id))
+        
         # Check if we should compute tally
         tally_service = get_tally_service()
         if await tally_service.should_compute_tally(vote_request.submission_id, db):
@@ -2267,21 +2709,13 @@ async def get_tally(
 ):
     """
     Get or compute tally for a submission
+    
+    Served from the tally cache; a miss reads or computes the tally on
+    the primary, once per submission however many clients are polling.
     """
     try:
         tally_service = get_tally_service()
-        
-        # Try to get existing tally
-        existing_tally = await tally_service.get_tally_by_submission(submission_id, db)
-        
-        if existing_tally:
-            return TallyResponse(
-                success=True,
-                **existing_tally
-            )
-        
-        # Compute new tally
-        result = await tally_service.compute_tally(submission_id, db)
+        result = await tally_service.get_or_compute_tally(submission_id, db)
         
         if not result["success"]:
             raise HTTPException(
@@ -2301,6 +2735,32 @@ async def get_tally(
         )
 
 
+@app.get("/api/v1/events/stream", tags=["Voting"])
+async def stream_events(
+    submission_id: List[int] = Query(..., description="Submission to follow (repeatable)")
+):
+    """
+    Live updates for submissions as server-sent events
+    
+    Events: ``vote`` (one more vote of a type), ``tally`` (recomputed counts
+    and decision) and ``status`` (status transition). Clients fetch the
+    current tally once and apply events instead of polling. A client too
+    slow to keep up receives ``evicted`` and should reconnect.
+    """
+    submission_ids = set(submission_id)
+    if len(submission_ids) > settings.EVENT_STREAM_MAX_SUBMISSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.EVENT_STREAM_MAX_SUBMISSIONS} submissions per stream"
+        )
+    
+    return StreamingResponse(
+        get_event_bus().stream(submission_ids, settings.EVENT_STREAM_HEARTBEAT),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/api/v1/tally/{submission_id}/weighted", response_model=TallyResponse, tags=["Voting"])
 async def get_weighted_tally(
     submission_id: int,
@@ -2310,8 +2770,9 @@ async def get_weighted_tally(
     """
     Get weighted tally for a submission (accounts for reputation)
     
-    This endpoint computes vote weights based on voter reputation,
-    providing a more nuanced decision than simple vote counting.
+    Vote weights are based on voter reputation, providing a more nuanced
+    decision than simple vote counting. Sums are maintained as votes are
+    accepted, so this is a constant-time read.
     """
     try:
         tally_service = get_tally_service()
@@ -2329,7 +2790,7 @@ async def get_weighted_tally(
             success=True,
             tally_id=None,  # Weighted tally doesn't have a tally_id yet
             counts=result["weighted_counts"],
-            total_votes=len(result.get("unweighted_counts", {})),
+            total_votes=sum(result["unweighted_counts"].values()),
             decision=result["decision"],
             computed_at=result["computed_at"],
             metadata={
@@ -2436,6 +2897,7 @@ async def create_submission(
         db.add(submission)
         await db.commit()
         await db.refresh(submission)
+        get_stats_service().record_submission(submission.genre, submission.status)
         
         logger.info(f"Created submission {submission.id} in genre {submission.genre}")
         
@@ -2507,10 +2969,24 @@ async def create_ring(
     """
     try:
         from models import Ring
+        from ring_service import parse_pubkey
+        
+        try:
+            pubkeys = [parse_pubkey(pk).hex() for pk in ring_data["pubkeys"]]
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid hex in public key"
+            )
+        if len(set(pubkeys)) != len(pubkeys):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Duplicate public keys in ring"
+            )
         
         ring = Ring(
             genre=ring_data["genre"],
-            pubkeys=ring_data["pubkeys"],
+            pubkeys=pubkeys,
             epoch=ring_data["epoch"],
             active=True,
             created_at=datetime.utcnow()
@@ -2520,16 +2996,18 @@ async def create_ring(
         await db.commit()
         await db.refresh(ring)
         
-        logger.info(f"Created ring {ring.id} with {len(ring.pubkeys)} members")
+        logger.info(f"Created ring {ring.id} with {ring.member_count} members")
         
         return {
             "success": True,
             "ring_id": ring.id,
             "genre": ring.genre,
             "epoch": ring.epoch,
-            "member_count": len(ring.pubkeys)
+            "member_count": ring.member_count
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating ring: {e}", exc_info=True)
         await db.rollback()
@@ -2564,7 +3042,8 @@ async def get_ring(
             "ring_id": ring.id,
             "genre": ring.genre,
             "epoch": ring.epoch,
-            "member_count": len(ring.pubkeys),
+            "member_count": ring.member_count,
+            "version": ring.version,
             "active": ring.active,
             "created_at": ring.created_at.isoformat()
         }
@@ -2711,15 +3190,23 @@ async def list_public_keys(
 
 @app.get("/api/v1/submissions")
 async def list_submissions(
+    response: Response,
+    limit: int = 100,
+    cursor: Optional[Cursor] = Depends(cursor_param),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all submissions (basic listing for UI)"""
+    """List submissions (basic listing for UI); next page cursor in X-Next-Cursor"""
     try:
         from models import Submission
-        result = await db.execute(
-            select(Submission).order_by(Submission.created_at.desc())
-        )
-        submissions = result.scalars().all()
+        limit = clamp_limit(limit)
+        result = await db.execute(keyset_page(
+            select(Submission), Submission.created_at, Submission.id, cursor, limit
+        ))
+        submissions, next_cursor = split_page(
+            result.scalars().all(), limit, lambda s: (s.created_at, s.id)
+        )
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         return [
             {
                 "submission_id": s.id,
@@ -2745,14 +3232,11 @@ async def get_reviewer_stats(
 ):
     """Basic reviewer stats used by dashboard"""
     try:
-        from models import Submission, Vote, Token
+        from models import Vote, Token
         from sqlalchemy import func
 
-        # Available submissions = pending count
-        result = await db.execute(
-            select(func.count(Submission.id)).where(Submission.status == "pending")
-        )
-        available = result.scalar() or 0
+        # Available submissions = pending and not currently leased
+        available = (await get_work_queue_service().queue_depth(db))["available"]
 
         # Votes cast (global verified count for now)
         result = await db.execute(
@@ -2781,24 +3265,24 @@ async def get_reviewer_stats(
 
 @app.get("/api/v1/reviewer/next")
 async def get_next_submission(
+    genre: Optional[str] = None,
+    exclude: List[int] = Query(default=[]),
     current_user: CurrentUser = Depends(require_reviewer),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get next pending submission for quick review"""
+    """Lease the next pending submission for quick review"""
     try:
-        from models import Submission
-        result = await db.execute(
-            select(Submission)
-            .where(Submission.status == "pending")
-            .order_by(Submission.created_at.asc())
-            .limit(1)
+        leased = await get_work_queue_service().claim(
+            db, str(current_user.id), genre=genre, limit=1, exclude=exclude
         )
-        submission = result.scalar_one_or_none()
-        if not submission:
+        if not leased:
             return None
+        submission = leased[0]
         return {
-            "id": submission.id,
-            "genre": submission.genre,
+            "id": submission["id"],
+            "genre": submission["genre"],
+            "content_ref": submission["content_ref"],
+            "lease_expires_at": submission["lease_expires_at"].isoformat(),
         }
     except Exception as e:
         logger.error(f"Error getting next submission: {e}", exc_info=True)
@@ -2808,6 +3292,25 @@ async def get_next_submission(
         )
 
 
+@app.post("/api/v1/reviewer/submissions/{submission_id}/release")
+async def release_submission_lease(
+    submission_id: int,
+    current_user: CurrentUser = Depends(require_reviewer),
+    db: AsyncSession = Depends(get_db)
+):
+    """Return a leased submission to the queue (after voting or skipping it)"""
+    try:
+        released = await get_work_queue_service().release(db, submission_id, str(current_user.id))
+        return {"success": True, "released": released}
+        
+    except Exception as e:
+        logger.error(f"Error releasing submission {submission_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
 @app.put("/api/v1/rings/{ring_id}")
 async def update_ring(
     ring_id: int,
@@ -2819,14 +3322,13 @@ async def update_ring(
     try:
         from sqlalchemy import select, update
         from models import Ring
+        from ring_service import get_ring_service, parse_pubkey
         
         # Check if ring exists
         result = await db.execute(
-            select(Ring).where(Ring.id == ring_id)
+            select(Ring.id).where(Ring.id == ring_id)
         )
-        ring = result.scalar_one_or_none()
-        
-        if not ring:
+        if result.scalar_one_or_none() is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Ring not found"
@@ -2840,26 +3342,43 @@ async def update_ring(
             update_data["epoch"] = ring_update.epoch
         if ring_update.active is not None:
             update_data["active"] = ring_update.active
+        
+        pubkeys = None
         if ring_update.pubkeys is not None:
-            update_data["pubkeys"] = ring_update.pubkeys
+            try:
+                pubkeys = [parse_pubkey(pk) for pk in ring_update.pubkeys]
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid hex in public key"
+                )
+            if len(set(pubkeys)) != len(pubkeys):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Duplicate public keys in ring"
+                )
         
-        if not update_data:
+        if not update_data and pubkeys is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No valid fields to update"
             )
         
         # Update the ring
-        await db.execute(
-            update(Ring)
-            .where(Ring.id == ring_id)
-            .values(**update_data)
-        )
+        if update_data:
+            await db.execute(
+                update(Ring)
+                .where(Ring.id == ring_id)
+                .values(**update_data)
+            )
+        if pubkeys is not None:
+            await get_ring_service().replace_members(db, ring_id, pubkeys)
         await db.commit()
         
         # Get updated ring
         result = await db.execute(
             select(Ring).where(Ring.id == ring_id)
+            .execution_options(populate_existing=True)
         )
         updated_ring = result.scalar_one()
         
@@ -2870,7 +3389,8 @@ async def update_ring(
             "ring_id": updated_ring.id,
             "genre": updated_ring.genre,
             "epoch": updated_ring.epoch,
-            "member_count": len(updated_ring.pubkeys) if updated_ring.pubkeys else 0,
+            "member_count": updated_ring.member_count,
+            "version": updated_ring.version,
             "active": updated_ring.active,
             "created_at": updated_ring.created_at.isoformat()
         }
@@ -2912,7 +3432,7 @@ async def delete_ring(
         # Check if ring has any votes (prevent deletion if votes exist)
         try:
             result = await db.execute(
-                select(Vote).where(Vote.ring_id == ring_id).limit(1)
+                select(Vote.id).where(Vote.ring_id == ring_id).limit(1)
             )
             existing_vote = result.scalar_one_or_none()
             
@@ -2966,53 +3486,31 @@ async def add_ring_member(
 ):
     """Add a member to a ring (admin only)"""
     try:
-        from sqlalchemy import select, update
-        from models import Ring
-        
-        # Check if ring exists
-        result = await db.execute(
-            select(Ring).where(Ring.id == ring_id)
-        )
-        ring = result.scalar_one_or_none()
-        
-        if not ring:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Ring not found"
-            )
+        from ring_service import get_ring_service, parse_pubkey
         
         # Validate public key format
-        pk = member_request.public_key_hex.lower()
-        if any(ch not in "0123456789abcdef" for ch in pk):
+        try:
+            pk = parse_pubkey(member_request.public_key_hex)
+        except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid hex in public key"
             )
         
-        # Check if public key already exists in ring
-        current_pubkeys = ring.pubkeys or []
-        if pk in current_pubkeys:
+        success, membership, error = await get_ring_service().add_member(db, ring_id, pk)
+        if not success:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Public key already exists in ring"
+                status_code=status.HTTP_404_NOT_FOUND if error == "Ring not found" else status.HTTP_400_BAD_REQUEST,
+                detail=error
             )
         
-        # Add the public key
-        updated_pubkeys = current_pubkeys + [pk]
-        
-        await db.execute(
-            update(Ring)
-            .where(Ring.id == ring_id)
-            .values(pubkeys=updated_pubkeys)
-        )
-        await db.commit()
-        
         logger.info(f"Added member to ring {ring_id} by admin {current_user.username}")
         
         return {
             "success": True,
             "ring_id": ring_id,
-            "member_count": len(updated_pubkeys),
+            "member_count": membership["member_count"],
+            "version": membership["version"],
             "message": "Member added successfully"
         }
         
@@ -3036,55 +3534,31 @@ async def remove_ring_member(
 ):
     """Remove a member from a ring (admin only)"""
     try:
-        from sqlalchemy import select, update
-        from models import Ring
-        
-        # Check if ring exists
-        result = await db.execute(
-            select(Ring).where(Ring.id == ring_id)
-        )
-        ring = result.scalar_one_or_none()
-        
-        if not ring:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Ring not found"
-            )
+        from ring_service import get_ring_service, parse_pubkey
         
         # Normalize public key
-        pk = public_key_hex.lower()
-        
-        # Check if public key exists in ring
-        current_pubkeys = ring.pubkeys or []
-        if pk not in current_pubkeys:
+        try:
+            pk = parse_pubkey(public_key_hex)
+        except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Public key not found in ring"
             )
         
-        # Remove the public key
-        updated_pubkeys = [key for key in current_pubkeys if key != pk]
-        
-        # Prevent removing all members
-        if len(updated_pubkeys) == 0:
+        success, membership, error = await get_ring_service().remove_member(db, ring_id, pk)
+        if not success:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot remove all members from ring"
+                status_code=status.HTTP_400_BAD_REQUEST if error.startswith("Cannot") else status.HTTP_404_NOT_FOUND,
+                detail=error
             )
         
-        await db.execute(
-            update(Ring)
-            .where(Ring.id == ring_id)
-            .values(pubkeys=updated_pubkeys)
-        )
-        await db.commit()
-        
         logger.info(f"Removed member from ring {ring_id} by admin {current_user.username}")
         
         return {
             "success": True,
             "ring_id": ring_id,
-            "member_count": len(updated_pubkeys),
+            "member_count": membership["member_count"],
+            "version": membership["version"],
             "message": "Member removed successfully"
         }
         
@@ -3099,6 +3573,44 @@ async def remove_ring_member(
         )
 
 
+@app.get("/api/v1/rings/by-key/{public_key_hex}")
+async def get_rings_for_key(
+    public_key_hex: str,
+    active_only: bool = False,
+    current_user: CurrentUser = Depends(require_admin),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """List rings containing a public key (admin only)"""
+    try:
+        from ring_service import get_ring_service, parse_pubkey
+        
+        try:
+            pk = parse_pubkey(public_key_hex)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid hex in public key"
+            )
+        
+        rings = await get_ring_service().rings_for_key(db, pk, active_only)
+        
+        return {
+            "success": True,
+            "public_key_hex": pk.hex(),
+            "rings": rings,
+            "count": len(rings)
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error looking up rings for key: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
 # =============================================================================
 # Ring Listing Endpoint
 # =============================================================================
@@ -3106,7 +3618,7 @@ async def remove_ring_member(
 @app.get("/api/v1/rings")
 async def list_rings(
     current_user: CurrentUser = Depends(require_admin),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all rings (admin only)"""
     try:
@@ -3123,7 +3635,7 @@ async def list_rings(
                 "ring_id": ring.id,
                 "genre": ring.genre,
                 "epoch": ring.epoch,
-                "member_count": len(ring.pubkeys) if ring.pubkeys else 0,
+                "member_count": ring.member_count,
                 "active": ring.active,
                 "created_at": ring.created_at.isoformat()
             }
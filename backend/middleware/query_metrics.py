@@ -0,0 +1,56 @@
+"""
+ProofPals Query Metrics Middleware
+Attributes database queries issued while handling a request to its route
+"""
+
+import logging
+
+from database import QueryStats, current_query_stats
+from monitoring_service import get_monitoring_service
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(scope) -> str:
+    """
+    Path template of the route that handled a request
+
+    Templates keep metric cardinality bounded (one series per endpoint,
+    not per submission ID); requests that matched no route share one label.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class QueryMetricsMiddleware:
+    """
+    Pure ASGI middleware collecting per-request query statistics
+
+    A fresh QueryStats is bound to the request's context before the app
+    runs; database.py cursor hooks add every statement to it, including
+    those issued while a streaming body is sent. When the response is
+    complete the totals are recorded per route in MonitoringService.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Raw path until routing resolves the template (used by the slow-query log)
+        stats = QueryStats(route=scope.get("path"))
+        token = current_query_stats.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_query_stats.reset(token)
+            stats.route = route_template(scope)
+            try:
+                get_monitoring_service().record_request_queries(stats.route, scope["method"], stats)
+            except Exception as e:
+                logger.error(f"Failed to record query metrics: {e}")
@@ -0,0 +1,69 @@
+"""
+ProofPals Request Metrics Middleware
+Latency, status, size and in-flight metrics for every route
+"""
+
+import logging
+import time
+
+from middleware.query_metrics import route_template
+from monitoring_service import get_monitoring_service
+
+logger = logging.getLogger(__name__)
+
+IN_FLIGHT_GAUGE = "http_requests_in_flight"
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request
+
+    Wraps receive and send to count body bytes and capture the status
+    code without buffering anything, and records the request when the
+    response body has been fully sent (so streaming responses are timed
+    to their end). Requests are labeled by route template; the in-flight
+    gauge is unlabeled because the route is unknown until routing runs.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        monitoring = get_monitoring_service()
+        request_bytes = 0
+        response_bytes = 0
+        status_code = 500
+
+        async def counting_receive():
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            nonlocal response_bytes, status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        monitoring.metrics.adjust_gauge(IN_FLIGHT_GAUGE, 1)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            monitoring.metrics.adjust_gauge(IN_FLIGHT_GAUGE, -1)
+            try:
+                monitoring.record_request(
+                    route_template(scope), scope["method"], status_code,
+                    duration_ms, request_bytes, response_bytes
+                )
+            except Exception as e:
+                logger.error(f"Failed to record request metrics: {e}")
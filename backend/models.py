@@ -4,15 +4,17 @@ All 9 tables with proper relationships and indexes
 """
 
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime, Text, 
+    Column, Integer, String, Boolean, DateTime, Text, Float,
     LargeBinary, JSON, ForeignKey, Index, BigInteger, 
     Enum as SQLEnum, UniqueConstraint
 )
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
+from config import settings
 import enum
+import zlib
 
 
 # ============================================================================
@@ -54,6 +56,9 @@ class Submission(Base):
     
     Stores minimal metadata about submitted content.
     IP/MAC hashes are ONLY used for escalation/legal requests.
+    Pending submissions form the reviewer work queue: lease_owner and
+    lease_expires_at mark an item handed to one reviewer (see
+    work_queue_service).
     """
     __tablename__ = "submissions"
     
@@ -71,6 +76,8 @@ class Submission(Base):
     )
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     last_tallied_at = Column(DateTime(timezone=True), nullable=True)
+    lease_owner = Column(String(64), nullable=True)  # user id holding the review lease
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     votes = relationship("Vote", back_populates="submission", cascade="all, delete-orphan")
@@ -80,7 +87,21 @@ class Submission(Base):
     # Indexes
     __table_args__ = (
         Index('idx_submission_genre_status', 'genre', 'status'),
-        Index('idx_submission_created', 'created_at'),
+        # Keyset pagination: (created_at, id) with optional equality prefix
+        Index('idx_submission_created_id', 'created_at', 'id'),
+        Index('idx_submission_status_created_id', 'status', 'created_at', 'id'),
+        Index('idx_submission_user_created_id', 'user_id', 'created_at', 'id'),
+        # Work queue: only pending rows, oldest first, optionally by genre
+        Index(
+            'idx_submission_pending_queue', 'created_at', 'id',
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'")
+        ),
+        Index(
+            'idx_submission_pending_genre_queue', 'genre', 'created_at', 'id',
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'")
+        ),
     )
     
     def __repr__(self):
@@ -97,18 +118,28 @@ class Ring(Base):
     
     Each ring contains multiple public keys (PKs) for a specific genre and epoch.
     Signatures prove membership in ring without revealing which PK signed.
+    Members live in ring_members; version increases on every membership change.
     """
     __tablename__ = "rings"
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     genre = Column(String(100), nullable=False, index=True)
-    pubkeys = Column(JSON, nullable=False)  # List of public key hex strings
     epoch = Column(Integer, nullable=False, index=True)
     active = Column(Boolean, default=True, nullable=False, index=True)
+    version = Column(Integer, default=0, server_default="0", nullable=False)
+    member_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
     votes = relationship("Vote", back_populates="ring")
+    members = relationship(
+        "RingMember",
+        back_populates="ring",
+        order_by="RingMember.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin"
+    )
     
     # Indexes
     __table_args__ = (
@@ -116,8 +147,54 @@ class Ring(Base):
         Index('idx_ring_epoch', 'epoch'),
     )
     
+    @property
+    def pubkeys(self):
+        """Member public keys as hex strings, in ring order"""
+        return [member.pubkey.hex() for member in self.members]
+    
+    @pubkeys.setter
+    def pubkeys(self, pubkeys):
+        """
+        Set the members of a new ring
+        
+        Persisted rings should change membership through RingService so
+        old rows are deleted before replacements are inserted.
+        """
+        self.members = [
+            RingMember(position=position, pubkey=bytes.fromhex(pk))
+            for position, pk in enumerate(pubkeys)
+        ]
+        self.member_count = len(pubkeys)
+        self.version = (self.version or 0) + 1
+    
     def __repr__(self):
-        return f"<Ring(id={self.id}, genre='{self.genre}', epoch={self.epoch}, members={len(self.pubkeys) if self.pubkeys else 0})>"
+        return f"<Ring(id={self.id}, genre='{self.genre}', epoch={self.epoch}, members={self.member_count})>"
+
+
+class RingMember(Base):
+    """
+    One public key in a ring
+    
+    (ring_id, position) preserves the ring order signatures are made over;
+    the pubkey index answers "which rings contain this key".
+    """
+    __tablename__ = "ring_members"
+    
+    ring_id = Column(Integer, ForeignKey('rings.id', ondelete='CASCADE'), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    pubkey = Column(LargeBinary, nullable=False)
+    
+    # Relationships
+    ring = relationship("Ring", back_populates="members")
+    
+    # Indexes and Constraints
+    __table_args__ = (
+        UniqueConstraint('ring_id', 'pubkey', name='uq_ring_member_pubkey'),
+        Index('idx_ring_member_pubkey', 'pubkey'),
+    )
+    
+    def __repr__(self):
+        return f"<RingMember(ring_id={self.ring_id}, position={self.position})>"
 
 
 # ============================================================================
@@ -164,42 +241,133 @@ class Vote(Base):
     Individual votes on submissions
     
     Each vote contains:
-    - CLSAG ring signature (proves authenticity + anonymity)
+    - CLSAG ring signature (proves authenticity + anonymity), stored in
+      vote_signatures so the hot table only holds what tallies and
+      anomaly checks read
     - key_image (enables linkability - same credential = same key_image)
     - token_id (consumed token for sybil resistance)
     
-    CRITICAL: (submission_id, key_image) must be unique to prevent double voting
+    CRITICAL: (submission_id, key_image) must be unique to prevent double voting.
+    Uniqueness is enforced by vote_nullifiers: on PostgreSQL votes is range
+    partitioned by month on created_at (primary key (id, created_at)), and a
+    partitioned table cannot carry a unique constraint without the partition key.
     """
     __tablename__ = "votes"
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     submission_id = Column(Integer, ForeignKey('submissions.id', ondelete='CASCADE'), nullable=False, index=True)
     ring_id = Column(Integer, ForeignKey('rings.id', ondelete='CASCADE'), nullable=False, index=True)
-    signature_blob = Column(Text, nullable=False)  # JSON string of CLSAG signature
     key_image = Column(String(64), nullable=False, index=True)  # Hex string for linkability
     vote_type = Column(SQLEnum(VoteType), nullable=False, index=True)
     token_id = Column(String(64), nullable=False, index=True)
     verified = Column(Boolean, default=False, nullable=False)
+    # Reputation weight captured at acceptance; NULL if the token has no reviewer
+    weight = Column(Float, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
     submission = relationship("Submission", back_populates="votes")
     ring = relationship("Ring", back_populates="votes")
+    signature = relationship(
+        "VoteSignature",
+        primaryjoin="and_(Vote.id == foreign(VoteSignature.vote_id), "
+                    "Vote.submission_id == foreign(VoteSignature.submission_id))",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,  # submission_id cascades in the database
+        lazy="raise"  # load explicitly (selectinload) for audit/re-verification
+    )
     
     # Indexes and Constraints
     __table_args__ = (
-        # CRITICAL: Prevent duplicate votes from same credential on same submission
-        UniqueConstraint('submission_id', 'key_image', name='uq_vote_submission_keyimage'),
         Index('idx_vote_submission_keyimage', 'submission_id', 'key_image'),
         Index('idx_vote_submission_created', 'submission_id', 'created_at'),
         Index('idx_vote_token', 'token_id'),
         Index('idx_vote_keyimage', 'key_image'),
+        Index('idx_vote_created_id', 'created_at', 'id'),
     )
     
+    @property
+    def signature_blob(self):
+        """CLSAG signature JSON (requires the signature relationship loaded)"""
+        return self.signature.signature_blob if self.signature else None
+    
+    @signature_blob.setter
+    def signature_blob(self, signature_blob):
+        """Attach the signature of a new vote"""
+        self.signature = VoteSignature.from_blob(signature_blob)
+    
     def __repr__(self):
         return f"<Vote(id={self.id}, submission_id={self.submission_id}, type='{self.vote_type}', verified={self.verified})>"
 
 
+class VoteSignature(Base):
+    """
+    Cold storage for vote signatures
+    
+    Read only for audits and re-verification. vote_id has no foreign key
+    because on PostgreSQL the votes primary key is (id, created_at); rows go
+    away with their submission or when a votes partition is archived.
+    """
+    __tablename__ = "vote_signatures"
+    
+    vote_id = Column(Integer, primary_key=True, autoincrement=False)
+    submission_id = Column(
+        Integer,
+        ForeignKey('submissions.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True
+    )
+    signature = Column(LargeBinary, nullable=False)  # UTF-8 JSON, zlib-compressed when compression is set
+    compression = Column(String(8), nullable=True)
+    
+    @classmethod
+    def from_blob(cls, signature_blob: str, compress=None):
+        """Build a row from signature JSON, compressing per VOTE_SIGNATURE_COMPRESSION"""
+        compress = settings.VOTE_SIGNATURE_COMPRESSION if compress is None else compress
+        data = signature_blob.encode("utf-8")
+        if compress:
+            return cls(signature=zlib.compress(data), compression="zlib")
+        return cls(signature=data, compression=None)
+    
+    @staticmethod
+    def decode(signature, compression):
+        """Signature JSON from stored bytes"""
+        data = bytes(signature)
+        if compression == "zlib":
+            data = zlib.decompress(data)
+        return data.decode("utf-8")
+    
+    @property
+    def signature_blob(self):
+        return self.decode(self.signature, self.compression)
+    
+    def __repr__(self):
+        return f"<VoteSignature(vote_id={self.vote_id}, compression={self.compression})>"
+
+
+class VoteNullifier(Base):
+    """
+    One row per (submission, key image) that has voted
+    
+    CRITICAL: the primary key prevents duplicate votes from the same credential
+    on the same submission. Inserted in the same transaction as the vote and
+    kept when old vote partitions are archived.
+    """
+    __tablename__ = "vote_nullifiers"
+    
+    submission_id = Column(
+        Integer,
+        ForeignKey('submissions.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    key_image = Column(String(64), primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<VoteNullifier(submission_id={self.submission_id}, key_image='{self.key_image[:16]}...')>"
+
+
 # ============================================================================
 # Table 5: Tokens
 # ============================================================================
@@ -280,6 +448,7 @@ class Escalation(Base):
     __table_args__ = (
         Index('idx_escalation_status', 'status'),
         Index('idx_escalation_requested', 'requested_at'),
+        Index('idx_escalation_status_requested_id', 'status', 'requested_at', 'id'),
     )
     
     def __repr__(self):
@@ -295,6 +464,8 @@ class AuditLog(Base):
     Append-only audit trail
     
     Records all significant events for transparency and investigation.
+    On PostgreSQL the table is range partitioned by month on timestamp
+    (primary key (id, timestamp)); see partition_service.
     """
     __tablename__ = "audit_logs"
     
@@ -356,6 +527,35 @@ class Tally(Base):
         return f"<Tally(id={self.id}, submission_id={self.submission_id}, decision='{self.final_decision}')>"
 
 
+class WeightedTally(Base):
+    """
+    Running reputation-weighted vote sums per submission
+    
+    Incremented in the same transaction that accepts a vote and rebuilt by
+    TallyService.recompute_vote_weights when reputations change. Counts
+    cover the same votes as the weights (those with a reviewer).
+    """
+    __tablename__ = "weighted_tallies"
+    
+    submission_id = Column(
+        Integer,
+        ForeignKey('submissions.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    weight_approve = Column(Float, default=0.0, server_default="0", nullable=False)
+    weight_escalate = Column(Float, default=0.0, server_default="0", nullable=False)
+    weight_reject = Column(Float, default=0.0, server_default="0", nullable=False)
+    weight_flag = Column(Float, default=0.0, server_default="0", nullable=False)
+    count_approve = Column(Integer, default=0, server_default="0", nullable=False)
+    count_escalate = Column(Integer, default=0, server_default="0", nullable=False)
+    count_reject = Column(Integer, default=0, server_default="0", nullable=False)
+    count_flag = Column(Integer, default=0, server_default="0", nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<WeightedTally(submission_id={self.submission_id})>"
+
+
 # ============================================================================
 # Table 9: Revocations
 # ============================================================================
@@ -4,60 +4,464 @@ ProofPals Monitoring Service
 Real-time metrics, anomaly detection, and system health monitoring
 """
 
+import asyncio
+import json
 import logging
+import math
+import os
+import re
 import time
-from typing import Optional, Dict, Any, List
+from array import array
+from bisect import bisect_left
+from typing import Optional, Dict, Any, List, Tuple, Sequence
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
+from contextlib import contextmanager
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
-from models import Vote, Token, Submission, Escalation, AuditLog
+from models import Vote, Token, Submission, AuditLog, SubmissionStatus
+from database import get_pool_status
 from config import settings
 
 logger = logging.getLogger(__name__)
 
+try:
+    import fcntl
+except ImportError:  # Windows: exited workers' snapshots are not compacted
+    fcntl = None
+
+# Histogram bucket upper bounds for per-request database metrics
+DB_QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+DB_TIME_MS_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Prometheus bucket upper bounds for unlabeled timings (milliseconds)
+TIMING_MS_BUCKETS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Histogram bucket upper bounds for per-route HTTP metrics
+HTTP_DURATION_MS_BUCKETS = TIMING_MS_BUCKETS
+HTTP_SIZE_BYTES_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Quantile sketch: estimates are within 1% of the true value
+SKETCH_RELATIVE_ACCURACY = 0.01
+SKETCH_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+SKETCH_MIN_VALUE = 1e-3  # smaller values share the zero bucket
+SKETCH_MAX_BUCKETS = 2048  # ~1e-3 to 1e15 at 1% accuracy
+REPORTED_QUANTILES = (0.5, 0.95, 0.99)
+
+# Gauges merged across workers by max rather than sum (ratios, not amounts)
+MAX_MERGED_GAUGE_SUFFIXES = ("_saturation",)
+
+# Multi-process snapshot files in METRICS_MULTIPROC_DIR: one per live or
+# recently exited worker, plus the folded totals of all earlier workers
+SNAPSHOT_FILE_PATTERN = re.compile(r"^metrics-(\d+)\.json$")
+ARCHIVE_FILE = "metrics-archive.json"
+COMPACTION_LOCK_FILE = "metrics.lock"
+
+# Timeseries rollups as (bucket seconds, buckets kept): 15 minutes at 1s,
+# 24 hours at 1m and 7 days at 1h, about 100 KB per metric
+TIMESERIES_RESOLUTIONS = ((1, 900), (60, 1440), (3600, 168))
+
+
+def _format_labels(labels: Tuple[Tuple[str, Any], ...]) -> str:
+    """Render Prometheus label pairs, escaping backslashes, quotes and newlines"""
+    parts = []
+    for key, value in labels:
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """
+    Fixed-memory histogram with Prometheus buckets and quantile estimates
+    
+    Each observation increments one exposition bucket (cumulative ``le``
+    counts are built when rendering) and one bucket of a log-scaled sketch
+    whose buckets are SKETCH_RELATIVE_ACCURACY wide, so quantiles are
+    within 1% of the true value however many samples were recorded.
+    Recording is O(1) and memory depends on the range of values seen,
+    capped at SKETCH_MAX_BUCKETS, never on the number of samples.
+    """
+    
+    __slots__ = ("bounds", "bucket_counts", "count", "sum", "min", "max", "_sketch", "_zero_count")
+    
+    _log_gamma = math.log(SKETCH_GAMMA)
+    
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        # One slot per bound plus the +Inf overflow
+        self.bucket_counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._sketch: Dict[int, int] = {}
+        self._zero_count = 0
+    
+    def observe(self, value: float) -> None:
+        """Record one value"""
+        self.bucket_counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        
+        if value <= SKETCH_MIN_VALUE:
+            self._zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        sketch = self._sketch
+        if key in sketch:
+            sketch[key] += 1
+        else:
+            sketch[key] = 1
+            if len(sketch) > SKETCH_MAX_BUCKETS:
+                self._collapse()
+    
+    def _collapse(self) -> None:
+        """Fold the two lowest sketch buckets together (loses accuracy only at the very bottom)"""
+        lowest, second = sorted(self._sketch)[:2]
+        self._sketch[second] += self._sketch.pop(lowest)
+    
+    def quantile(self, q: float) -> float:
+        """Estimated value at quantile q (0..1); 0 when empty"""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        for key in sorted(self._sketch):
+            seen += self._sketch[key]
+            if seen > rank:
+                # Bucket key covers (gamma^(key-1), gamma^key]; its midpoint in relative terms
+                estimate = 2 * SKETCH_GAMMA ** key / (SKETCH_GAMMA + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+    
+    def cumulative_buckets(self) -> List[Tuple[Any, int]]:
+        """Prometheus ``le`` buckets: (upper bound, observations <= bound), ending with +Inf"""
+        buckets = []
+        running = 0
+        for bound, count in zip(self.bounds + ("+Inf",), self.bucket_counts):
+            running += count
+            buckets.append((bound, running))
+        return buckets
+    
+    def merge(self, other: "Histogram") -> None:
+        """Add another histogram's observations (same bounds) into this one"""
+        if other.bounds != self.bounds:
+            raise ValueError(f"Cannot merge histograms with bounds {other.bounds} into {self.bounds}")
+        for i, count in enumerate(other.bucket_counts):
+            self.bucket_counts[i] += count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._zero_count += other._zero_count
+        for key, count in other._sketch.items():
+            self._sketch[key] = self._sketch.get(key, 0) + count
+        while len(self._sketch) > SKETCH_MAX_BUCKETS:
+            self._collapse()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable state, restored by from_dict"""
+        return {
+            "bounds": list(self.bounds),
+            "bucket_counts": self.bucket_counts,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "zero_count": self._zero_count,
+            "sketch": {str(key): count for key, count in self._sketch.items()}
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Histogram":
+        histogram = cls(data["bounds"])
+        histogram.bucket_counts = list(data["bucket_counts"])
+        histogram.count = data["count"]
+        histogram.sum = data["sum"]
+        if data["count"]:
+            histogram.min, histogram.max = data["min"], data["max"]
+        histogram._zero_count = data["zero_count"]
+        histogram._sketch = {int(key): count for key, count in data["sketch"].items()}
+        return histogram
+    
+    def summary(self) -> Dict[str, Any]:
+        """count, sum, min, max, avg and REPORTED_QUANTILES as p50/p95/p99"""
+        empty = self.count == 0
+        result = {
+            "count": self.count,
+            "sum": self.sum,
+            "min": 0 if empty else self.min,
+            "max": 0 if empty else self.max,
+            "avg": 0 if empty else self.sum / self.count
+        }
+        for q in REPORTED_QUANTILES:
+            result[f"p{round(q * 100)}"] = self.quantile(q)
+        return result
+
+
+class TimeSeries:
+    """
+    Multi-resolution ring buffer of (count, sum, min, max) per time bucket
+    
+    Each resolution keeps its buckets in preallocated ``array('d')``
+    columns indexed by bucket number modulo the ring size, so a sample
+    costs one in-place update per resolution, old buckets are overwritten
+    as time advances, and memory is fixed when the series is created.
+    """
+    
+    __slots__ = ("resolutions",)
+    
+    def __init__(self, resolutions: Sequence[Tuple[int, int]] = TIMESERIES_RESOLUTIONS):
+        self.resolutions = {
+            seconds: {
+                "slots": slots,
+                # Bucket number stored in each slot; -1 marks an unused slot
+                "bucket": array("d", [-1.0]) * slots,
+                "count": array("d", [0.0]) * slots,
+                "sum": array("d", [0.0]) * slots,
+                "min": array("d", [0.0]) * slots,
+                "max": array("d", [0.0]) * slots,
+            }
+            for seconds, slots in resolutions
+        }
+    
+    def record(self, value: float, timestamp: float) -> None:
+        """Add a sample to the bucket containing ``timestamp`` at every resolution"""
+        for seconds, ring in self.resolutions.items():
+            bucket = timestamp // seconds
+            slot = int(bucket) % ring["slots"]
+            if ring["bucket"][slot] != bucket:
+                ring["bucket"][slot] = bucket
+                ring["count"][slot] = 1
+                ring["sum"][slot] = ring["min"][slot] = ring["max"][slot] = value
+                continue
+            ring["count"][slot] += 1
+            ring["sum"][slot] += value
+            if value < ring["min"][slot]:
+                ring["min"][slot] = value
+            if value > ring["max"][slot]:
+                ring["max"][slot] = value
+    
+    def retention(self, seconds: int) -> int:
+        """How far back the given resolution reaches, in seconds"""
+        return seconds * self.resolutions[seconds]["slots"]
+    
+    def query(self, window: float, resolution: Optional[int] = None, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Buckets and aggregate for the last ``window`` seconds
+        
+        Uses ``resolution`` if given, else the finest resolution whose
+        retention covers the window. Buckets without samples are omitted.
+        """
+        now = time.time() if now is None else now
+        if resolution is None:
+            covering = [s for s in sorted(self.resolutions) if self.retention(s) >= window]
+            resolution = covering[0] if covering else max(self.resolutions)
+        ring = self.resolutions[resolution]
+        
+        last = now // resolution
+        first = max((now - window) // resolution, last - ring["slots"] + 1)
+        points = []
+        count = total = 0.0
+        low, high = math.inf, -math.inf
+        bucket = first
+        while bucket <= last:
+            slot = int(bucket) % ring["slots"]
+            if ring["bucket"][slot] == bucket:
+                n = ring["count"][slot]
+                points.append({
+                    "timestamp": bucket * resolution,
+                    "count": int(n),
+                    "avg": ring["sum"][slot] / n,
+                    "min": ring["min"][slot],
+                    "max": ring["max"][slot]
+                })
+                count += n
+                total += ring["sum"][slot]
+                low = min(low, ring["min"][slot])
+                high = max(high, ring["max"][slot])
+            bucket += 1
+        
+        return {
+            "resolution": resolution,
+            "window": window,
+            "count": int(count),
+            "avg": total / count if count else None,
+            "min": low if count else None,
+            "max": high if count else None,
+            "points": points
+        }
+
 
 class MetricsCollector:
     """Collects and stores application metrics"""
     
-    def _init_(self):
+    def __init__(self):
         self.counters = defaultdict(int)
         self.gauges = defaultdict(float)
-        self.histograms = defaultdict(list)
-        self.timeseries = defaultdict(lambda: deque(maxlen=1000))
+        self.histograms: Dict[str, Histogram] = {}
+        self.timeseries: Dict[str, TimeSeries] = {}
+        # metric -> sorted label pairs -> Histogram
+        self.labeled_histograms: Dict[str, Dict[Tuple, Histogram]] = defaultdict(dict)
+        self.histogram_buckets: Dict[str, Tuple[float, ...]] = {}
+        # metric -> sorted label pairs -> count
+        self.labeled_counters: Dict[str, Dict[Tuple, int]] = defaultdict(dict)
         
     def increment(self, metric: str, value: int = 1):
         """Increment a counter"""
         self.counters[metric] += value
         
+    def increment_labeled(self, metric: str, labels: Dict[str, str], value: int = 1):
+        """Increment one labeled series of a counter"""
+        key = tuple(sorted(labels.items()))
+        series = self.labeled_counters[metric]
+        series[key] = series.get(key, 0) + value
+        
     def set_gauge(self, metric: str, value: float):
         """Set a gauge value"""
         self.gauges[metric] = value
         
+    def adjust_gauge(self, metric: str, delta: float):
+        """Move a gauge up or down (e.g. requests in flight)"""
+        self.gauges[metric] += delta
+        
     def record_timing(self, metric: str, duration_ms: float):
         """Record a timing measurement"""
-        self.histograms[metric].append(duration_ms)
-        self.timeseries[metric].append({
-            "timestamp": time.time(),
-            "value": duration_ms
-        })
+        histogram = self.histograms.get(metric)
+        if histogram is None:
+            histogram = self.histograms[metric] = Histogram(TIMING_MS_BUCKETS)
+        histogram.observe(duration_ms)
+        series = self.timeseries.get(metric)
+        if series is None:
+            series = self.timeseries[metric] = TimeSeries()
+        series.record(duration_ms, time.time())
+        
+    def observe(self, metric: str, value: float, labels: Dict[str, str], buckets: Tuple[float, ...]):
+        """Record a value in a labeled, bucketed histogram"""
+        self.histogram_buckets.setdefault(metric, buckets)
+        key = tuple(sorted(labels.items()))
+        series = self.labeled_histograms[metric].get(key)
+        if series is None:
+            series = self.labeled_histograms[metric][key] = Histogram(self.histogram_buckets[metric])
+        series.observe(value)
         
     def get_metrics(self) -> Dict[str, Any]:
         """Get all metrics"""
         return {
             "counters": dict(self.counters),
             "gauges": dict(self.gauges),
+            "labeled_counters": {
+                name: {",".join(f"{k}={v}" for k, v in labels): value for labels, value in by_labels.items()}
+                for name, by_labels in self.labeled_counters.items()
+            },
             "histograms": {
+                name: histogram.summary()
+                for name, histogram in self.histograms.items()
+            },
+            "labeled_histograms": {
                 name: {
-                    "count": len(values),
-                    "min": min(values) if values else 0,
-                    "max": max(values) if values else 0,
-                    "avg": sum(values) / len(values) if values else 0
+                    ",".join(f"{k}={v}" for k, v in labels): series.summary()
+                    for labels, series in by_labels.items()
                 }
-                for name, values in self.histograms.items()
+                for name, by_labels in self.labeled_histograms.items()
+            }
+        }
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        JSON-serializable counters, gauges and histograms for merging
+        across worker processes (timeseries stay per worker)
+        """
+        def labeled(by_name, encode):
+            return {
+                name: [[list(labels), encode(value)] for labels, value in by_labels.items()]
+                for name, by_labels in by_name.items()
             }
+        
+        return {
+            "counters": dict(self.counters),
+            "labeled_counters": labeled(self.labeled_counters, lambda value: value),
+            "gauges": dict(self.gauges),
+            "histograms": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+            "labeled_histograms": labeled(self.labeled_histograms, Histogram.to_dict)
         }
+    
+    def merge_snapshot(self, snapshot: Dict[str, Any], include_gauges: bool = True) -> None:
+        """
+        Add another worker's snapshot into this collector
+        
+        Counters and histograms are summed. Gauges are summed (in-flight
+        requests, connections in use) except ratios named in
+        MAX_MERGED_GAUGE_SUFFIXES, which take the maximum.
+        """
+        for name, value in snapshot["counters"].items():
+            self.counters[name] += value
+        for name, series in snapshot["labeled_counters"].items():
+            for labels, value in series:
+                self.increment_labeled(name, dict(labels), value)
+        
+        if include_gauges:
+            for name, value in snapshot["gauges"].items():
+                if name.endswith(MAX_MERGED_GAUGE_SUFFIXES) and name in self.gauges:
+                    self.gauges[name] = max(self.gauges[name], value)
+                else:
+                    self.gauges[name] += value
+        
+        for name, data in snapshot["histograms"].items():
+            histogram = Histogram.from_dict(data)
+            if name in self.histograms:
+                self.histograms[name].merge(histogram)
+            else:
+                self.histograms[name] = histogram
+        for name, series in snapshot["labeled_histograms"].items():
+            by_labels = self.labeled_histograms[name]
+            for labels, data in series:
+                key = tuple(tuple(pair) for pair in labels)
+                histogram = Histogram.from_dict(data)
+                self.histogram_buckets.setdefault(name, histogram.bounds)
+                if key in by_labels:
+                    by_labels[key].merge(histogram)
+                else:
+                    by_labels[key] = histogram
+    
+    def render_prometheus(self) -> str:
+        """All metrics in Prometheus text exposition format"""
+        lines = []
+        
+        # Counters
+        for name, value in self.counters.items():
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {value}")
+        for name, by_labels in self.labeled_counters.items():
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in by_labels.items():
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        
+        # Gauges
+        for name, value in self.gauges.items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        
+        # Histograms (unlabeled timings and labeled series)
+        families = [(name, {(): histogram}) for name, histogram in self.histograms.items()]
+        families += list(self.labeled_histograms.items())
+        for name, by_labels in families:
+            lines.append(f"# TYPE {name} histogram")
+            for labels, series in by_labels.items():
+                for bound, count in series.cumulative_buckets():
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {count}")
+                lines.append(f"{name}_count{_format_labels(labels)} {series.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {series.sum}")
+        
+        return "\n".join(lines) + "\n"
 
 
 class AnomalyDetector:
@@ -229,16 +633,16 @@ class AnomalyDetector:
             Pattern analysis or None
         """
         try:
-            # Get all votes for submission
+            # Get timing and type of all votes for submission
             result = await db.execute(
-                select(Vote)
+                select(Vote.created_at, Vote.vote_type)
                 .where(
                     Vote.submission_id == submission_id,
                     Vote.verified == True
                 )
                 .order_by(Vote.created_at)
             )
-            votes = result.scalars().all()
+            votes = result.all()
             
             if len(votes) < 5:
                 return None
@@ -291,6 +695,11 @@ class MonitoringService:
         self.metrics = MetricsCollector()
         self.anomaly_detector = AnomalyDetector()
         self.start_time = time.time()
+        # (method, route) -> running query totals, for finding N+1 endpoints
+        self.route_queries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._snapshot_task: Optional[asyncio.Task] = None
+        self._snapshot_pid: Optional[int] = None  # process that last wrote our snapshot file
+        self._next_compaction = 0.0
         
     async def get_system_health(self, db: AsyncSession) -> Dict[str, Any]:
         """
@@ -313,7 +722,8 @@ class MonitoringService:
                 submission_count = result.scalar()
                 health["components"]["database"] = {
                     "status": "healthy",
-                    "submission_count": submission_count
+                    "submission_count": submission_count,
+                    "pools": get_pool_status()
                 }
             except Exception as e:
                 health["components"]["database"] = {
@@ -367,16 +777,48 @@ class MonitoringService:
         """
         Get comprehensive system statistics
         
+        Counts come from the shared statistics snapshot rather than
+        per-call queries.
+        
         Returns:
             Statistics dictionary
         """
         try:
+            from stats_service import get_stats_service
+            
+            snapshot = await get_stats_service().get_snapshot()
+            submissions = snapshot["submissions"]
+            votes = snapshot["votes"]
+            tokens = snapshot["tokens"]
+            redeemed = tokens["total"] - tokens["available"]
+            
             stats = {
                 "timestamp": datetime.utcnow().isoformat(),
-                "submissions": await self._get_submission_stats(db),
-                "votes": await self._get_vote_stats(db),
-                "tokens": await self._get_token_stats(db),
-                "escalations": await self._get_escalation_stats(db),
+                "snapshot_generated_at": snapshot["generated_at"],
+                "submissions": {
+                    "total": submissions["total"],
+                    "by_status": {
+                        status.value: submissions[status.value] for status in SubmissionStatus
+                    },
+                    "by_genre": submissions["by_genre"]
+                },
+                "votes": {
+                    "total": votes["total"],
+                    "by_type": votes["verified_by_type"],
+                    "by_verification": {
+                        "verified": votes["verified"],
+                        "unverified": votes["total"] - votes["verified"]
+                    }
+                },
+                "tokens": {
+                    "total": tokens["total"],
+                    "by_status": {
+                        "redeemed": redeemed,
+                        "available": tokens["available"]
+                    },
+                    "redemption_rate": (redeemed / tokens["total"] * 100) if tokens["total"] > 0 else 0
+                },
+                "escalations": snapshot["escalations"],
                 "performance": self.metrics.get_metrics()
             }
             
@@ -386,122 +828,6 @@ class MonitoringService:
             self.logger.error(f"Error getting statistics: {e}", exc_info=True)
             return {"error": str(e)}
     
-    async def _get_submission_stats(self, db: AsyncSession) -> Dict[str, Any]:
-        """Get submission statistics"""
-        try:
-            # Total submissions
-            result = await db.execute(select(func.count(Submission.id)))
-            total = result.scalar()
-            
-            # By status
-            result = await db.execute(
-                select(Submission.status, func.count(Submission.id))
-                .group_by(Submission.status)
-            )
-            by_status = {row[0]: row[1] for row in result}
-            
-            # By genre
-            result = await db.execute(
-                select(Submission.genre, func.count(Submission.id))
-                .group_by(Submission.genre)
-            )
-            by_genre = {row[0]: row[1] for row in result}
-            
-            return {
-                "total": total,
-                "by_status": by_status,
-                "by_genre": by_genre
-            }
-        except Exception as e:
-            self.logger.error(f"Error getting submission stats: {e}")
-            return {}
-    
-    async def _get_vote_stats(self, db: AsyncSession) -> Dict[str, Any]:
-        """Get vote statistics"""
-        try:
-            # Total votes
-            result = await db.execute(select(func.count(Vote.id)))
-            total = result.scalar()
-            
-            # By type
-            result = await db.execute(
-                select(Vote.vote_type, func.count(Vote.id))
-                .where(Vote.verified == True)
-                .group_by(Vote.vote_type)
-            )
-            by_type = {row[0]: row[1] for row in result}
-            
-            # Verified vs unverified
-            result = await db.execute(
-                select(Vote.verified, func.count(Vote.id))
-                .group_by(Vote.verified)
-            )
-            by_verification = {
-                ("verified" if row[0] else "unverified"): row[1]
-                for row in result
-            }
-            
-            return {
-                "total": total,
-                "by_type": by_type,
-                "by_verification": by_verification
-            }
-        except Exception as e:
-            self.logger.error(f"Error getting vote stats: {e}")
-            return {}
-    
-    async def _get_token_stats(self, db: AsyncSession) -> Dict[str, Any]:
-        """Get token statistics"""
-        try:
-            # Total tokens
-            result = await db.execute(select(func.count(Token.token_id)))
-            total = result.scalar()
-            
-            # Redeemed vs available
-            result = await db.execute(
-                select(Token.redeemed, func.count(Token.token_id))
-                .group_by(Token.redeemed)
-            )
-            by_status = {
-                ("redeemed" if row[0] else "available"): row[1]
-                for row in result
-            }
-            
-            # Redemption rate
-            redeemed = by_status.get("redeemed", 0)
-            redemption_rate = (redeemed / total * 100) if total > 0 else 0
-            
-            return {
-                "total": total,
-                "by_status": by_status,
-                "redemption_rate": redemption_rate
-            }
-        except Exception as e:
-            self.logger.error(f"Error getting token stats: {e}")
-            return {}
-    
-    async def _get_escalation_stats(self, db: AsyncSession) -> Dict[str, Any]:
-        """Get escalation statistics"""
-        try:
-            # Total escalations
-            result = await db.execute(select(func.count(Escalation.id)))
-            total = result.scalar()
-            
-            # By status
-            result = await db.execute(
-                select(Escalation.status, func.count(Escalation.id))
-                .group_by(Escalation.status)
-            )
-            by_status = {row[0]: row[1] for row in result}
-            
-            return {
-                "total": total,
-                "by_status": by_status
-            }
-        except Exception as e:
-            self.logger.error(f"Error getting escalation stats: {e}")
-            return {}
-    
     async def run_anomaly_checks(self, db: AsyncSession) -> Dict[str, Any]:
         """
         Run all anomaly detection checks
@@ -532,6 +858,402 @@ class MonitoringService:
             self.logger.error(f"Error running anomaly checks: {e}", exc_info=True)
             return {"error": str(e)}
     
+    def record_request_queries(self, route: str, method: str, stats) -> None:
+        """
+        Attribute one request's database work to its route
+        
+        Args:
+            route: Route path template (e.g. /api/v1/submissions/{submission_id})
+            method: HTTP method
+            stats: database.QueryStats collected during the request
+        """
+        labels = {"route": route, "method": method}
+        self.metrics.observe("http_request_db_queries", stats.count, labels, DB_QUERY_COUNT_BUCKETS)
+        self.metrics.observe("http_request_db_time_ms", stats.total_ms, labels, DB_TIME_MS_BUCKETS)
+        if stats.count:
+            self.metrics.observe(
+                "http_request_db_slowest_query_ms", stats.slowest_ms, labels, DB_TIME_MS_BUCKETS
+            )
+        
+        summary = self.route_queries.get((method, route))
+        if summary is None:
+            summary = {"requests": 0, "queries": 0, "max_queries": 0, "db_time_ms": 0.0,
+                       "slowest_ms": 0.0, "slowest_sql": None}
+            self.route_queries[(method, route)] = summary
+        summary["requests"] += 1
+        summary["queries"] += stats.count
+        summary["max_queries"] = max(summary["max_queries"], stats.count)
+        summary["db_time_ms"] += stats.total_ms
+        if stats.slowest_ms > summary["slowest_ms"]:
+            from database import normalize_sql
+            summary["slowest_ms"] = stats.slowest_ms
+            summary["slowest_sql"] = normalize_sql(stats.slowest_sql)
+    
+    def record_request(
+        self,
+        route: str,
+        method: str,
+        status_code: int,
+        duration_ms: float,
+        request_bytes: int,
+        response_bytes: int
+    ) -> None:
+        """
+        Record one completed HTTP request
+        
+        Args:
+            route: Route path template
+            method: HTTP method
+            status_code: Response status (500 if the app failed before responding)
+            duration_ms: Time until the response body was fully sent
+            request_bytes: Request body size as received
+            response_bytes: Response body size as sent
+        """
+        labels = {"route": route, "method": method}
+        self.metrics.observe("http_request_duration_ms", duration_ms, labels, HTTP_DURATION_MS_BUCKETS)
+        self.metrics.observe("http_request_size_bytes", request_bytes, labels, HTTP_SIZE_BYTES_BUCKETS)
+        self.metrics.observe("http_response_size_bytes", response_bytes, labels, HTTP_SIZE_BYTES_BUCKETS)
+        self.metrics.increment_labeled(
+            "http_requests_total", {"route": route, "method": method, "status": str(status_code)}
+        )
+    
+    def get_route_latency_stats(self) -> List[Dict[str, Any]]:
+        """Per-route request counts, error share and latency quantiles, slowest p95 first"""
+        statuses: Dict[Tuple[str, str], Dict[str, int]] = defaultdict(dict)
+        for labels, count in self.metrics.labeled_counters.get("http_requests_total", {}).items():
+            label = dict(labels)
+            statuses[(label["method"], label["route"])][label["status"]] = count
+        
+        rows = []
+        for labels, histogram in self.metrics.labeled_histograms.get("http_request_duration_ms", {}).items():
+            label = dict(labels)
+            by_status = statuses[(label["method"], label["route"])]
+            errors = sum(count for status, count in by_status.items() if int(status) >= 500)
+            summary = histogram.summary()
+            rows.append({
+                "method": label["method"],
+                "route": label["route"],
+                "requests": histogram.count,
+                "statuses": by_status,
+                "error_rate": errors / histogram.count if histogram.count else 0.0,
+                "avg_ms": summary["avg"],
+                "p50_ms": summary["p50"],
+                "p95_ms": summary["p95"],
+                "p99_ms": summary["p99"],
+                "max_ms": summary["max"]
+            })
+        return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+    
+    def get_route_query_stats(self) -> List[Dict[str, Any]]:
+        """Per-route query totals, most queries per request first"""
+        rows = [
+            {
+                "method": method,
+                "route": route,
+                "avg_queries": summary["queries"] / summary["requests"],
+                "avg_db_time_ms": summary["db_time_ms"] / summary["requests"],
+                **summary
+            }
+            for (method, route), summary in self.route_queries.items()
+        ]
+        return sorted(rows, key=lambda row: row["avg_queries"], reverse=True)
+    
+    def get_timeseries(
+        self,
+        metric: str,
+        window: float,
+        resolution: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Windowed history of a timing metric
+        
+        Returns:
+            Aggregate and per-bucket points, or None if the metric has no samples
+        
+        Raises:
+            ValueError: resolution is not one of TIMESERIES_RESOLUTIONS
+        """
+        series = self.metrics.timeseries.get(metric)
+        if series is None:
+            return None
+        if resolution is not None and resolution not in series.resolutions:
+            raise ValueError(
+                f"resolution must be one of {sorted(series.resolutions)} seconds"
+            )
+        return {"metric": metric, **series.query(window, resolution)}
+    
+    def list_timeseries(self) -> List[Dict[str, Any]]:
+        """Metrics with history and how far back each resolution reaches"""
+        return [
+            {
+                "metric": metric,
+                "retention": {str(seconds): series.retention(seconds) for seconds in series.resolutions}
+            }
+            for metric, series in sorted(self.metrics.timeseries.items())
+        ]
+    
+    def render_prometheus(self) -> str:
+        """
+        Prometheus text exposition of all collected metrics
+        
+        In multi-process mode (METRICS_MULTIPROC_DIR set) this is the whole
+        node: this worker's live metrics merged with every other worker's
+        latest snapshot, so any worker can answer the scrape.
+        """
+        if settings.METRICS_MULTIPROC_DIR:
+            return self.collect_node_metrics().render_prometheus()
+        return self.metrics.render_prometheus()
+    
+    # ========================================================================
+    # Multi-process aggregation
+    # ========================================================================
+    
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(settings.METRICS_MULTIPROC_DIR, f"metrics-{pid}.json")
+    
+    @staticmethod
+    def _write_json(path: str, payload: Dict[str, Any]) -> None:
+        """Atomically replace a JSON file"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps(payload, separators=(",", ":")))
+        os.replace(tmp_path, path)
+    
+    def _read_archive(self) -> Dict[str, Any]:
+        """Folded totals of exited workers (empty if nothing was folded yet)"""
+        try:
+            with open(os.path.join(settings.METRICS_MULTIPROC_DIR, ARCHIVE_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"folded": {}, "metrics": MetricsCollector().snapshot()}
+    
+    def write_snapshot(self) -> None:
+        """Atomically replace this worker's snapshot file"""
+        self._snapshot_pid = os.getpid()
+        self._write_json(self._snapshot_path(os.getpid()), {
+            "pid": os.getpid(),
+            "written_at": time.time(),
+            "metrics": self.metrics.snapshot()
+        })
+    
+    def collect_node_metrics(self) -> MetricsCollector:
+        """
+        Merge this worker's live metrics with other workers' snapshots
+        
+        Snapshots of workers that have exited still count toward counters
+        and histograms (dropping them would look like a counter reset), but
+        their gauges are ignored once older than METRICS_STALE_SECONDS.
+        compact_snapshots later folds them into the archive file, which is
+        read after the snapshots so a snapshot folded mid-scrape is
+        counted exactly once.
+        """
+        merged = MetricsCollector()
+        merged.merge_snapshot(self.metrics.snapshot())
+        
+        own_file = os.path.basename(self._snapshot_path(os.getpid()))
+        stale_before = time.time() - settings.METRICS_STALE_SECONDS
+        snapshots = []
+        for name in os.listdir(settings.METRICS_MULTIPROC_DIR):
+            if not SNAPSHOT_FILE_PATTERN.match(name) or name == own_file:
+                continue
+            try:
+                with open(os.path.join(settings.METRICS_MULTIPROC_DIR, name)) as f:
+                    snapshots.append((name, json.load(f)))
+            except FileNotFoundError:
+                pass  # folded into the archive since listdir
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Skipping unreadable metrics snapshot {name}: {e}")
+        
+        try:
+            archive = self._read_archive()
+            merged.merge_snapshot(archive["metrics"], include_gauges=False)
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Skipping unreadable metrics archive: {e}")
+            archive = {"folded": {}}
+        
+        workers = 1
+        for name, data in snapshots:
+            try:
+                if archive["folded"].get(name) == data["written_at"]:
+                    continue
+                merged.merge_snapshot(data["metrics"], include_gauges=data["written_at"] >= stale_before)
+                workers += 1
+            except (ValueError, KeyError) as e:
+                self.logger.warning(f"Skipping unreadable metrics snapshot {name}: {e}")
+        
+        merged.set_gauge("metrics_worker_snapshots", workers)
+        return merged
+    
+    @contextmanager
+    def _compaction_lock(self, blocking: bool):
+        """Exclusive lock among workers folding snapshots; yields False if not acquired"""
+        fd = os.open(
+            os.path.join(settings.METRICS_MULTIPROC_DIR, COMPACTION_LOCK_FILE),
+            os.O_RDWR | os.O_CREAT, 0o644
+        )
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            yield True
+        finally:
+            os.close(fd)
+    
+    def _fold_into_archive(self, names: List[str]) -> int:
+        """
+        Add snapshots to the archive totals, then delete them
+        
+        Caller holds the compaction lock. The archive records each folded
+        snapshot's written_at, so a snapshot left behind by a crash between
+        the archive write and the delete is neither folded nor scraped twice.
+        Unreadable snapshots are deleted without being folded.
+        
+        Returns:
+            Number of snapshots folded
+        """
+        directory = settings.METRICS_MULTIPROC_DIR
+        archive = self._read_archive()
+        totals = MetricsCollector()
+        totals.merge_snapshot(archive["metrics"], include_gauges=False)
+        # Forget folded snapshots whose files are gone
+        folded = {
+            name: written_at for name, written_at in archive["folded"].items()
+            if os.path.exists(os.path.join(directory, name))
+        }
+        
+        count = 0
+        for name in names:
+            try:
+                with open(os.path.join(directory, name)) as f:
+                    data = json.load(f)
+                if folded.get(name) != data["written_at"]:
+                    totals.merge_snapshot(data["metrics"], include_gauges=False)
+                    folded[name] = data["written_at"]
+                    count += 1
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError, KeyError) as e:
+                self.logger.warning(f"Discarding unreadable metrics snapshot {name}: {e}")
+        
+        self._write_json(os.path.join(directory, ARCHIVE_FILE), {
+            "written_at": time.time(),
+            "folded": folded,
+            "metrics": totals.snapshot()
+        })
+        for name in names:
+            try:
+                os.unlink(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+        return count
+    
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+    
+    def compact_snapshots(self) -> int:
+        """
+        Fold snapshots of exited workers into the archive file
+        
+        A snapshot is folded once it is older than METRICS_STALE_SECONDS and
+        its process is gone, so scrapes stop re-reading dead workers' files
+        one by one. Skipped if another worker is already compacting.
+        
+        Returns:
+            Number of snapshots folded
+        """
+        if fcntl is None:
+            return 0
+        
+        directory = settings.METRICS_MULTIPROC_DIR
+        stale_before = time.time() - settings.METRICS_STALE_SECONDS
+        with self._compaction_lock(blocking=False) as locked:
+            if not locked:
+                return 0
+            exited = []
+            for name in os.listdir(directory):
+                match = SNAPSHOT_FILE_PATTERN.match(name)
+                if not match or int(match.group(1)) == os.getpid():
+                    continue
+                try:
+                    if os.stat(os.path.join(directory, name)).st_mtime >= stale_before:
+                        continue
+                except FileNotFoundError:
+                    continue
+                if not self._pid_alive(int(match.group(1))):
+                    exited.append(name)
+            if not exited:
+                return 0
+            count = self._fold_into_archive(exited)
+        
+        self.logger.info(f"Folded {count} exited worker metrics snapshots into {ARCHIVE_FILE}")
+        return count
+    
+    def _retire_previous_snapshot(self) -> None:
+        """
+        Fold a snapshot left under this PID by an earlier, exited worker
+        
+        Called before this worker's first write, which would otherwise
+        silently replace that worker's totals.
+        """
+        path = self._snapshot_path(os.getpid())
+        if self._snapshot_pid == os.getpid() or not os.path.exists(path):
+            return
+        if fcntl is None:
+            self.logger.warning(f"Replacing metrics snapshot of an earlier worker with PID {os.getpid()}")
+            return
+        with self._compaction_lock(blocking=True):
+            self._fold_into_archive([os.path.basename(path)])
+    
+    async def _snapshot_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.write_snapshot()
+            except Exception as e:
+                self.logger.error(f"Failed to write metrics snapshot: {e}")
+            if time.monotonic() >= self._next_compaction:
+                self._next_compaction = time.monotonic() + settings.METRICS_STALE_SECONDS
+                try:
+                    self.compact_snapshots()
+                except Exception as e:
+                    self.logger.error(f"Failed to compact metrics snapshots: {e}")
+    
+    def start_snapshot_writer(self) -> None:
+        """Periodically publish this worker's metrics for the others (multi-process mode only)"""
+        if not settings.METRICS_MULTIPROC_DIR:
+            return
+        os.makedirs(settings.METRICS_MULTIPROC_DIR, exist_ok=True)
+        self._retire_previous_snapshot()
+        self.write_snapshot()
+        if self._snapshot_task is None or self._snapshot_task.done():
+            self._snapshot_task = asyncio.create_task(
+                self._snapshot_loop(settings.METRICS_SNAPSHOT_INTERVAL)
+            )
+    
+    async def stop_snapshot_writer(self) -> None:
+        """Stop the writer and leave a final snapshot so this worker's counters survive it"""
+        if self._snapshot_task is None:
+            return
+        self._snapshot_task.cancel()
+        try:
+            await self._snapshot_task
+        except asyncio.CancelledError:
+            pass
+        self._snapshot_task = None
+        try:
+            self.write_snapshot()
+        except Exception as e:
+            self.logger.error(f"Failed to write final metrics snapshot: {e}")
+    
     def record_operation(self, operation: str, duration_ms: float):
         """Record an operation timing"""
         self.metrics.record_timing(operation, duration_ms)
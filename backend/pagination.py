@@ -0,0 +1,122 @@
+"""
+ProofPals Keyset Pagination
+Cursor-based paging on (timestamp, id) so every page costs one index range scan
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Select, tuple_
+
+# Largest page any list endpoint will return
+MAX_PAGE_SIZE = 200
+
+# Response header carrying the cursor for endpoints that return bare lists
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+Cursor = Tuple[datetime, int]
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """
+    Encode the sort key of the last row on a page as an opaque cursor
+
+    Args:
+        timestamp: Sort timestamp of the last row
+        row_id: Primary key of the last row (tie-breaker)
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps([timestamp.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def cursor_param(cursor: Optional[str] = Query(None, description="Cursor from the previous page")) -> Optional[Cursor]:
+    """FastAPI dependency that validates the ``cursor`` query parameter"""
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def clamp_limit(limit: int) -> int:
+    """Bound a client-supplied page size to 1..MAX_PAGE_SIZE"""
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def keyset_page(
+    stmt: Select,
+    timestamp_column: Any,
+    id_column: Any,
+    cursor: Optional[Cursor],
+    limit: int
+) -> Select:
+    """
+    Restrict a query to the page after ``cursor``, newest first
+
+    Fetches one extra row so the caller can tell whether another page exists.
+    Needs an index on (timestamp_column, id_column), optionally prefixed by
+    the equality-filtered columns of ``stmt``.
+
+    Args:
+        stmt: Base select with filters applied
+        timestamp_column: Primary sort column
+        id_column: Unique tie-breaker column
+        cursor: Decoded cursor or None for the first page
+        limit: Page size
+
+    Returns:
+        Statement ordered by (timestamp, id) descending
+    """
+    if cursor is not None:
+        stmt = stmt.where(tuple_(timestamp_column, id_column) < tuple_(*cursor))
+    return (
+        stmt.order_by(timestamp_column.desc(), id_column.desc())
+        .limit(limit + 1)
+    )
+
+
+def split_page(
+    rows: Sequence[Any],
+    limit: int,
+    key: Callable[[Any], Cursor]
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim the look-ahead row from a keyset_page result
+
+    Args:
+        rows: Rows returned by a keyset_page statement
+        limit: Page size used for the query
+        key: Returns (timestamp, id) for a row
+
+    Returns:
+        Tuple of (rows on this page, cursor for the next page or None)
+    """
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    return page, encode_cursor(*key(page[-1]))
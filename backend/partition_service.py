@@ -0,0 +1,335 @@
+"""
+ProofPals Partition Service
+Creates monthly partitions ahead of time for votes and audit_logs and
+archives partitions that fall out of the retention window
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from database import engine
+from config import settings
+from export_service import json_default
+from models import VoteSignature
+
+
+# Partitioned table -> partition key column
+PARTITIONED_TABLES = {
+    "votes": "created_at",
+    "audit_logs": "timestamp",
+}
+
+# Archive queries joining cold side tables back in; others use SELECT *
+ARCHIVE_QUERIES = {
+    "votes": (
+        "SELECT p.*, s.signature, s.compression FROM {name} p "
+        "LEFT JOIN vote_signatures s ON s.vote_id = p.id ORDER BY p.id"
+    ),
+}
+
+# Side-table rows removed together with an archived partition
+ARCHIVE_CLEANUP = {
+    "votes": "DELETE FROM vote_signatures WHERE vote_id IN (SELECT id FROM {name})",
+}
+
+# pg advisory lock held by the worker running maintenance (see alembic/env.py MIGRATION_LOCK_ID)
+MAINTENANCE_LOCK_ID = 7301943
+
+PARTITION_NAME_RE = re.compile(r"_y(\d{4})m(\d{2})$")
+
+LIST_PARTITIONS_QUERY = text("""
+    SELECT child.relname AS name, child.reltuples::bigint AS rows_estimate
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = :table
+    ORDER BY child.relname
+""")
+
+
+def month_start(value: datetime) -> date:
+    """First day of the month containing value"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, n: int) -> date:
+    """Shift a month start by n months"""
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Name of the partition holding ``month``, e.g. votes_y2025m03"""
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Month covered by a partition name, or None for the default partition"""
+    match = PARTITION_NAME_RE.search(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+class PartitionService:
+    """
+    Maintains monthly range partitions
+
+    Everything here is a no-op unless the database is PostgreSQL and the
+    table was converted by migration 0004.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self.retention_months = {
+            "votes": settings.VOTE_RETENTION_MONTHS,
+            "audit_logs": settings.AUDIT_LOG_RETENTION_MONTHS,
+        }
+
+    @property
+    def supported(self) -> bool:
+        return engine.dialect.name == "postgresql"
+
+    async def _is_partitioned(self, conn, table: str) -> bool:
+        result = await conn.execute(
+            text("SELECT relkind FROM pg_class WHERE relname = :table"),
+            {"table": table}
+        )
+        return result.scalar() == "p"
+
+    # ========================================================================
+    # Inspection
+    # ========================================================================
+
+    async def list_partitions(self, table: str) -> List[Dict[str, Any]]:
+        """
+        Partitions of a table with their month and planner row estimate
+
+        Returns:
+            List of {"name", "month", "rows_estimate"} ordered by name
+        """
+        if not self.supported:
+            return []
+        async with engine.connect() as conn:
+            result = await conn.execute(LIST_PARTITIONS_QUERY, {"table": table})
+            return [
+                {
+                    "name": row.name,
+                    "month": (month.isoformat() if (month := partition_month(row.name)) else None),
+                    "rows_estimate": max(row.rows_estimate, 0)
+                }
+                for row in result
+            ]
+
+    # ========================================================================
+    # Creation
+    # ========================================================================
+
+    async def ensure_partitions(self, months_ahead: Optional[int] = None) -> List[str]:
+        """
+        Create missing partitions from the current month through months_ahead
+
+        Returns:
+            Names of partitions created
+        """
+        if not self.supported:
+            return []
+        months_ahead = settings.PARTITION_PREMAKE_MONTHS if months_ahead is None else months_ahead
+        current = month_start(datetime.now(timezone.utc))
+        created = []
+
+        for table in PARTITIONED_TABLES:
+            async with engine.begin() as conn:
+                if not await self._is_partitioned(conn, table):
+                    continue
+                existing = {
+                    row.name for row in await conn.execute(LIST_PARTITIONS_QUERY, {"table": table})
+                }
+
+            for offset in range(months_ahead + 1):
+                month = add_months(current, offset)
+                name = partition_name(table, month)
+                if name in existing:
+                    continue
+                try:
+                    async with engine.begin() as conn:
+                        await conn.execute(text(
+                            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+                            f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+                        ))
+                    created.append(name)
+                    self.logger.info(f"Created partition {name}")
+                except Exception as e:
+                    # Typically rows for this month already landed in the default partition
+                    self.logger.error(f"Failed to create partition {name}: {e}")
+
+        return created
+
+    # ========================================================================
+    # Retention
+    # ========================================================================
+
+    async def apply_retention(self, table: str, retain_months: int, archive_dir: Optional[str] = None) -> List[str]:
+        """
+        Archive and drop partitions older than retain_months
+
+        Each expired partition is written to ``<archive_dir>/<partition>.ndjson.gz``
+        while still attached (votes include their signatures), then detached
+        and dropped in one transaction together with its side-table rows.
+        A partition whose archive fails is left in place.
+
+        Args:
+            table: Partitioned table name
+            retain_months: Whole months kept before the current one
+            archive_dir: Directory for archives (defaults to PARTITION_ARCHIVE_DIR)
+
+        Returns:
+            Names of partitions archived and dropped
+        """
+        if not self.supported:
+            return []
+        archive_dir = archive_dir or settings.PARTITION_ARCHIVE_DIR
+        cutoff = add_months(month_start(datetime.now(timezone.utc)), -retain_months)
+        archived = []
+
+        for partition in await self.list_partitions(table):
+            if partition["month"] is None or date.fromisoformat(partition["month"]) >= cutoff:
+                continue
+            name = partition["name"]
+            try:
+                path = await self._archive_partition(table, name, archive_dir)
+                async with engine.begin() as conn:
+                    if table in ARCHIVE_CLEANUP:
+                        await conn.execute(text(ARCHIVE_CLEANUP[table].format(name=name)))
+                    await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                    await conn.execute(text(f"DROP TABLE {name}"))
+                archived.append(name)
+                self.logger.info(f"Archived partition {name} to {path}")
+            except Exception as e:
+                self.logger.error(f"Failed to archive partition {name}: {e}", exc_info=True)
+
+        return archived
+
+    async def _archive_partition(self, table: str, name: str, archive_dir: str, batch_size: int = 5000) -> str:
+        """Stream a partition into a gzip NDJSON file; returns the file path"""
+        query = ARCHIVE_QUERIES.get(table, "SELECT * FROM {name} ORDER BY id").format(name=name)
+        os.makedirs(archive_dir, exist_ok=True)
+        path = os.path.join(archive_dir, f"{name}.ndjson.gz")
+        tmp_path = f"{path}.tmp"
+
+        out = await asyncio.to_thread(gzip.open, tmp_path, "wt", encoding="utf-8")
+        try:
+            async with engine.connect() as conn:
+                result = await conn.stream(
+                    text(query)
+                    .execution_options(yield_per=batch_size)
+                )
+                async for partition in result.mappings().partitions():
+                    chunk = "".join(
+                        json.dumps(self._archive_record(row), default=json_default, separators=(",", ":")) + "\n"
+                        for row in partition
+                    )
+                    await asyncio.to_thread(out.write, chunk)
+        finally:
+            await asyncio.to_thread(out.close)
+
+        os.replace(tmp_path, path)
+        return path
+
+    @staticmethod
+    def _archive_record(row) -> Dict[str, Any]:
+        """Row as a dict, with vote signatures decoded back to JSON text"""
+        record = dict(row)
+        if "signature" in record:
+            signature, compression = record.pop("signature"), record.pop("compression")
+            record["signature_blob"] = (
+                VoteSignature.decode(signature, compression) if signature is not None else None
+            )
+        return record
+
+    # ========================================================================
+    # Scheduled maintenance
+    # ========================================================================
+
+    async def run_maintenance(self) -> Dict[str, Any]:
+        """
+        Create upcoming partitions and apply configured retention
+
+        Every worker schedules maintenance, so a pass only runs while holding
+        a session-level advisory lock; a worker that cannot take it skips
+        the pass instead of archiving and dropping the same partitions.
+        """
+        if not self.supported:
+            return {"skipped": "partitioning requires PostgreSQL"}
+
+        async with engine.connect() as lock_conn:
+            locked = (await lock_conn.execute(
+                text("SELECT pg_try_advisory_lock(:id)"), {"id": MAINTENANCE_LOCK_ID}
+            )).scalar()
+            # The lock belongs to the session; don't sit idle in a transaction
+            await lock_conn.commit()
+            if not locked:
+                self.logger.debug("Partition maintenance is running in another worker; skipping")
+                return {"skipped": "maintenance is running in another worker"}
+
+            try:
+                report = {"created": await self.ensure_partitions(), "archived": {}}
+                for table, retain_months in self.retention_months.items():
+                    if retain_months:
+                        report["archived"][table] = await self.apply_retention(table, retain_months)
+                return report
+            finally:
+                await lock_conn.execute(
+                    text("SELECT pg_advisory_unlock(:id)"), {"id": MAINTENANCE_LOCK_ID}
+                )
+                await lock_conn.commit()
+
+    async def _maintenance_loop(self, interval: float) -> None:
+        """Run maintenance at startup and then every interval seconds"""
+        while True:
+            try:
+                await self.run_maintenance()
+            except Exception as e:
+                self.logger.error(f"Partition maintenance failed: {e}", exc_info=True)
+            await asyncio.sleep(interval)
+
+    def start_maintenance(self) -> None:
+        """Start the background partition maintenance job"""
+        if not self.supported:
+            return
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = asyncio.create_task(
+                self._maintenance_loop(settings.PARTITION_MAINTENANCE_INTERVAL)
+            )
+
+    async def stop_maintenance(self) -> None:
+        """Stop the background partition maintenance job"""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+
+
+# Global partition service instance
+_partition_service: Optional[PartitionService] = None
+
+
+def get_partition_service() -> PartitionService:
+    """Get global partition service instance"""
+    global _partition_service
+    if _partition_service is None:
+        _partition_service = PartitionService()
+    return _partition_service
@@ -0,0 +1,218 @@
+"""
+ProofPals Ring Service
+Ring membership changes and key lookups over the ring_members table
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Ring, RingMember
+
+
+def parse_pubkey(public_key_hex: str) -> bytes:
+    """
+    Decode a hex public key
+
+    Raises:
+        ValueError: If the key is not valid hex
+    """
+    return bytes.fromhex(public_key_hex.strip().lower())
+
+
+class RingService:
+    """Service for ring membership"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    async def _bump(
+        self,
+        db: AsyncSession,
+        ring_id: int,
+        delta: int = 0,
+        member_count: Optional[int] = None
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Increment the ring version and adjust its member count by ``delta``,
+        or set it to ``member_count`` when given
+
+        The UPDATE also locks the ring row, serializing membership changes
+        to the same ring for the rest of the transaction.
+
+        Returns:
+            (version, member_count) or None if the ring does not exist
+        """
+        result = await db.execute(
+            update(Ring)
+            .where(Ring.id == ring_id)
+            .values(
+                version=Ring.version + 1,
+                member_count=Ring.member_count + delta if member_count is None else member_count
+            )
+            .returning(Ring.version, Ring.member_count)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        return (row[0], row[1]) if row else None
+
+    async def add_member(
+        self,
+        db: AsyncSession,
+        ring_id: int,
+        pubkey: bytes
+    ) -> Tuple[bool, Optional[Dict[str, int]], Optional[str]]:
+        """
+        Append a public key to a ring
+
+        Args:
+            db: Database session
+            ring_id: Ring ID
+            pubkey: Raw public key bytes
+
+        Returns:
+            Tuple of (success, {"version", "member_count"}, error_message)
+        """
+        try:
+            bumped = await self._bump(db, ring_id, 1)
+            if bumped is None:
+                await db.rollback()
+                return False, None, "Ring not found"
+
+            next_position = await db.scalar(
+                select(func.coalesce(func.max(RingMember.position), -1) + 1)
+                .where(RingMember.ring_id == ring_id)
+            )
+            await db.execute(
+                insert(RingMember).values(ring_id=ring_id, position=next_position, pubkey=pubkey)
+            )
+            await db.commit()
+
+            version, member_count = bumped
+            self.logger.info(f"Added member to ring {ring_id} (version {version})")
+            return True, {"version": version, "member_count": member_count}, None
+
+        except IntegrityError:
+            await db.rollback()
+            return False, None, "Public key already exists in ring"
+
+    async def remove_member(
+        self,
+        db: AsyncSession,
+        ring_id: int,
+        pubkey: bytes
+    ) -> Tuple[bool, Optional[Dict[str, int]], Optional[str]]:
+        """
+        Remove a public key from a ring
+
+        Positions of the remaining members are left as they are, so the
+        relative ring order is preserved.
+
+        Returns:
+            Tuple of (success, {"version", "member_count"}, error_message)
+        """
+        bumped = await self._bump(db, ring_id, -1)
+        if bumped is None:
+            await db.rollback()
+            return False, None, "Ring not found"
+
+        result = await db.execute(
+            delete(RingMember)
+            .where(RingMember.ring_id == ring_id, RingMember.pubkey == pubkey)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            await db.rollback()
+            return False, None, "Public key not found in ring"
+
+        version, member_count = bumped
+        if member_count <= 0:
+            await db.rollback()
+            return False, None, "Cannot remove all members from ring"
+
+        await db.commit()
+        self.logger.info(f"Removed member from ring {ring_id} (version {version})")
+        return True, {"version": version, "member_count": member_count}, None
+
+    async def replace_members(
+        self,
+        db: AsyncSession,
+        ring_id: int,
+        pubkeys: List[bytes]
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Replace the whole membership of a ring (caller commits)
+
+        Raises:
+            IntegrityError: If pubkeys contains duplicates
+
+        Returns:
+            (version, member_count) or None if the ring does not exist
+        """
+        bumped = await self._bump(db, ring_id, member_count=len(pubkeys))
+        if bumped is None:
+            return None
+
+        await db.execute(
+            delete(RingMember)
+            .where(RingMember.ring_id == ring_id)
+            .execution_options(synchronize_session=False)
+        )
+        if pubkeys:
+            await db.execute(
+                insert(RingMember),
+                [
+                    {"ring_id": ring_id, "position": position, "pubkey": pubkey}
+                    for position, pubkey in enumerate(pubkeys)
+                ]
+            )
+        return bumped
+
+    async def rings_for_key(
+        self,
+        db: AsyncSession,
+        pubkey: bytes,
+        active_only: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Find every ring containing a public key (index lookup on pubkey)
+
+        Returns:
+            List of ring summaries
+        """
+        stmt = (
+            select(Ring.id, Ring.genre, Ring.epoch, Ring.active, Ring.version, Ring.member_count)
+            .join(RingMember, RingMember.ring_id == Ring.id)
+            .where(RingMember.pubkey == pubkey)
+            .order_by(Ring.id)
+        )
+        if active_only:
+            stmt = stmt.where(Ring.active == True)
+
+        result = await db.execute(stmt)
+        return [
+            {
+                "ring_id": row.id,
+                "genre": row.genre,
+                "epoch": row.epoch,
+                "active": row.active,
+                "version": row.version,
+                "member_count": row.member_count
+            }
+            for row in result
+        ]
+
+
+# Global ring service instance
+_ring_service: Optional[RingService] = None
+
+
+def get_ring_service() -> RingService:
+    """Get global ring service instance"""
+    global _ring_service
+    if _ring_service is None:
+        _ring_service = RingService()
+    return _ring_service
@@ -69,8 +69,9 @@ def check_redis_connection():
 def setup_database():
     """Setup the database"""
     try:
-        from app.database import engine, Base
-        Base.metadata.create_all(bind=engine)
+        import asyncio
+        from database import init_db
+        asyncio.run(init_db())
         logger.info("✓ Database setup complete")
         return True
     except Exception as e:
@@ -0,0 +1,220 @@
+"""
+ProofPals Statistics Service
+Cached aggregate counts for dashboards, refreshed on a schedule and
+kept current between refreshes from vote and tally events
+"""
+
+import asyncio
+import copy
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, func, select
+
+from models import (
+    Submission, Vote, Ring, Token, Reviewer, Escalation,
+    SubmissionStatus, VoteType, EscalationStatus
+)
+from database import get_read_sessionmaker
+from config import settings
+
+
+def _key(value: Any) -> str:
+    """Normalize an enum member or string to its lowercase value"""
+    return str(getattr(value, "value", value)).lower()
+
+
+class StatsService:
+    """
+    Statistics snapshot shared by the admin dashboard, system status and
+    monitoring endpoints
+
+    A refresh runs one FILTER-aggregate query per table, each on its own
+    session so they execute concurrently. Concurrent readers of a stale
+    snapshot share a single refresh.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.ttl = settings.STATS_SNAPSHOT_TTL if ttl is None else ttl
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._refreshed_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresher_task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+
+    # ========================================================================
+    # Snapshot access
+    # ========================================================================
+
+    async def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Get the statistics snapshot, refreshing it if older than the TTL
+
+        Returns:
+            Copy of the snapshot dictionary
+        """
+        if self._snapshot is None or time.monotonic() - self._refreshed_at >= self.ttl:
+            await self.refresh()
+        return copy.deepcopy(self._snapshot)
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Recompute the snapshot; concurrent callers await the same refresh"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._compute())
+        return await asyncio.shield(self._refresh_task)
+
+    def invalidate(self) -> None:
+        """Force the next reader to refresh (for changes not tracked incrementally)"""
+        self._refreshed_at = 0.0
+
+    # ========================================================================
+    # Incremental updates
+    # ========================================================================
+
+    def record_vote(self, vote_type: Any, verified: bool = True) -> None:
+        """Count an accepted vote without waiting for the next refresh"""
+        if self._snapshot is None:
+            return
+        votes = self._snapshot["votes"]
+        type_key = _key(vote_type)
+        votes["total"] += 1
+        votes[type_key] = votes.get(type_key, 0) + 1
+        if verified:
+            votes["verified"] += 1
+            votes["verified_by_type"][type_key] = votes["verified_by_type"].get(type_key, 0) + 1
+
+    def record_submission(self, genre: str, status: Any = SubmissionStatus.PENDING) -> None:
+        """Count a newly created submission"""
+        if self._snapshot is None:
+            return
+        submissions = self._snapshot["submissions"]
+        status_key = _key(status)
+        submissions["total"] += 1
+        submissions[status_key] = submissions.get(status_key, 0) + 1
+        submissions["by_genre"][genre] = submissions["by_genre"].get(genre, 0) + 1
+
+    def record_status_change(self, old_status: Any, new_status: Any) -> None:
+        """Move a submission between status buckets after a tally"""
+        if self._snapshot is None:
+            return
+        old_key, new_key = _key(old_status), _key(new_status)
+        if old_key == new_key:
+            return
+        submissions = self._snapshot["submissions"]
+        submissions[old_key] = max(submissions.get(old_key, 0) - 1, 0)
+        submissions[new_key] = submissions.get(new_key, 0) + 1
+
+    # ========================================================================
+    # Refresh
+    # ========================================================================
+
+    async def _compute(self) -> Dict[str, Any]:
+        """Run all aggregate queries concurrently and swap in the result"""
+        start = time.monotonic()
+        session_factory = await get_read_sessionmaker()
+
+        async def one(stmt):
+            async with session_factory() as session:
+                return (await session.execute(stmt)).one()
+
+        async def rows(stmt):
+            async with session_factory() as session:
+                return (await session.execute(stmt)).all()
+
+        submission_statuses = list(SubmissionStatus)
+        vote_types = list(VoteType)
+        escalation_statuses = list(EscalationStatus)
+        count = func.count
+
+        (submissions, genres, votes, rings, tokens, reviewers, escalations) = await asyncio.gather(
+            one(select(
+                count(Submission.id),
+                *[count(Submission.id).filter(Submission.status == s) for s in submission_statuses]
+            )),
+            rows(select(Submission.genre, count(Submission.id)).group_by(Submission.genre)),
+            one(select(
+                count(Vote.id),
+                count(Vote.id).filter(Vote.verified == True),
+                *[count(Vote.id).filter(Vote.vote_type == t) for t in vote_types],
+                *[count(Vote.id).filter(and_(Vote.verified == True, Vote.vote_type == t)) for t in vote_types]
+            )),
+            one(select(count(Ring.id), count(Ring.id).filter(Ring.active == True))),
+            one(select(count(Token.token_id), count(Token.token_id).filter(Token.redeemed == False))),
+            one(select(count(Reviewer.id), count(Reviewer.id).filter(Reviewer.revoked == False))),
+            one(select(
+                count(Escalation.id),
+                *[count(Escalation.id).filter(Escalation.status == s) for s in escalation_statuses]
+            ))
+        )
+
+        n_types = len(vote_types)
+        snapshot = {
+            "generated_at": datetime.utcnow().isoformat(),
+            "submissions": {
+                "total": submissions[0],
+                **{s.value: c for s, c in zip(submission_statuses, submissions[1:])},
+                "by_genre": {genre: c for genre, c in genres}
+            },
+            "votes": {
+                "total": votes[0],
+                "verified": votes[1],
+                **{t.value: c for t, c in zip(vote_types, votes[2:2 + n_types])},
+                "verified_by_type": {
+                    t.value: c for t, c in zip(vote_types, votes[2 + n_types:])
+                }
+            },
+            "rings": {"total": rings[0], "active": rings[1]},
+            "tokens": {"total": tokens[0], "available": tokens[1]},
+            "reviewers": {"total": reviewers[0], "active": reviewers[1]},
+            "escalations": {
+                "total": escalations[0],
+                "by_status": {s.value: c for s, c in zip(escalation_statuses, escalations[1:])}
+            }
+        }
+
+        self._snapshot = snapshot
+        self._refreshed_at = time.monotonic()
+        self.refreshes += 1
+        self.logger.debug(f"Statistics snapshot refreshed in {(time.monotonic() - start) * 1000:.1f}ms")
+        return snapshot
+
+    async def _refresh_loop(self, interval: float) -> None:
+        """Keep the snapshot warm so dashboard reads never wait on the database"""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.logger.error(f"Failed to refresh statistics snapshot: {e}")
+            await asyncio.sleep(interval)
+
+    def start_refresher(self) -> None:
+        """Start the background snapshot refresher"""
+        if self._refresher_task is None or self._refresher_task.done():
+            self._refresher_task = asyncio.create_task(
+                self._refresh_loop(settings.STATS_REFRESH_INTERVAL)
+            )
+
+    async def stop_refresher(self) -> None:
+        """Stop the background snapshot refresher"""
+        if self._refresher_task is not None:
+            self._refresher_task.cancel()
+            try:
+                await self._refresher_task
+            except asyncio.CancelledError:
+                pass
+            self._refresher_task = None
+
+
+# Global stats service instance
+_stats_service: Optional[StatsService] = None
+
+
+def get_stats_service() -> StatsService:
+    """Get global stats service instance"""
+    global _stats_service
+    if _stats_service is None:
+        _stats_service = StatsService()
+    return _stats_service
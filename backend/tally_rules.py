@@ -0,0 +1,149 @@
+"""
+ProofPals Tally Rules
+Vote-count decision rules shared by single-submission and bulk tallies
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from models import SubmissionStatus
+
+# Share of all votes that, once flagged, flags the submission
+FLAG_SHARE = 0.2
+
+# Percent of total reputation weight that, once flagged, flags the submission
+WEIGHTED_FLAG_PERCENT = 30
+
+PENDING = SubmissionStatus.PENDING.value
+FLAGGED = SubmissionStatus.FLAGGED.value
+ESCALATED = SubmissionStatus.ESCALATED.value
+APPROVED = SubmissionStatus.APPROVED.value
+REJECTED = SubmissionStatus.REJECTED.value
+
+# Decision codes returned by the vectorized rules: index into DECISIONS
+DECISIONS = [PENDING, APPROVED, REJECTED, ESCALATED, FLAGGED]
+PENDING_CODE, APPROVED_CODE, REJECTED_CODE, ESCALATED_CODE, FLAGGED_CODE = range(len(DECISIONS))
+
+
+def decide(counts: Dict[str, int], urgent_flag_limit: int) -> str:
+    """
+    Apply decision rules to vote counts
+
+    Decision Rules:
+    1. If count_flag >= 20% of total votes (at most URGENT_FLAG_LIMIT) → FLAGGED
+    2. Else if count_escalate beats both approve and reject → ESCALATED
+    3. Else if count_approve > count_reject → APPROVED
+    4. Else if count_reject > count_approve → REJECTED
+    5. Else (tie) → ESCALATED
+
+    Args:
+        counts: Dictionary with approve/escalate/reject/flag counts
+        urgent_flag_limit: Flag count that always suffices (settings.URGENT_FLAG_LIMIT)
+
+    Returns:
+        Decision string (approved/rejected/escalated/flagged)
+    """
+    approve, escalate, reject, flag = counts["approve"], counts["escalate"], counts["reject"], counts["flag"]
+    total_votes = approve + escalate + reject + flag
+    if flag >= max(1, min(urgent_flag_limit, int(FLAG_SHARE * total_votes))):
+        return FLAGGED
+    if escalate > approve and escalate > reject:
+        return ESCALATED
+    if approve > reject:
+        return APPROVED
+    if reject > approve:
+        return REJECTED
+    return ESCALATED
+
+
+def decide_counts(
+    counts: np.ndarray,
+    urgent_flag_limit: Sequence[int],
+    flag_share: Sequence[float],
+    min_votes: Sequence[int]
+) -> np.ndarray:
+    """
+    Apply decide to many submissions under many policy variants
+
+    Args:
+        counts: (n, 4) vote counts
+        urgent_flag_limit, flag_share, min_votes: one value per variant;
+            submissions below min_votes are not tallied (PENDING_CODE)
+
+    Returns:
+        (variants, n) decision codes
+    """
+    a, e, r, f = (counts[:, i][None, :] for i in range(4))
+    total = a + e + r + f
+    limit = np.asarray(urgent_flag_limit, dtype=np.int64)[:, None]
+    share = np.asarray(flag_share, dtype=np.float64)[:, None]
+    floor = np.asarray(min_votes, dtype=np.int64)[:, None]
+
+    # Same float arithmetic as int(FLAG_SHARE * total_votes)
+    threshold = np.maximum(1, np.minimum(limit, np.floor(share * total)))
+    shape = np.broadcast_shapes(threshold.shape, floor.shape)
+    conditions = [
+        total < floor,
+        f >= threshold,
+        (e > a) & (e > r),
+        a > r,
+        r > a,
+    ]
+    return np.select(
+        [np.broadcast_to(c, shape) for c in conditions],
+        [PENDING_CODE, FLAGGED_CODE, ESCALATED_CODE, APPROVED_CODE, REJECTED_CODE],
+        ESCALATED_CODE
+    ).astype(np.int8)
+
+
+def decide_columns(
+    approve: Sequence[int],
+    escalate: Sequence[int],
+    reject: Sequence[int],
+    flag: Sequence[int],
+    urgent_flag_limit: int
+) -> List[str]:
+    """
+    Apply the decision rules to whole columns of vote counts at once
+
+    Element i of each sequence belongs to the same submission. The rules
+    are evaluated as NumPy array operations by decide_counts (one policy
+    variant, no minimum vote floor), so a bulk re-tally does no per-row
+    Python work.
+
+    Returns:
+        Decision strings, in input order
+    """
+    counts = np.column_stack([
+        np.asarray(column, dtype=np.int64) for column in (approve, escalate, reject, flag)
+    ]).reshape(-1, 4)
+    codes = decide_counts(counts, [urgent_flag_limit], [FLAG_SHARE], [0])[0]
+    return np.asarray(DECISIONS)[codes].tolist()
+
+
+def decide_weighted(weighted_counts: Dict[str, float]) -> str:
+    """
+    Apply weighted decision rules
+
+    Rules:
+    1. If no weight at all → PENDING
+    2. If weighted_flag >= 30% of total weight → FLAGGED
+    3. Else if weighted_approve + weighted_escalate > weighted_reject → APPROVED
+    4. Else if weighted_reject > weighted_approve + weighted_escalate → REJECTED
+    5. Else (tie) → ESCALATED for human review
+    """
+    total_weight = sum(weighted_counts.values())
+    if total_weight == 0:
+        return PENDING
+
+    if (weighted_counts["flag"] / total_weight) * 100 >= WEIGHTED_FLAG_PERCENT:
+        return FLAGGED
+
+    support = weighted_counts["approve"] + weighted_counts["escalate"]
+    opposition = weighted_counts["reject"]
+    if support > opposition:
+        return APPROVED
+    if opposition > support:
+        return REJECTED
+    return ESCALATED
@@ -3,24 +3,298 @@ ProofPals Tally Service
 Computes vote tallies and makes decisions
 """
 
+import asyncio
+import json
 import logging
-from typing import Optional, Dict, Any
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Sequence, Callable, Awaitable
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, func
+from sqlalchemy import select, update, delete, func, case, insert, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
-from models import Vote, Submission, Tally, SubmissionStatus, VoteType, AuditLog, Reviewer, Token
+from models import (
+    Vote, Submission, Tally, SubmissionStatus, VoteType, AuditLog, Reviewer, Token, WeightedTally
+)
 from config import settings
+from stats_service import get_stats_service
+from event_bus import get_event_bus
 from sqlalchemy.orm import joinedload
+import tally_rules
 
 logger = logging.getLogger(__name__)
 
+VOTE_TYPE_KEYS = [vote_type.value for vote_type in VoteType]
+
+
+def reputation_weight(reputation: Optional[int]) -> float:
+    """
+    Vote weight for a reputation score
+    
+    Reputation is clamped to [1, 200] (missing or zero counts as the
+    default 100) and scaled so the default weighs 1.0.
+    """
+    return max(1, min(200, reputation or 100)) / 100.0
+
+
+def reputation_weight_expr(reputation):
+    """SQL equivalent of reputation_weight for set-based recomputation"""
+    score = case(
+        (reputation.is_(None), 100),
+        (reputation == 0, 100),
+        (reputation < 1, 1),
+        (reputation > 200, 200),
+        else_=reputation
+    )
+    return score / 100.0
+
+
+def _upsert(db: AsyncSession, table):
+    """Dialect INSERT supporting ON CONFLICT for the session's database"""
+    if db.bind.dialect.name == "postgresql":
+        return pg_insert(table)
+    return sqlite_insert(table)
+
+
+# ============================================================================
+# Tally Read Cache
+# ============================================================================
+
+class TallyCache:
+    """
+    Per-submission tally cache with generation-based invalidation
+    
+    Entries are stamped with the submission's generation, which is bumped
+    whenever a vote is accepted or the tally is rewritten. With Redis
+    attached the generations live there (one MGET per read), so a vote on
+    any worker invalidates every worker's copy, and computed tallies are
+    shared through Redis as well; without Redis the cache is
+    process-local. Concurrent misses for the same submission share one
+    load (single-flight). TTL is only a safety net.
+    
+    A Redis error switches the worker to process-local generations for
+    REDIS_RETRY_SECONDS, after which Redis is tried again. On reconnecting
+    the local entries are dropped, and if this worker invalidated anything
+    meanwhile the shared epoch is bumped so other workers drop theirs.
+    """
+    
+    EPOCH_KEY = "tally:epoch"
+    REDIS_RETRY_SECONDS = 5.0
+    
+    def __init__(self, max_size: int = 10000, ttl: float = 300):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.redis_client = None
+        self._redis_down_until = 0.0
+        self._missed_invalidations = False
+        # submission_id -> (generation, expires_at, payload)
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._generations: "OrderedDict[int, int]" = OrderedDict()
+        self._epoch = 0
+        self._inflight: Dict[int, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+    
+    @staticmethod
+    def _generation_key(submission_id: int) -> str:
+        return f"tally:gen:{submission_id}"
+    
+    @staticmethod
+    def _payload_key(submission_id: int, generation: str) -> str:
+        return f"tally:{submission_id}:{generation}"
+    
+    def attach_redis(self, client) -> None:
+        """Share generations and tallies across workers through Redis"""
+        self.redis_client = client
+    
+    def _redis_failed(self, e: Exception) -> None:
+        if not self._redis_down_until:
+            self.logger.warning(
+                f"Redis tally cache unavailable, using local cache only "
+                f"(retrying every {self.REDIS_RETRY_SECONDS:g}s): {e}"
+            )
+        self._redis_down_until = time.monotonic() + self.REDIS_RETRY_SECONDS
+        self._entries.clear()
+    
+    async def _redis(self):
+        """The Redis client, or None while running process-local"""
+        if self.redis_client is None:
+            return None
+        if self._redis_down_until:
+            if time.monotonic() < self._redis_down_until:
+                return None
+            # Entries cached meanwhile may predate invalidations we never saw
+            self._redis_down_until = 0.0
+            self._entries.clear()
+            if self._missed_invalidations:
+                try:
+                    await self.redis_client.incr(self.EPOCH_KEY)
+                except Exception as e:
+                    self._redis_failed(e)
+                    return None
+                self._missed_invalidations = False
+            self.logger.info("Redis tally cache reconnected")
+        return self.redis_client
+    
+    async def _generation(self, submission_id: int) -> str:
+        redis = await self._redis()
+        if redis is not None:
+            try:
+                epoch, generation = await redis.mget(
+                    self.EPOCH_KEY, self._generation_key(submission_id)
+                )
+                return f"{epoch or 0}:{generation or 0}"
+            except Exception as e:
+                self._redis_failed(e)
+        # Never equal to a Redis generation, so entries can't cross modes
+        return f"local:{self._epoch}:{self._generations.get(submission_id, 0)}"
+    
+    async def get(self, submission_id: int) -> tuple:
+        """
+        Look up a tally at the submission's current generation
+        
+        Returns:
+            (generation, payload or None)
+        """
+        generation = await self._generation(submission_id)
+        entry = self._entries.get(submission_id)
+        if entry and entry[0] == generation and entry[1] > time.monotonic():
+            self._entries.move_to_end(submission_id)
+            self.hits += 1
+            return generation, entry[2]
+        
+        redis = await self._redis() if not generation.startswith("local:") else None
+        if redis is not None:
+            try:
+                cached = await redis.get(self._payload_key(submission_id, generation))
+                if cached is not None:
+                    payload = json.loads(cached)
+                    self._store(submission_id, generation, payload)
+                    self.hits += 1
+                    return generation, payload
+            except Exception as e:
+                self._redis_failed(e)
+        
+        self.misses += 1
+        return generation, None
+    
+    def _store(self, submission_id: int, generation: str, payload: Dict[str, Any]) -> None:
+        self._entries[submission_id] = (generation, time.monotonic() + self.ttl, payload)
+        self._entries.move_to_end(submission_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    async def put(self, submission_id: int, generation: str, payload: Dict[str, Any]) -> None:
+        """Cache a tally loaded at ``generation`` (as returned by get)"""
+        self._store(submission_id, generation, payload)
+        redis = await self._redis() if not generation.startswith("local:") else None
+        if redis is not None:
+            try:
+                await redis.set(
+                    self._payload_key(submission_id, generation),
+                    json.dumps(payload),
+                    ex=int(self.ttl)
+                )
+            except Exception as e:
+                self._redis_failed(e)
+    
+    async def get_or_load(
+        self,
+        submission_id: int,
+        loader: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Cached tally, or the result of ``loader`` shared by concurrent callers
+        
+        Only successful results are cached; failures are still handed to
+        every caller waiting on the same load.
+        """
+        while True:
+            generation, payload = await self.get(submission_id)
+            if payload is not None:
+                return payload
+            
+            inflight = self._inflight.get(submission_id)
+            if inflight is None:
+                break
+            
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # The loading request went away; retry unless we were cancelled
+                if asyncio.current_task().cancelling():
+                    raise
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[submission_id] = future
+        try:
+            payload = await loader()
+            if payload.get("success"):
+                await self.put(submission_id, generation, payload)
+            future.set_result(payload)
+            return payload
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Waiters re-raise it; don't warn about an unretrieved exception
+                future.exception()
+            raise
+        finally:
+            self._inflight.pop(submission_id, None)
+    
+    async def invalidate(self, submission_id: int) -> None:
+        """Bump a submission's generation so cached copies stop matching"""
+        self._entries.pop(submission_id, None)
+        self._generations[submission_id] = self._generations.get(submission_id, 0) + 1
+        self._generations.move_to_end(submission_id)
+        while len(self._generations) > self.max_size:
+            self._generations.popitem(last=False)
+        
+        redis = await self._redis()
+        if redis is None:
+            self._missed_invalidations = self.redis_client is not None
+            return
+        try:
+            key = self._generation_key(submission_id)
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.incr(key)
+                # Outlives any payload cached under the old generation
+                pipe.expire(key, int(self.ttl) * 10)
+                await pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+            self._missed_invalidations = True
+    
+    async def invalidate_all(self) -> None:
+        """Invalidate every submission (after bulk re-tallies)"""
+        self._entries.clear()
+        self._epoch += 1
+        redis = await self._redis()
+        if redis is None:
+            self._missed_invalidations = self.redis_client is not None
+            return
+        try:
+            await redis.incr(self.EPOCH_KEY)
+        except Exception as e:
+            self._redis_failed(e)
+            self._missed_invalidations = True
+
 
 class TallyService:
     """Service for computing vote tallies"""
     
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.cache = TallyCache(max_size=settings.TALLY_CACHE_SIZE, ttl=settings.TALLY_CACHE_TTL)
+        self._bulk_job: Optional[Dict[str, Any]] = None
+        self._bulk_task: Optional[asyncio.Task] = None
     
     async def compute_tally(
         self,
@@ -148,6 +422,7 @@ class TallyService:
                 tally_id = tally.id
             
             # Update submission status
+            old_status = submission.status
             await db.execute(
                 update(Submission)
                 .where(Submission.id == submission_id)
@@ -168,6 +443,12 @@ class TallyService:
                 )
             
             await db.commit()
+            get_stats_service().record_status_change(old_status, decision)
+            if existing_tally:
+                await self.cache.invalidate(submission_id)
+            event_bus = get_event_bus()
+            await event_bus.publish_tally(submission_id, counts, decision)
+            await event_bus.publish_status(submission_id, old_status, decision)
             
             # Log audit event
             audit_details = {
@@ -224,44 +505,12 @@ class TallyService:
         Returns:
             Decision string (approved/rejected/escalated/flagged)
         """
-        total_votes = sum(counts.values())
-        
-        # Rule 1: Flag threshold (20% of total votes or URGENT_FLAG_LIMIT, whichever is lower)
-        flag_threshold = max(1, min(settings.URGENT_FLAG_LIMIT, int(0.2 * total_votes)))
-        if counts["flag"] >= flag_threshold:
-            self.logger.info(
-                f"Decision: FLAGGED (flags={counts['flag']} >= {flag_threshold} [20% of {total_votes} votes])"
-            )
-            return SubmissionStatus.FLAGGED.value
-        
-        # Rule 2: If escalation has the most votes (majority)
-        if counts["escalate"] > counts["approve"] and counts["escalate"] > counts["reject"]:
-            self.logger.info(
-                f"Decision: ESCALATED (escalate={counts['escalate']} > "
-                f"approve={counts['approve']}, reject={counts['reject']})"
-            )
-            return SubmissionStatus.ESCALATED.value
-            
-        # Rule 3: Approve if more approvals than rejections (ignoring escalate for approval)
-        if counts["approve"] > counts["reject"]:
-            self.logger.info(
-                f"Decision: APPROVED (approve={counts['approve']} > reject={counts['reject']})"
-            )
-            return SubmissionStatus.APPROVED.value
-        
-        # Rule 4: Reject if more rejections than approvals (ignoring escalate for rejection)
-        if counts["reject"] > counts["approve"]:
-            self.logger.info(
-                f"Decision: REJECTED (reject={counts['reject']} > approve={counts['approve']})"
-            )
-            return SubmissionStatus.REJECTED.value
-        
-        # Rule 5: Tie between approve/reject → escalate
+        decision = tally_rules.decide(counts, settings.URGENT_FLAG_LIMIT)
         self.logger.info(
-            f"Decision: ESCALATED (tie or edge case: "
-            f"approve={counts['approve']}, reject={counts['reject']}, escalate={counts['escalate']})"
+            f"Decision: {decision.upper()} (approve={counts['approve']}, reject={counts['reject']}, "
+            f"escalate={counts['escalate']}, flag={counts['flag']})"
         )
-        return SubmissionStatus.ESCALATED.value
+        return decision
     
     async def get_tally_by_submission(
         self,
@@ -310,6 +559,32 @@ class TallyService:
             self.logger.error(f"Error getting tally: {e}", exc_info=True)
             return None
     
+    async def get_or_compute_tally(
+        self,
+        submission_id: int,
+        db: AsyncSession
+    ) -> Dict[str, Any]:
+        """
+        Cached tally for a submission, computing it on first request
+        
+        Results are cached until a vote or re-tally invalidates them, and
+        concurrent requests for the same submission share one load. Misses
+        read the primary, not a replica: a miss usually follows an
+        invalidation, and a lagging replica's old row would otherwise be
+        cached under the new generation for the whole TTL. Misses happen
+        once per generation, so this adds little primary load.
+        
+        Returns:
+            Tally dictionary with success flag (see compute_tally)
+        """
+        async def load() -> Dict[str, Any]:
+            existing = await self.get_tally_by_submission(submission_id, db)
+            if existing:
+                return {"success": True, **existing}
+            return await self.compute_tally(submission_id, db)
+        
+        return await self.cache.get_or_load(submission_id, load)
+    
     async def should_compute_tally(
         self,
         submission_id: int,
@@ -424,65 +699,36 @@ class TallyService:
         db: AsyncSession
     ) -> Dict[str, Any]:
         """
-        Compute weighted tally based on voter reputation
+        Read the weighted tally based on voter reputation
         
-        Algorithm:
-        1. Get all verified votes for submission
-        2. Join with Token to get credential_hash
-        3. Join with Reviewer to get reputation_score
-        4. Weight each vote by reputation
-        5. Apply decision rules to weighted counts
+        Vote weights are captured when each vote is accepted and summed
+        per submission into weighted_tallies (see record_vote_weight), so
+        this is a single primary-key read regardless of vote count. Votes
+        whose token has no reviewer carry no weight and are not counted.
         
         Returns:
             Dictionary with weighted counts and decision
         """
         try:
-            # Step 1: Get votes with reputation scores
-            query = (
-                select(
-                    Vote.vote_type,
-                    Reviewer.reputation_score
-                )
-                .join(Token, Vote.token_id == Token.token_id)
-                .join(Reviewer, Token.credential_hash == Reviewer.credential_hash)
-                .where(
-                    Vote.submission_id == submission_id,
-                    Vote.verified == True
-                )
-            )
-            
-            result = await db.execute(query)
-            votes_with_reputation = result.all()
+            row = await db.get(WeightedTally, submission_id)
             
-            # Step 2: Calculate weighted counts
             weighted_counts = {
-                "approve": 0.0,
-                "escalate": 0.0,
-                "reject": 0.0,
-                "flag": 0.0
+                key: float(getattr(row, f"weight_{key}") or 0.0) if row else 0.0
+                for key in VOTE_TYPE_KEYS
             }
+            unweighted_counts = {
+                key: int(getattr(row, f"count_{key}") or 0) if row else 0
+                for key in VOTE_TYPE_KEYS
+            }
+            total_reputation_weight = sum(weighted_counts.values())
             
-            total_reputation_weight = 0.0
-            
-            for vote_type, reputation in votes_with_reputation:
-                # Normalize reputation (min 1, max 200, default 100)
-                # This prevents zero or negative weights
-                normalized_rep = max(1, min(200, reputation or 100)) / 100.0
-                
-                weighted_counts[vote_type] += normalized_rep
-                total_reputation_weight += normalized_rep
-            
-            # Step 3: Calculate percentages
             weighted_percentages = {}
             if total_reputation_weight > 0:
                 for vote_type, weight in weighted_counts.items():
                     weighted_percentages[vote_type] = (weight / total_reputation_weight) * 100
             
-            # Step 4: Apply decision rules (weighted version)
             decision = self._make_weighted_decision(weighted_counts)
-            
-            # Step 5: Get unweighted counts for comparison
-            unweighted_counts = self._get_unweighted_counts(votes_with_reputation)
+            computed_at = row.updated_at if row and row.updated_at else datetime.utcnow()
             
             self.logger.info(
                 f"Weighted tally computed for submission {submission_id}: "
@@ -497,7 +743,7 @@ class TallyService:
                 "total_reputation_weight": total_reputation_weight,
                 "unweighted_counts": unweighted_counts,
                 "decision": decision,
-                "computed_at": datetime.utcnow().isoformat()
+                "computed_at": computed_at.isoformat()
             }
             
         except Exception as e:
@@ -509,7 +755,7 @@ class TallyService:
     
     def _make_weighted_decision(self, weighted_counts: Dict[str, float]) -> str:
         """
-        Apply weighted decision rules
+        Apply weighted decision rules (see tally_rules.decide_weighted)
         
         Rules:
         1. If weighted_flag >= 30% of total weight → FLAGGED (escalate)
@@ -517,53 +763,317 @@ class TallyService:
         3. Else if weighted_reject > weighted_approve + weighted_escalate → REJECTED
         4. Else (tie) → ESCALATED for human review
         """
-        total_weight = sum(weighted_counts.values())
+        decision = tally_rules.decide_weighted(weighted_counts)
+        self.logger.info(
+            f"Decision: {decision.upper()} (weights: "
+            + ", ".join(f"{key}={weight:.2f}" for key, weight in weighted_counts.items())
+            + ")"
+        )
+        return decision
+    
+    # ========================================================================
+    # Materialized vote weights
+    # ========================================================================
+    
+    async def record_vote_weight(self, db: AsyncSession, vote: Vote) -> Optional[float]:
+        """
+        Capture a new vote's reputation weight and add it to the weighted sums
         
-        if total_weight == 0:
-            return SubmissionStatus.PENDING.value
+        Runs in the caller's transaction (call before committing the vote).
+        Votes whose token has no reviewer get no weight, as before.
         
-        flag_percentage = (weighted_counts["flag"] / total_weight) * 100
+        Returns:
+            The vote weight, or None if the vote is unweighted
+        """
+        reputation = await db.scalar(
+            select(Reviewer.reputation_score)
+            .join(Token, Token.credential_hash == Reviewer.credential_hash)
+            .where(Token.token_id == vote.token_id)
+        )
+        if reputation is None:
+            return None
         
-        # Rule 1: High flag weight
-        if flag_percentage >= 30:
-            self.logger.info(
-                f"Decision: FLAGGED (flag weight={weighted_counts['flag']:.2f}, "
-                f"{flag_percentage:.1f}% of total)"
-            )
-            return SubmissionStatus.FLAGGED.value
+        weight = reputation_weight(reputation)
+        vote.weight = weight
+        key = VoteType(getattr(vote.vote_type, "value", vote.vote_type)).value
         
-        # Rule 2: Weighted approval
-        weighted_support = weighted_counts["approve"] + weighted_counts["escalate"]
-        weighted_opposition = weighted_counts["reject"]
+        stmt = _upsert(db, WeightedTally).values(
+            submission_id=vote.submission_id,
+            **{f"weight_{key}": weight, f"count_{key}": 1},
+            updated_at=datetime.utcnow()
+        )
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[WeightedTally.submission_id],
+            set_={
+                f"weight_{key}": getattr(WeightedTally, f"weight_{key}") + stmt.excluded[f"weight_{key}"],
+                f"count_{key}": getattr(WeightedTally, f"count_{key}") + 1,
+                "updated_at": stmt.excluded.updated_at
+            }
+        ))
+        return weight
+    
+    async def recompute_vote_weights(
+        self,
+        db: AsyncSession,
+        credential_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Re-derive vote weights from current reputations and rebuild sums
         
-        if weighted_support > weighted_opposition:
-            self.logger.info(
-                f"Decision: APPROVED (support={weighted_support:.2f} > "
-                f"opposition={weighted_opposition:.2f})"
+        Set-based: one UPDATE over votes and one grouped INSERT into
+        weighted_tallies, committed together.
+        
+        Args:
+            db: Database session
+            credential_hash: Only revisit votes cast with this reviewer's tokens
+            
+        Returns:
+            Dictionary with votes_updated and submissions_rebuilt
+        """
+        reputation = (
+            select(reputation_weight_expr(Reviewer.reputation_score))
+            .join(Token, Token.credential_hash == Reviewer.credential_hash)
+            .where(Token.token_id == Vote.token_id)
+            .scalar_subquery()
+        )
+        vote_filter = []
+        if credential_hash:
+            vote_filter.append(Vote.token_id.in_(
+                select(Token.token_id).where(Token.credential_hash == credential_hash)
+            ))
+        
+        result = await db.execute(
+            update(Vote)
+            .where(*vote_filter)
+            .values(weight=reputation)
+            .execution_options(synchronize_session=False)
+        )
+        votes_updated = result.rowcount
+        
+        affected = select(Vote.submission_id).where(*vote_filter).distinct()
+        clear = delete(WeightedTally).execution_options(synchronize_session=False)
+        if vote_filter:
+            clear = clear.where(WeightedTally.submission_id.in_(affected))
+        await db.execute(clear)
+        
+        sums = select(
+            Vote.submission_id,
+            *[
+                func.sum(case((Vote.vote_type == vote_type, Vote.weight), else_=0.0))
+                for vote_type in VoteType
+            ],
+            *[
+                func.count(Vote.id).filter(Vote.vote_type == vote_type)
+                for vote_type in VoteType
+            ],
+            func.now()
+        ).where(Vote.verified == True, Vote.weight.is_not(None)).group_by(Vote.submission_id)
+        if vote_filter:
+            sums = sums.where(Vote.submission_id.in_(affected))
+        
+        result = await db.execute(
+            insert(WeightedTally).from_select(
+                ["submission_id"]
+                + [f"weight_{key}" for key in VOTE_TYPE_KEYS]
+                + [f"count_{key}" for key in VOTE_TYPE_KEYS]
+                + ["updated_at"],
+                sums
             )
-            return SubmissionStatus.APPROVED.value
+        )
+        submissions_rebuilt = result.rowcount
+        await db.commit()
         
-        # Rule 3: Weighted rejection
-        if weighted_opposition > weighted_support:
-            self.logger.info(
-                f"Decision: REJECTED (opposition={weighted_opposition:.2f} > "
-                f"support={weighted_support:.2f})"
+        self.logger.info(
+            f"Recomputed vote weights: {votes_updated} votes, "
+            f"{submissions_rebuilt} weighted tallies rebuilt"
+        )
+        return {"votes_updated": votes_updated, "submissions_rebuilt": submissions_rebuilt}
+    
+    # ========================================================================
+    # Bulk recomputation
+    # ========================================================================
+    
+    async def bulk_recompute_tallies(
+        self,
+        db: AsyncSession,
+        genre: Optional[str] = None,
+        statuses: Optional[Sequence[str]] = None,
+        min_votes: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        progress: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Re-tally many submissions with set-based statements
+        
+        Counts for every matching submission come from one GROUP BY, the
+        decision rules run over the count columns in a single pass, and
+        tallies and submission statuses are written batch_size rows per
+        statement with one commit per batch. Only submissions with at least
+        min_votes verified votes are touched, as with should_compute_tally.
+        
+        Args:
+            db: Database session
+            genre: Only re-tally this genre
+            statuses: Only re-tally submissions currently in these statuses
+            min_votes: Verified votes required (default MIN_VOTES_FOR_TALLY)
+            batch_size: Rows per write statement (default BULK_TALLY_BATCH_SIZE)
+            progress: Dictionary updated in place with total/processed/changed
+            
+        Returns:
+            Dictionary with total, changed and decision counts
+        """
+        min_votes = settings.MIN_VOTES_FOR_TALLY if min_votes is None else min_votes
+        batch_size = batch_size or settings.BULK_TALLY_BATCH_SIZE
+        progress = {} if progress is None else progress
+        
+        query = (
+            select(
+                Submission.id,
+                Submission.status,
+                *[func.count(Vote.id).filter(Vote.vote_type == vote_type) for vote_type in VoteType]
             )
-            return SubmissionStatus.REJECTED.value
+            .join(Vote, (Vote.submission_id == Submission.id) & (Vote.verified == True))
+            .group_by(Submission.id, Submission.status)
+            .having(func.count(Vote.id) >= min_votes)
+            .order_by(Submission.id)
+        )
+        if genre:
+            query = query.where(Submission.genre == genre)
+        if statuses:
+            query = query.where(Submission.status.in_([SubmissionStatus(s) for s in statuses]))
+        
+        rows = (await db.execute(query)).all()
+        columns = list(zip(*rows)) or [()] * (2 + len(VOTE_TYPE_KEYS))
+        ids, old_statuses = columns[0], columns[1]
+        counts = dict(zip(VOTE_TYPE_KEYS, columns[2:]))
+        decisions = tally_rules.decide_columns(
+            counts["approve"], counts["escalate"], counts["reject"], counts["flag"],
+            settings.URGENT_FLAG_LIMIT
+        )
+        
+        total = len(ids)
+        progress.update(total=total, processed=0, changed=0)
+        decision_counts: Dict[str, int] = {}
+        for decision in decisions:
+            decision_counts[decision] = decision_counts.get(decision, 0) + 1
         
-        # Rule 4: Tie or edge case
+        now = datetime.utcnow()
+        submissions = Submission.__table__
+        set_status = (
+            update(submissions)
+            .where(submissions.c.id == bindparam("b_id"))
+            .values(status=bindparam("b_status"), last_tallied_at=now)
+        )
+        
+        for start in range(0, total, batch_size):
+            batch = range(start, min(start + batch_size, total))
+            
+            stmt = _upsert(db, Tally).values([
+                {
+                    "submission_id": ids[i],
+                    **{f"count_{key}": counts[key][i] for key in VOTE_TYPE_KEYS},
+                    "final_decision": decisions[i],
+                    "computed_at": now
+                }
+                for i in batch
+            ])
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[Tally.submission_id],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in [f"count_{key}" for key in VOTE_TYPE_KEYS] + ["final_decision", "computed_at"]
+                }
+            ))
+            await db.execute(set_status, [
+                {"b_id": ids[i], "b_status": SubmissionStatus(decisions[i])} for i in batch
+            ])
+            await db.commit()
+            await self.cache.invalidate_all()
+            
+            changed = [
+                i for i in batch
+                if getattr(old_statuses[i], "value", old_statuses[i]) != decisions[i]
+            ]
+            stats = get_stats_service()
+            for i in changed:
+                stats.record_status_change(old_statuses[i], decisions[i])
+            event_bus = get_event_bus()
+            await event_bus.publish_many([
+                event_bus.status_event(ids[i], old_statuses[i], decisions[i]) for i in changed
+            ])
+            
+            progress["processed"] = batch.stop
+            progress["changed"] += len(changed)
+        
+        summary = {
+            "total": total,
+            "changed": progress["changed"],
+            "decisions": decision_counts
+        }
+        await self._log_audit(
+            db, "bulk_tally_computed", "tally", "bulk",
+            {
+                **summary,
+                "filters": {"genre": genre, "statuses": list(statuses or []), "min_votes": min_votes}
+            }
+        )
         self.logger.info(
-            f"Decision: ESCALATED (tie: support={weighted_support:.2f}, "
-            f"opposition={weighted_opposition:.2f})"
+            f"Bulk tally: {total} submissions re-tallied, {summary['changed']} changed status"
         )
-        return SubmissionStatus.ESCALATED.value
-    
-    def _get_unweighted_counts(self, votes_with_reputation) -> Dict[str, int]:
-        """Helper to get simple vote counts for comparison"""
-        counts = {"approve": 0, "escalate": 0, "reject": 0, "flag": 0}
-        for vote_type, _ in votes_with_reputation:
-            counts[vote_type] += 1
-        return counts
+        return summary
+    
+    def get_bulk_progress(self) -> Optional[Dict[str, Any]]:
+        """Progress of the current or most recent bulk recompute, if any"""
+        if self._bulk_job is None:
+            return None
+        job = dict(self._bulk_job)
+        end = job.pop("_finished", None) or time.monotonic()
+        job["elapsed_seconds"] = round(end - job.pop("_started"), 3)
+        return job
+    
+    def start_bulk_recompute(self, **filters) -> Dict[str, Any]:
+        """
+        Run bulk_recompute_tallies in the background with its own session
+        
+        Args:
+            **filters: genre, statuses, min_votes, batch_size
+            
+        Returns:
+            Initial progress dictionary
+            
+        Raises:
+            RuntimeError: If a bulk recompute is already running
+        """
+        if self._bulk_task and not self._bulk_task.done():
+            raise RuntimeError("A bulk tally recompute is already running")
+        
+        self._bulk_job = {
+            "state": "running",
+            "filters": filters,
+            "total": None,
+            "processed": 0,
+            "changed": 0,
+            "decisions": None,
+            "error": None,
+            "started_at": datetime.utcnow().isoformat(),
+            "finished_at": None,
+            "_started": time.monotonic()
+        }
+        self._bulk_task = asyncio.create_task(self._run_bulk_recompute(self._bulk_job, filters))
+        return self.get_bulk_progress()
+    
+    async def _run_bulk_recompute(self, job: Dict[str, Any], filters: Dict[str, Any]) -> None:
+        from database import AsyncSessionLocal
+        
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await self.bulk_recompute_tallies(db, progress=job, **filters)
+            job.update(state="completed", decisions=result["decisions"])
+        except Exception as e:
+            self.logger.error(f"Bulk tally recompute failed: {e}", exc_info=True)
+            job.update(state="failed", error=str(e))
+        finally:
+            job.update(finished_at=datetime.utcnow().isoformat(), _finished=time.monotonic())
 
 
 # Global tally service instance
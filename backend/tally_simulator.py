@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+ProofPals Tally Simulator
+Offline what-if analysis of the tally decision rules
+
+Loads per-submission vote counts and reputation weights once, evaluates
+the decision rules for a whole grid of thresholds with NumPy, and
+reports how each variant's decisions differ from the current policy.
+
+Usage:
+    python tally_simulator.py --urgent-flag-limit 2 3 5 --flag-share 0.1 0.2 0.3 \\
+        --min-votes 3 5 --weighted-flag-percent 20 30 40 [--genre news]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import tally_rules
+from config import settings
+from models import Submission, Vote, VoteType, WeightedTally
+from tally_rules import (
+    APPROVED_CODE, DECISIONS, ESCALATED_CODE, FLAGGED_CODE, PENDING_CODE, REJECTED_CODE, decide_counts
+)
+
+VOTE_TYPE_KEYS = [vote_type.value for vote_type in VoteType]
+
+# Upper bound on (variants x distinct rows) evaluated in one NumPy pass
+MAX_CELLS = 4_000_000
+
+
+@dataclass
+class VoteArrays:
+    """Per-submission vote data; row i of each array is one submission"""
+    submission_ids: np.ndarray  # int64, (n,)
+    counts: np.ndarray  # int64, (n, 4) approve/escalate/reject/flag
+    weights: np.ndarray  # float64, (n, 4) same order
+
+    def __len__(self) -> int:
+        return len(self.submission_ids)
+
+
+async def load_vote_arrays(db: AsyncSession, genre: Optional[str] = None) -> VoteArrays:
+    """
+    Load verified vote counts and weighted sums for every voted submission
+
+    One grouped query over votes, joined to the materialized
+    weighted_tallies sums.
+    """
+    counts = (
+        select(
+            Vote.submission_id,
+            *[
+                func.count(Vote.id).filter(Vote.vote_type == vote_type).label(f"count_{vote_type.value}")
+                for vote_type in VoteType
+            ]
+        )
+        .where(Vote.verified == True)
+        .group_by(Vote.submission_id)
+        .subquery()
+    )
+    query = (
+        select(
+            counts.c.submission_id,
+            *[counts.c[f"count_{key}"] for key in VOTE_TYPE_KEYS],
+            *[func.coalesce(getattr(WeightedTally, f"weight_{key}"), 0.0) for key in VOTE_TYPE_KEYS]
+        )
+        .select_from(counts)
+        .outerjoin(WeightedTally, WeightedTally.submission_id == counts.c.submission_id)
+        .order_by(counts.c.submission_id)
+    )
+    if genre:
+        query = query.join(Submission, Submission.id == counts.c.submission_id).where(Submission.genre == genre)
+
+    rows = (await db.execute(query)).all()
+    data = np.array(rows, dtype=np.float64).reshape(len(rows), 1 + 2 * len(VOTE_TYPE_KEYS))
+    return VoteArrays(
+        submission_ids=data[:, 0].astype(np.int64),
+        counts=data[:, 1:5].astype(np.int64),
+        weights=data[:, 5:9]
+    )
+
+
+# ============================================================================
+# Vectorized rules
+# ============================================================================
+
+def decide_weights(weights: np.ndarray, weighted_flag_percent: Sequence[float]) -> np.ndarray:
+    """
+    tally_rules.decide_weighted for many submissions under many flag percents
+
+    Returns:
+        (variants, n) decision codes
+    """
+    a, e, r, f = (weights[:, i][None, :] for i in range(4))
+    total = a + e + r + f
+    percent = np.asarray(weighted_flag_percent, dtype=np.float64)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        flag_percent = (f / total) * 100
+    support = a + e
+
+    shape = (len(percent), weights.shape[0])
+    conditions = [total == 0, flag_percent >= percent, support > r, r > support]
+    return np.select(
+        [np.broadcast_to(c, shape) for c in conditions],
+        [PENDING_CODE, FLAGGED_CODE, APPROVED_CODE, REJECTED_CODE],
+        ESCALATED_CODE
+    ).astype(np.int8)
+
+
+# ============================================================================
+# Grid evaluation
+# ============================================================================
+
+def _transitions(decide, rows: np.ndarray, params: List[np.ndarray], baseline: Sequence[Any]) -> np.ndarray:
+    """
+    Count (baseline decision, variant decision) pairs for every variant
+
+    Submissions with identical rows always get identical decisions, so
+    rules run once per distinct row and results are weighted by how many
+    submissions share it. Variants are evaluated in chunks so each pass
+    stays under MAX_CELLS elements.
+
+    Returns:
+        (variants, K, K) counts, K = len(DECISIONS)
+    """
+    k = len(DECISIONS)
+    variants = len(params[0])
+    if len(rows) == 0:
+        return np.zeros((variants, k, k), dtype=np.int64)
+
+    distinct, multiplicity = np.unique(rows, axis=0, return_counts=True)
+    base = decide(distinct, *[[value] for value in baseline])[0].astype(np.int64)
+
+    matrix = np.empty((variants, k, k), dtype=np.int64)
+    chunk = max(1, MAX_CELLS // len(distinct))
+    for start in range(0, variants, chunk):
+        stop = min(start + chunk, variants)
+        codes = decide(distinct, *[values[start:stop] for values in params])
+        cells = base[None, :] * k + codes + (np.arange(stop - start) * k * k)[:, None]
+        matrix[start:stop] = np.bincount(
+            cells.ravel(),
+            weights=np.broadcast_to(multiplicity, codes.shape).ravel(),
+            minlength=(stop - start) * k * k
+        ).reshape(-1, k, k).round().astype(np.int64)
+    return matrix
+
+
+def _report(params: Dict[str, Sequence[Any]], matrix: np.ndarray) -> List[Dict[str, Any]]:
+    """One entry per variant: parameters, decision totals and moves away from baseline"""
+    reports = []
+    changed = matrix.sum(axis=(1, 2)) - np.trace(matrix, axis1=1, axis2=2)
+    decided = matrix.sum(axis=1)
+    for v in range(len(matrix)):
+        moves = {
+            f"{DECISIONS[i]}->{DECISIONS[j]}": int(matrix[v, i, j])
+            for i, j in zip(*np.nonzero(matrix[v]))
+            if i != j
+        }
+        reports.append({
+            "params": {name: values[v].item() for name, values in params.items()},
+            "decisions": {DECISIONS[i]: int(n) for i, n in enumerate(decided[v])},
+            "changed": int(changed[v]),
+            "transitions": moves,
+        })
+    return reports
+
+
+def simulate(
+    arrays: VoteArrays,
+    urgent_flag_limit: Sequence[int] = (),
+    flag_share: Sequence[float] = (),
+    min_votes: Sequence[int] = (),
+    weighted_flag_percent: Sequence[float] = ()
+) -> Dict[str, Any]:
+    """
+    Evaluate every combination of the given thresholds
+
+    Count-rule variants are the cartesian product of urgent_flag_limit,
+    flag_share and min_votes; an empty sequence means the current value.
+    Weighted-rule variants range over weighted_flag_percent. Each variant
+    is compared with the current policy (settings and tally_rules).
+
+    Returns:
+        Dictionary with baseline parameters and per-variant reports
+    """
+    baseline = {
+        "urgent_flag_limit": settings.URGENT_FLAG_LIMIT,
+        "flag_share": tally_rules.FLAG_SHARE,
+        "min_votes": settings.MIN_VOTES_FOR_TALLY,
+    }
+    grid = list(itertools.product(
+        urgent_flag_limit or [baseline["urgent_flag_limit"]],
+        flag_share or [baseline["flag_share"]],
+        min_votes or [baseline["min_votes"]],
+    ))
+    count_params = {
+        "urgent_flag_limit": np.array([g[0] for g in grid], dtype=np.int64),
+        "flag_share": np.array([g[1] for g in grid], dtype=np.float64),
+        "min_votes": np.array([g[2] for g in grid], dtype=np.int64),
+    }
+    weighted_params = {
+        "weighted_flag_percent": np.array(
+            weighted_flag_percent or [tally_rules.WEIGHTED_FLAG_PERCENT], dtype=np.float64
+        )
+    }
+
+    count_matrix = _transitions(
+        decide_counts, arrays.counts, list(count_params.values()), list(baseline.values())
+    )
+    weighted_matrix = _transitions(
+        decide_weights, arrays.weights, list(weighted_params.values()),
+        [tally_rules.WEIGHTED_FLAG_PERCENT]
+    )
+
+    return {
+        "submissions": len(arrays),
+        "baseline": {**baseline, "weighted_flag_percent": tally_rules.WEIGHTED_FLAG_PERCENT},
+        "count_rules": _report(count_params, count_matrix),
+        "weighted_rules": _report(weighted_params, weighted_matrix),
+    }
+
+
+async def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate tally decision rules over all submissions")
+    parser.add_argument("--urgent-flag-limit", type=int, nargs="+", default=[])
+    parser.add_argument("--flag-share", type=float, nargs="+", default=[])
+    parser.add_argument("--min-votes", type=int, nargs="+", default=[])
+    parser.add_argument("--weighted-flag-percent", type=float, nargs="+", default=[])
+    parser.add_argument("--genre", help="Only simulate submissions of this genre")
+    args = parser.parse_args(argv)
+
+    from database import get_read_sessionmaker
+
+    start = time.monotonic()
+    session_factory = await get_read_sessionmaker()
+    async with session_factory() as db:
+        arrays = await load_vote_arrays(db, args.genre)
+    loaded = time.monotonic()
+
+    report = simulate(
+        arrays,
+        urgent_flag_limit=args.urgent_flag_limit,
+        flag_share=args.flag_share,
+        min_votes=args.min_votes,
+        weighted_flag_percent=args.weighted_flag_percent,
+    )
+    report["timings"] = {
+        "load_seconds": round(loaded - start, 3),
+        "evaluate_seconds": round(time.monotonic() - loaded, 3),
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,30 @@
+"""
+Shared fixtures: a fresh SQLite database with the full schema per test
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from database import Base
+
+
+@pytest_asyncio.fixture
+async def db_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    return async_sessionmaker(db_engine, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def db_session(session_factory):
+    """An open session on the empty database; test modules seed it in their own ``db`` fixture"""
+    async with session_factory() as session:
+        yield session
@@ -0,0 +1,156 @@
+"""
+Tests for API key verification caching, revocation and batched usage writes
+"""
+
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+
+import main
+from auth_service import AuthService
+from config import settings
+from database import get_db
+from middleware.auth_middleware import require_admin
+from models import ApiKey
+from schemas.auth_schemas import CurrentUser, UserRoleEnum
+
+KEYS = {1: "key-one", 2: "key-two", 3: "key-three"}
+
+
+@pytest_asyncio.fixture
+async def db(db_session):
+    auth = AuthService()
+    db_session.add_all([
+        ApiKey(id=key_id, user_id=1, name=f"service-{key_id}", key_hash=auth.hash_api_key(key), scopes=["read"])
+        for key_id, key in KEYS.items()
+    ])
+    await db_session.commit()
+    return db_session
+
+
+async def _deactivate_behind_cache(db, key_id):
+    """Deactivate a key the way another worker would, leaving this cache alone"""
+    await db.execute(update(ApiKey).where(ApiKey.id == key_id).values(is_active=False))
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_verified_key_is_served_from_cache(db):
+    auth = AuthService()
+    first = await auth.verify_api_key(KEYS[1], db)
+    assert first == {"id": 1, "name": "service-1", "user_id": 1, "scopes": ["read"]}
+
+    await _deactivate_behind_cache(db, 1)
+    assert await auth.verify_api_key(KEYS[1], db) == first
+    assert await auth.verify_api_key("unknown", db) is None
+    assert len(auth._api_key_cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_reverified(db, monkeypatch):
+    monkeypatch.setattr(settings, "API_KEY_CACHE_TTL", 0)
+    auth = AuthService()
+    assert await auth.verify_api_key(KEYS[1], db) is not None
+
+    await _deactivate_behind_cache(db, 1)
+    assert await auth.verify_api_key(KEYS[1], db) is None
+    assert len(auth._api_key_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded_lru(db, monkeypatch):
+    monkeypatch.setattr(settings, "API_KEY_CACHE_SIZE", 2)
+    auth = AuthService()
+    await auth.verify_api_key(KEYS[1], db)
+    await auth.verify_api_key(KEYS[2], db)
+    await auth.verify_api_key(KEYS[1], db)  # key 2 is now least recently used
+    await auth.verify_api_key(KEYS[3], db)
+
+    cached_ids = [data["id"] for data, _ in auth._api_key_cache.values()]
+    assert cached_ids == [1, 3]
+
+
+@pytest.mark.asyncio
+async def test_revocation_evicts_the_key(db):
+    auth = AuthService()
+    await auth.verify_api_key(KEYS[1], db)
+    await auth.verify_api_key(KEYS[2], db)
+
+    assert await auth.revoke_api_key(1, db)
+    assert await auth.verify_api_key(KEYS[1], db) is None
+    assert await auth.verify_api_key(KEYS[2], db) is not None
+    assert 1 not in auth._api_key_last_used
+
+    assert not await auth.revoke_api_key(1, db)
+
+
+@pytest.mark.asyncio
+async def test_usage_is_flushed_in_one_batch(db):
+    auth = AuthService()
+    for key in (KEYS[1], KEYS[2], KEYS[1]):
+        await auth.verify_api_key(key, db)
+    last_used = dict(auth._api_key_last_used)
+
+    assert await auth.flush_api_key_usage(db) == 2
+    assert await auth.flush_api_key_usage(db) == 0
+
+    rows = dict((await db.execute(select(ApiKey.id, ApiKey.last_used_at))).all())
+    assert rows == {1: last_used[1], 2: last_used[2], 3: None}
+
+
+class FailingSession:
+    def __init__(self, on_execute=None):
+        self.on_execute = on_execute
+        self.rolled_back = False
+
+    async def execute(self, *args, **kwargs):
+        if self.on_execute:
+            self.on_execute()
+        raise ConnectionError("database unavailable")
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_pending_usage(db):
+    auth = AuthService()
+    await auth.verify_api_key(KEYS[1], db)
+    await auth.verify_api_key(KEYS[2], db)
+    pending = dict(auth._api_key_last_used)
+    newer = datetime.utcnow()
+
+    def use_key_during_flush():
+        auth._api_key_last_used[1] = newer
+
+    session = FailingSession(use_key_during_flush)
+    with pytest.raises(ConnectionError):
+        await auth.flush_api_key_usage(session)
+    assert session.rolled_back
+    assert auth._api_key_last_used == {1: newer, 2: pending[2]}
+
+
+@pytest.mark.asyncio
+async def test_revoke_endpoint(db, monkeypatch):
+    auth = AuthService()
+    monkeypatch.setattr(main, "get_auth_service", lambda: auth)
+    await auth.verify_api_key(KEYS[1], db)
+
+    async def override_get_db():
+        yield db
+
+    main.app.dependency_overrides[get_db] = override_get_db
+    main.app.dependency_overrides[require_admin] = lambda: CurrentUser(
+        id=1, username="admin", role=UserRoleEnum.ADMIN
+    )
+    try:
+        client = TestClient(main.app)
+        assert client.delete("/api/v1/admin/api-keys/1").status_code == 200
+        assert client.delete("/api/v1/admin/api-keys/1").status_code == 404
+    finally:
+        main.app.dependency_overrides.clear()
+
+    assert await auth.verify_api_key(KEYS[1], db) is None
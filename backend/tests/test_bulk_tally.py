@@ -0,0 +1,94 @@
+"""
+Tests for set-based bulk tally recomputation
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+import tally_rules
+from models import Ring, Submission, SubmissionStatus, Tally, Vote
+from tally_service import TallyService
+
+# submission -> vote types; the last one has too few votes to tally
+VOTES = {
+    1: ["approve", "approve", "reject"],
+    2: ["reject", "reject", "approve", "escalate"],
+    3: ["approve", "flag", "flag", "reject"],
+    4: ["escalate", "escalate", "approve"],
+    5: ["approve", "reject", "escalate"],
+    6: ["approve"],
+}
+
+
+@pytest_asyncio.fixture
+async def db(db_session):
+    db_session.add(Ring(genre="news", pubkeys=["aa"], epoch=1, active=True))
+    for submission_id, vote_types in VOTES.items():
+        db_session.add(Submission(
+            id=submission_id, genre="tech" if submission_id == 5 else "news",
+            content_ref=f"ref{submission_id}", submitter_ip_hash="hash"
+        ))
+        db_session.add_all(
+            Vote(
+                submission_id=submission_id, ring_id=1, signature_blob="{}",
+                key_image=f"k{submission_id}-{i}", vote_type=vote_type,
+                token_id=f"t{i}", verified=True
+            )
+            for i, vote_type in enumerate(vote_types)
+        )
+    # Stale tally from an earlier rule set
+    db_session.add(Tally(submission_id=1, count_approve=0, final_decision="rejected"))
+    await db_session.commit()
+    return db_session
+
+
+def test_decide_columns_matches_scalar_rules():
+    """The column pass and the per-submission rules agree"""
+    cases = [(2, 0, 1, 0), (1, 1, 2, 0), (1, 0, 1, 2), (1, 2, 0, 0), (1, 1, 1, 0), (0, 0, 0, 0), (20, 0, 0, 3)]
+    columns = tally_rules.decide_columns(*zip(*cases), urgent_flag_limit=3)
+    assert columns == [
+        tally_rules.decide(dict(approve=a, escalate=e, reject=r, flag=f), 3)
+        for a, e, r, f in cases
+    ]
+    assert columns == ["approved", "rejected", "flagged", "escalated", "escalated", "escalated", "flagged"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_recompute_matches_single_tallies(db):
+    """Bulk writes the same tallies and statuses as compute_tally would"""
+    tally = TallyService()
+    progress = {}
+    result = await tally.bulk_recompute_tallies(db, min_votes=3, batch_size=2, progress=progress)
+
+    assert result == {
+        "total": 5,
+        "changed": 5,
+        "decisions": {"approved": 1, "rejected": 1, "flagged": 1, "escalated": 2},
+    }
+    assert progress == {"total": 5, "processed": 5, "changed": 5}
+
+    tallies = {
+        t.submission_id: (t.count_approve, t.count_reject, t.final_decision)
+        for t in (await db.execute(select(Tally))).scalars()
+    }
+    assert tallies[1] == (2, 1, "approved")
+    assert 6 not in tallies
+
+    db.expire_all()
+    statuses = dict((await db.execute(select(Submission.id, Submission.status))).all())
+    assert statuses[3] == SubmissionStatus.FLAGGED
+    assert statuses[6] == SubmissionStatus.PENDING
+
+    for submission_id in range(1, 6):
+        single = await tally.compute_tally(submission_id, db, force=True)
+        assert single["decision"] == statuses[submission_id].value
+
+
+@pytest.mark.asyncio
+async def test_bulk_recompute_filters(db):
+    """Genre and current-status filters narrow the re-tally"""
+    tally = TallyService()
+    assert (await tally.bulk_recompute_tallies(db, genre="tech"))["total"] == 1
+    assert (await tally.bulk_recompute_tallies(db, statuses=["pending"]))["total"] == 4
+    assert (await tally.bulk_recompute_tallies(db, statuses=["pending"]))["total"] == 0
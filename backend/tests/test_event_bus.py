@@ -0,0 +1,104 @@
+"""
+Tests for the live submission event bus
+"""
+
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+
+import event_bus as event_bus_module
+from event_bus import EventBus
+from models import Ring, Submission, Vote
+from tally_service import TallyService
+
+
+def _parse(message):
+    lines = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+    return lines["event"], json.loads(lines["data"])
+
+
+@pytest.mark.asyncio
+async def test_stream_receives_only_followed_submissions():
+    """Subscribers get events for their submissions, encoded as SSE"""
+    bus = EventBus(buffer=10)
+    stream = bus.stream([1, 2], heartbeat=60)
+    assert _parse(await anext(stream)) == ("subscribed", [1, 2])
+
+    await bus.publish_vote(3, "approve")
+    await bus.publish_vote(1, "reject")
+    await bus.publish_status(2, "pending", "pending")
+    await bus.publish_status(2, "pending", "approved")
+
+    event_type, event = _parse(await anext(stream))
+    assert event_type == "vote"
+    assert event["submission_id"] == 1 and event["data"] == {"delta": {"reject": 1}}
+    event_type, event = _parse(await anext(stream))
+    assert event_type == "status" and event["data"] == {"from": "pending", "to": "approved"}
+
+    await stream.aclose()
+    assert bus.get_stats()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_sends_heartbeats():
+    bus = EventBus()
+    stream = bus.stream([1], heartbeat=0.01)
+    await anext(stream)
+    assert await anext(stream) == ": keep-alive\n\n"
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_evicted():
+    """A full buffer ends that client's stream without affecting others"""
+    bus = EventBus(buffer=3)
+    slow = bus.stream([1], heartbeat=60)
+    fast = bus.stream([1], heartbeat=60)
+    await anext(slow)
+    await anext(fast)
+
+    for _ in range(3):
+        await bus.publish_vote(1, "approve")
+        await anext(fast)
+    await bus.publish_vote(1, "flag")
+
+    assert _parse(await anext(slow))[0] == "evicted"
+    with pytest.raises(StopAsyncIteration):
+        await anext(slow)
+    assert _parse(await anext(fast))[1]["data"] == {"delta": {"flag": 1}}
+    assert bus.get_stats()["evictions"] == 1
+    await fast.aclose()
+
+
+@pytest_asyncio.fixture
+async def db(db_session):
+    db_session.add(Submission(id=1, genre="news", content_ref="ref", submitter_ip_hash="hash"))
+    db_session.add(Ring(id=1, genre="news", pubkeys=["aa"], epoch=1, active=True))
+    db_session.add_all(
+        Vote(
+            submission_id=1, ring_id=1, signature_blob="{}", key_image=f"k{i}",
+            vote_type=vote_type, token_id="t", verified=True
+        )
+        for i, vote_type in enumerate(["approve", "approve", "reject"])
+    )
+    await db_session.commit()
+    return db_session
+
+
+@pytest.mark.asyncio
+async def test_compute_tally_publishes_tally_and_transition(db, monkeypatch):
+    bus = EventBus()
+    monkeypatch.setattr(event_bus_module, "_event_bus", bus)
+    stream = bus.stream([1], heartbeat=60)
+    await anext(stream)
+
+    await TallyService().compute_tally(1, db)
+
+    event_type, event = _parse(await anext(stream))
+    assert event_type == "tally"
+    assert event["data"]["decision"] == "approved" and event["data"]["total_votes"] == 3
+    event_type, event = _parse(await anext(stream))
+    assert (event_type, event["data"]) == ("status", {"from": "pending", "to": "approved"})
+    await stream.aclose()
@@ -0,0 +1,42 @@
+"""
+Tests for the pre-generated keypair pool used at registration
+"""
+
+import pytest
+
+from crypto_service import CryptoService, KeypairPool
+
+
+@pytest.mark.asyncio
+async def test_refill_fills_to_target():
+    """A refill generates keypairs in batches up to the target size"""
+    pool = KeypairPool(CryptoService(), target_size=10, batch_size=4)
+    await pool.refill()
+
+    assert len(pool) == 10
+    seed_hex, private_key_hex, public_key_hex = pool.take()
+    assert len(bytes.fromhex(seed_hex)) == 32
+    assert private_key_hex and public_key_hex
+
+
+@pytest.mark.asyncio
+async def test_take_schedules_refill_below_low_water():
+    """Draining the pool past its low-water mark triggers a background refill"""
+    pool = KeypairPool(CryptoService(), target_size=4, batch_size=4)
+    await pool.refill()
+
+    keys = {pool.take()[2] for _ in range(3)}
+    assert len(keys) == 3
+    assert pool._refill_task is not None
+
+    await pool._refill_task
+    assert len(pool) == 4
+
+
+def test_take_keypair_falls_back_when_empty():
+    """An empty pool never blocks registration"""
+    crypto_service = CryptoService()
+    crypto_service.keypair_pool = KeypairPool(crypto_service, target_size=0, batch_size=1)
+
+    seed_hex, private_key_hex, public_key_hex = crypto_service.take_keypair()
+    assert seed_hex and private_key_hex and public_key_hex
@@ -0,0 +1,117 @@
+"""
+Tests for the fixed-memory metrics histograms and timeseries
+"""
+
+import numpy as np
+import pytest
+
+from monitoring_service import (
+    SKETCH_MAX_BUCKETS, TIMING_MS_BUCKETS, Histogram, MetricsCollector, MonitoringService, TimeSeries
+)
+
+
+def test_quantiles_within_relative_accuracy():
+    """p50/p95/p99 stay within 1% of the exact percentiles"""
+    rng = np.random.default_rng(3)
+    values = rng.lognormal(mean=3, sigma=1.2, size=100_000)
+    histogram = Histogram(TIMING_MS_BUCKETS)
+    for value in values:
+        histogram.observe(float(value))
+
+    for q in (0.5, 0.95, 0.99):
+        exact = np.quantile(values, q, method="lower")
+        assert histogram.quantile(q) == pytest.approx(exact, rel=0.011)
+    assert histogram.count == len(values)
+    assert histogram.sum == pytest.approx(values.sum())
+    assert (histogram.min, histogram.max) == (values.min(), values.max())
+
+
+def test_memory_does_not_grow_with_samples():
+    histogram = Histogram(TIMING_MS_BUCKETS)
+    for i in range(200_000):
+        histogram.observe((i % 1000) / 10)
+    assert len(histogram._sketch) < 500
+    assert len(histogram.bucket_counts) == len(TIMING_MS_BUCKETS) + 1
+
+    # Absurd value ranges collapse the lowest buckets instead of growing
+    for exponent in range(-3 * 100, 15 * 100):
+        histogram.observe(10 ** (exponent / 100))
+    assert len(histogram._sketch) <= SKETCH_MAX_BUCKETS
+
+
+def test_zero_and_empty():
+    histogram = Histogram((1, 10))
+    assert histogram.summary()["p99"] == 0.0
+    histogram.observe(0)
+    histogram.observe(0)
+    histogram.observe(5)
+    assert histogram.quantile(0.5) == 0.0
+    assert histogram.quantile(1.0) == pytest.approx(5, rel=0.01)
+    assert histogram.cumulative_buckets() == [(1, 2), (10, 3), ("+Inf", 3)]
+
+
+def test_render_prometheus_histograms():
+    """Timings are exposed as histograms with cumulative le buckets"""
+    metrics = MetricsCollector()
+    for duration in (0.2, 3, 3, 40, 20_000):
+        metrics.record_timing("db_pool_primary_wait_ms", duration)
+
+    summary = metrics.get_metrics()["histograms"]["db_pool_primary_wait_ms"]
+    assert summary["count"] == 5 and summary["max"] == 20_000
+    assert summary["p50"] == pytest.approx(3, rel=0.01)
+
+    text = metrics.render_prometheus()
+    assert "# TYPE db_pool_primary_wait_ms histogram" in text
+    assert 'db_pool_primary_wait_ms_bucket{le="0.5"} 1' in text
+    assert 'db_pool_primary_wait_ms_bucket{le="5"} 3' in text
+    assert 'db_pool_primary_wait_ms_bucket{le="10000"} 4' in text
+    assert 'db_pool_primary_wait_ms_bucket{le="+Inf"} 5' in text
+    assert "db_pool_primary_wait_ms_count 5" in text
+    assert "db_pool_primary_wait_ms_sum 20046.2" in text
+
+
+def test_timeseries_rollups():
+    """One sample stream is aggregated per second, minute and hour"""
+    series = TimeSeries(((1, 10), (60, 5), (3600, 2)))
+    start = 7200.0
+    for second in range(120):
+        series.record(second, start + second)
+        series.record(second + 1, start + second + 0.5)
+
+    last_seconds = series.query(5, now=start + 119.9)
+    assert last_seconds["resolution"] == 1
+    assert [p["timestamp"] for p in last_seconds["points"]] == [7314, 7315, 7316, 7317, 7318, 7319]
+    assert last_seconds["points"][-1] == {"timestamp": 7319, "count": 2, "avg": 119.5, "min": 119, "max": 120}
+
+    minutes = series.query(120, now=start + 119.9)
+    assert minutes["resolution"] == 60
+    assert [p["count"] for p in minutes["points"]] == [120, 120]
+    assert (minutes["count"], minutes["min"], minutes["max"]) == (240, 0, 120)
+    assert minutes["avg"] == pytest.approx(60)
+
+    hours = series.query(3600, resolution=3600, now=start + 119.9)
+    assert hours["points"][0]["count"] == 240
+
+
+def test_timeseries_ring_overwrites_old_buckets():
+    series = TimeSeries(((1, 10),))
+    series.record(1.0, 100.0)
+    series.record(2.0, 110.0)  # same slot, ten seconds later
+
+    # A window larger than the ring is clamped to what is retained
+    result = series.query(60, now=110.0)
+    assert result["count"] == 1 and result["points"][0]["timestamp"] == 110
+    assert series.query(5, now=200.0)["count"] == 0
+    assert series.query(5, now=200.0)["avg"] is None
+
+
+def test_monitoring_service_timeseries():
+    service = MonitoringService()
+    service.record_operation("vote_submit_ms", 12.5)
+
+    assert service.list_timeseries()[0]["metric"] == "vote_submit_ms"
+    result = service.get_timeseries("vote_submit_ms", 60)
+    assert result["count"] == 1 and result["max"] == 12.5
+    assert service.get_timeseries("unknown_ms", 60) is None
+    with pytest.raises(ValueError):
+        service.get_timeseries("vote_submit_ms", 60, resolution=5)
@@ -0,0 +1,171 @@
+"""
+Tests for merging metrics across worker processes
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from config import settings
+from monitoring_service import ARCHIVE_FILE, DB_TIME_MS_BUCKETS, Histogram, MonitoringService
+
+
+def _worker(pid, monkeypatch):
+    """A MonitoringService whose snapshots are written as process ``pid``"""
+    service = MonitoringService()
+    service.metrics.increment("votes_submitted", pid)
+    service.metrics.increment_labeled("http_requests_total", {"route": "/vote", "status": "200"}, 2)
+    service.metrics.adjust_gauge("http_requests_in_flight", 1)
+    service.metrics.set_gauge("db_pool_primary_saturation", pid / 10)
+    service.metrics.observe("http_request_duration_ms", pid * 10, {"route": "/vote"}, DB_TIME_MS_BUCKETS)
+    service.record_operation("tally_ms", pid)
+    with monkeypatch.context() as m:
+        m.setattr(os, "getpid", lambda: pid)
+        service.write_snapshot()
+    return service
+
+
+def _age(path, seconds):
+    """Make a snapshot look as if its worker last wrote it ``seconds`` ago"""
+    data = json.loads(path.read_text())
+    data["written_at"] = time.time() - seconds
+    path.write_text(json.dumps(data))
+    os.utime(path, (data["written_at"], data["written_at"]))
+
+
+def test_histogram_round_trip_and_merge():
+    a, b = Histogram((1, 10)), Histogram((1, 10))
+    for value in (0, 0.5, 3):
+        a.observe(value)
+    b.observe(30)
+
+    restored = Histogram.from_dict(json.loads(json.dumps(a.to_dict())))
+    restored.merge(b)
+    assert restored.cumulative_buckets() == [(1, 2), (10, 3), ("+Inf", 4)]
+    assert (restored.count, restored.sum, restored.min, restored.max) == (4, 33.5, 0, 30)
+    assert restored.quantile(1.0) == pytest.approx(30, rel=0.01)
+
+    empty = Histogram.from_dict(Histogram((1, 10)).to_dict())
+    empty.merge(a)
+    assert empty.min == 0
+
+    with pytest.raises(ValueError):
+        a.merge(Histogram((5,)))
+
+
+def test_scrape_merges_all_workers(tmp_path, monkeypatch):
+    """Any worker's /metrics reflects the whole node"""
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    _worker(1, monkeypatch)
+    _worker(2, monkeypatch)
+    current = _worker(os.getpid(), monkeypatch)
+    current.metrics.increment("votes_submitted")  # live, not yet in its snapshot file
+
+    merged = current.collect_node_metrics()
+    assert merged.counters["votes_submitted"] == 1 + 2 + os.getpid() + 1
+    assert merged.gauges["http_requests_in_flight"] == 3
+    assert merged.gauges["db_pool_primary_saturation"] == max(0.2, os.getpid() / 10)
+    assert merged.gauges["metrics_worker_snapshots"] == 3
+    assert merged.histograms["tally_ms"].count == 3
+
+    text = current.render_prometheus()
+    assert 'http_requests_total{route="/vote",status="200"} 6' in text
+    assert 'http_request_duration_ms_bucket{route="/vote",le="25"} 2' in text
+    assert 'http_request_duration_ms_count{route="/vote"} 3' in text
+
+
+def test_exited_worker_keeps_counters_but_not_gauges(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    _worker(7, monkeypatch)
+    _age(tmp_path / "metrics-7.json", settings.METRICS_STALE_SECONDS + 1)
+    (tmp_path / "metrics-8.json").write_text("{truncated")
+
+    merged = MonitoringService().collect_node_metrics()
+    assert merged.counters["votes_submitted"] == 7
+    assert "http_requests_in_flight" not in merged.gauges
+    assert merged.gauges["metrics_worker_snapshots"] == 2
+
+
+def test_exited_workers_are_folded_into_the_archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setattr(MonitoringService, "_pid_alive", staticmethod(lambda pid: pid == 3))
+    for pid in (1, 2, 3, 4):
+        _worker(pid, monkeypatch)
+    for pid in (1, 2, 3):
+        _age(tmp_path / f"metrics-{pid}.json", settings.METRICS_STALE_SECONDS + 1)
+    (tmp_path / "metrics-5.json").write_text("{truncated")
+    stale = time.time() - settings.METRICS_STALE_SECONDS - 1
+    os.utime(tmp_path / "metrics-5.json", (stale, stale))
+
+    service = MonitoringService()
+    before = service.collect_node_metrics()
+
+    # 1 and 2 exited long ago; 3 is alive but slow; 4 exited just now
+    assert service.compact_snapshots() == 2
+    assert sorted(p.name for p in tmp_path.glob("metrics-*.json")) == [
+        "metrics-3.json", "metrics-4.json", ARCHIVE_FILE
+    ]
+
+    after = service.collect_node_metrics()
+    assert after.counters["votes_submitted"] == before.counters["votes_submitted"] == 10
+    assert after.histograms["tally_ms"].count == 4
+    assert after.gauges["http_requests_in_flight"] == 1
+    assert after.gauges["metrics_worker_snapshots"] == 3
+    assert 'http_requests_total{route="/vote",status="200"} 8' in after.render_prometheus()
+
+    # Folding again adds to the existing archive
+    _age(tmp_path / "metrics-4.json", settings.METRICS_STALE_SECONDS + 1)
+    assert service.compact_snapshots() == 1
+    assert service.collect_node_metrics().counters["votes_submitted"] == 10
+    assert service.compact_snapshots() == 0
+
+
+def test_snapshot_left_by_an_interrupted_fold_counts_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setattr(MonitoringService, "_pid_alive", staticmethod(lambda pid: False))
+    _worker(1, monkeypatch)
+    path = tmp_path / "metrics-1.json"
+    _age(path, settings.METRICS_STALE_SECONDS + 1)
+    leftover = path.read_text()
+
+    service = MonitoringService()
+    assert service.compact_snapshots() == 1
+    path.write_text(leftover)  # as if the worker died between archive write and delete
+    os.utime(path, (0, 0))
+
+    assert service.collect_node_metrics().counters["votes_submitted"] == 1
+    assert service.compact_snapshots() == 0
+    assert not path.exists()
+    assert service.collect_node_metrics().counters["votes_submitted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_recycled_pid_keeps_the_earlier_workers_totals(tmp_path, monkeypatch):
+    """A new worker reusing a dead worker's PID folds its snapshot before overwriting it"""
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    _worker(os.getpid(), monkeypatch)
+
+    service = MonitoringService()
+    service.metrics.increment("votes_submitted", 5)
+    service.start_snapshot_writer()
+    try:
+        assert service.collect_node_metrics().counters["votes_submitted"] == os.getpid() + 5
+    finally:
+        await service.stop_snapshot_writer()
+
+    # Restarting the writer in the same process must not fold its own snapshot
+    service.start_snapshot_writer()
+    try:
+        assert service.collect_node_metrics().counters["votes_submitted"] == os.getpid() + 5
+    finally:
+        await service.stop_snapshot_writer()
+
+
+def test_single_process_mode_renders_local_metrics(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", None)
+    service = MonitoringService()
+    service.increment_counter("logins")
+    assert "logins 1" in service.render_prometheus()
+    assert "metrics_worker_snapshots" not in service.render_prometheus()
@@ -0,0 +1,88 @@
+"""
+Tests for the versioned schema migrations
+"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import database
+from database import Base, get_head_revision, get_schema_version
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "DATABASE_URL", str(engine.url))
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_init_db_migrates_empty_database(sqlite_engine):
+    """A fresh database is upgraded to the head revision"""
+    await database.init_db()
+
+    async with sqlite_engine.connect() as conn:
+        assert await get_schema_version(conn) == get_head_revision()
+        tables = await conn.run_sync(
+            lambda sync_conn: set(sync_conn.dialect.get_table_names(sync_conn))
+        )
+    assert set(Base.metadata.tables) <= tables
+    await sqlite_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_init_db_refuses_outdated_schema(sqlite_engine, monkeypatch):
+    """Without auto-migrate an unversioned database fails fast"""
+    monkeypatch.setattr(database.settings, "DATABASE_AUTO_MIGRATE", False)
+    async with sqlite_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        await database.init_db()
+    await sqlite_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_legacy_database_is_stamped(sqlite_engine):
+    """Tables created by the old create_all path are adopted, not recreated"""
+    async with sqlite_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text(
+            "INSERT INTO submissions (genre, content_ref, submitter_ip_hash, status) "
+            "VALUES ('news', 'ref', 'hash', 'PENDING')"
+        ))
+
+    await database.run_migrations("0001")
+
+    async with sqlite_engine.connect() as conn:
+        assert await get_schema_version(conn) == "0001"
+        count = await conn.execute(text("SELECT COUNT(*) FROM submissions"))
+        assert count.scalar() == 1
+    await sqlite_engine.dispose()
+
+
+class UnusableEngine:
+    """The app engine, whose request-sized timeouts must not apply to migrations"""
+
+    def connect(self):
+        raise AssertionError("migrations ran on the app engine")
+
+
+@pytest.mark.asyncio
+async def test_migrations_use_their_own_engine(sqlite_engine, monkeypatch):
+    monkeypatch.setattr(database, "engine", UnusableEngine())
+    await database.run_migrations("head")
+
+    async with sqlite_engine.connect() as conn:
+        assert await get_schema_version(conn) == get_head_revision()
+    await sqlite_engine.dispose()
+
+
+def test_exclusive_lock_revisions_need_a_maintenance_window():
+    """The votes/audit_logs partitioning rewrite is never applied at startup"""
+    head = get_head_revision()
+    assert database.get_maintenance_revisions("0003", head) == ["0004"]
+    assert database.get_maintenance_revisions("0004", head) == []
+    assert database.get_maintenance_revisions(head, head) == []
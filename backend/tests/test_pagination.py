@@ -0,0 +1,75 @@
+"""
+Tests for keyset pagination helpers
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from pagination import (
+    MAX_PAGE_SIZE, clamp_limit, cursor_param, decode_cursor,
+    encode_cursor, keyset_page, split_page
+)
+
+
+def test_cursor_round_trip():
+    """Cursors are opaque but decode back to the exact sort key"""
+    ts = datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    cursor = encode_cursor(ts, 42)
+
+    assert "2025" not in cursor
+    assert decode_cursor(cursor) == (ts, 42)
+
+
+def test_invalid_cursor_rejected():
+    """Malformed cursors are a client error, not a server error"""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(HTTPException) as excinfo:
+        cursor_param("not-a-cursor")
+    assert excinfo.value.status_code == 400
+    assert cursor_param(None) is None
+
+
+def test_clamp_limit():
+    assert clamp_limit(0) == 1
+    assert clamp_limit(10) == 10
+    assert clamp_limit(10_000) == MAX_PAGE_SIZE
+
+
+@pytest.mark.asyncio
+async def test_pages_cover_rows_once_with_timestamp_ties():
+    """Walking every page returns each row exactly once, newest first"""
+    metadata = MetaData()
+    items = Table(
+        "items", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("created_at", DateTime, nullable=False),
+    )
+    base = datetime(2025, 1, 1)
+    rows = [{"id": i, "created_at": base + timedelta(seconds=i // 3)} for i in range(1, 11)]
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+        await conn.execute(items.insert(), rows)
+
+        seen, cursor = [], None
+        while True:
+            result = await conn.execute(
+                keyset_page(select(items), items.c.created_at, items.c.id, cursor, 4)
+            )
+            page, next_cursor = split_page(
+                result.all(), 4, lambda r: (r.created_at, r.id)
+            )
+            seen.extend(r.id for r in page)
+            if next_cursor is None:
+                break
+            cursor = decode_cursor(next_cursor)
+    await engine.dispose()
+
+    expected = sorted(rows, key=lambda r: (r["created_at"], r["id"]), reverse=True)
+    assert seen == [r["id"] for r in expected]
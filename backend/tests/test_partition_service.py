@@ -0,0 +1,109 @@
+"""
+Tests for monthly partition naming and maintenance
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+import partition_service
+from partition_service import (
+    PartitionService, add_months, month_start, partition_month, partition_name
+)
+
+
+def test_month_arithmetic_crosses_years():
+    """Month shifts wrap around year boundaries in both directions"""
+    assert month_start(datetime(2025, 12, 31, 23, 59)) == date(2025, 12, 1)
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+    assert add_months(date(2025, 1, 1), -25) == date(2022, 12, 1)
+
+
+def test_partition_names_round_trip():
+    """Partition names encode their month; the default partition has none"""
+    name = partition_name("audit_logs", date(2025, 3, 1))
+    assert name == "audit_logs_y2025m03"
+    assert partition_month(name) == date(2025, 3, 1)
+    assert partition_month("votes_default") is None
+
+
+@pytest.mark.asyncio
+async def test_maintenance_is_noop_without_postgres():
+    """On databases without native partitioning nothing is created or archived"""
+    service = PartitionService()
+    if service.supported:
+        pytest.skip("requires a non-PostgreSQL DATABASE_URL")
+
+    assert await service.ensure_partitions() == []
+    assert await service.list_partitions("votes") == []
+    assert await service.apply_retention("votes", 1) == []
+    assert "skipped" in await service.run_maintenance()
+
+
+class _LockConnection:
+    """Stands in for a PostgreSQL connection answering pg_try_advisory_lock"""
+
+    def __init__(self, available):
+        self.available = available
+        self.statements = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        available = self.available
+
+        class Result:
+            def scalar(self):
+                return available
+
+        return Result()
+
+    async def commit(self):
+        pass
+
+
+class _LockEngine:
+    def __init__(self, available):
+        self.conn = _LockConnection(available)
+
+    def connect(self):
+        return self.conn
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("available", [True, False])
+async def test_maintenance_runs_only_under_advisory_lock(available, monkeypatch):
+    """Only the worker holding the lock creates and archives partitions"""
+    lock_engine = _LockEngine(available)
+    monkeypatch.setattr(partition_service, "engine", lock_engine)
+    monkeypatch.setattr(PartitionService, "supported", True)
+    service = PartitionService()
+    calls = []
+
+    async def ensure_partitions():
+        calls.append("ensure")
+        return []
+
+    async def apply_retention(table, retain_months):
+        calls.append(table)
+        return []
+
+    monkeypatch.setattr(service, "ensure_partitions", ensure_partitions)
+    monkeypatch.setattr(service, "apply_retention", apply_retention)
+    service.retention_months = {"votes": 12, "audit_logs": 0}
+
+    report = await service.run_maintenance()
+    if available:
+        assert calls == ["ensure", "votes"]
+        assert report == {"created": [], "archived": {"votes": []}}
+        assert "pg_advisory_unlock" in lock_engine.conn.statements[-1]
+    else:
+        assert calls == []
+        assert "skipped" in report
+        assert len(lock_engine.conn.statements) == 1
@@ -0,0 +1,39 @@
+"""
+Tests for connection pool instrumentation
+"""
+
+from database import PoolMonitor, engine, pool_monitor
+from config import settings
+
+
+def test_engine_uses_pool_settings():
+    """The primary engine is sized from settings, not hard-coded values"""
+    pool = engine.sync_engine.pool
+    assert pool.size() == settings.DATABASE_POOL_SIZE
+    assert pool_monitor.capacity == settings.DATABASE_POOL_SIZE + settings.DATABASE_MAX_OVERFLOW
+
+
+def test_checkout_records_wait_and_saturation():
+    """Checkouts update wait statistics and saturation"""
+    monitor = PoolMonitor("unit", pool_size=4, max_overflow=0)
+    monitor.record_checkout(2.0, in_use=1)
+    monitor.record_checkout(6.0, in_use=2)
+
+    status = monitor.status()
+    assert status["checkouts"] == 2
+    assert status["avg_wait_ms"] == 4.0
+    assert status["max_wait_ms"] == 6.0
+    assert status["saturation"] == 0.5
+    assert status["alarms"] == 0
+
+
+def test_saturation_alarm_is_rate_limited():
+    """Running at capacity raises one alarm per interval"""
+    monitor = PoolMonitor("unit", pool_size=2, max_overflow=0, alarm_threshold=1.0)
+    monitor.record_checkout(1.0, in_use=2)
+    monitor.record_checkout(1.0, in_use=2)
+    assert monitor.alarms == 1
+
+    monitor.record_timeout(30000.0)
+    assert monitor.timeouts == 1
+    assert monitor.alarms == 2
@@ -0,0 +1,74 @@
+"""
+Tests for per-request database query instrumentation
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import database
+from database import QueryStats, current_query_stats, normalize_sql
+from middleware.query_metrics import QueryMetricsMiddleware
+from monitoring_service import MonitoringService
+
+
+def test_normalize_sql_strips_values():
+    """Literals, placeholders and IN lists collapse; casts survive"""
+    assert normalize_sql(
+        "SELECT  reltuples::bigint FROM t\n WHERE a = :a_1 AND b IN ($1, $2, $3) "
+        "AND c = 'it''s' AND d > 42"
+    ) == "SELECT reltuples::bigint FROM t WHERE a = ? AND b IN (?...) AND c = ? AND d > ?"
+
+
+@pytest.mark.asyncio
+async def test_queries_are_attributed_to_current_stats(tmp_path):
+    """Cursor hooks count statements only while a QueryStats is bound"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'q.db'}")
+    database._instrument_queries(engine, "test")
+
+    stats = QueryStats(route="/x")
+    token = current_query_stats.set(stats)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+    finally:
+        current_query_stats.reset(token)
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 3"))
+
+    assert stats.count == 2
+    assert stats.total_ms >= stats.slowest_ms > 0
+    assert stats.slowest_sql in ("SELECT 1", "SELECT 2")
+    await engine.dispose()
+
+
+def test_middleware_records_route_template(monkeypatch):
+    """Requests are labeled by route template, not by concrete path"""
+    monitoring = MonitoringService()
+    monkeypatch.setattr("middleware.query_metrics.get_monitoring_service", lambda: monitoring)
+
+    app = FastAPI()
+    app.add_middleware(QueryMetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        current_query_stats.get().record("SELECT * FROM items WHERE id = 1", 2.0)
+        return {"id": item_id}
+
+    with TestClient(app) as client:
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing")
+
+    routes = {row["route"]: row for row in monitoring.get_route_query_stats()}
+    assert routes["/items/{item_id}"]["requests"] == 2
+    assert routes["/items/{item_id}"]["max_queries"] == 1
+    assert routes["/items/{item_id}"]["slowest_sql"] == "SELECT * FROM items WHERE id = ?"
+    assert routes["unmatched"]["queries"] == 0
+
+    exposition = monitoring.render_prometheus()
+    assert 'http_request_db_queries_count{method="GET",route="/items/{item_id}"} 2' in exposition
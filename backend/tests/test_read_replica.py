@@ -0,0 +1,86 @@
+"""
+Tests for read replica lag checks and read-session routing
+"""
+
+import pytest
+
+import database
+from database import ReplicaLagMonitor
+
+
+class StubMonitor(ReplicaLagMonitor):
+    """Lag monitor answering from a list of canned samples instead of a replica"""
+
+    def __init__(self, samples, max_lag=5.0, check_interval=60.0):
+        super().__init__(max_lag, check_interval)
+        self.samples = list(samples)
+        self.queries = 0
+
+    async def _query_lag(self):
+        self.queries += 1
+        sample = self.samples.pop(0)
+        if isinstance(sample, Exception):
+            raise sample
+        return sample
+
+    def expire(self):
+        self._checked_at = 0.0
+
+
+def test_lag_query_requires_a_streaming_receiver():
+    """Caught-up LSNs only mean zero lag while WAL is still arriving"""
+    assert "pg_stat_wal_receiver" in ReplicaLagMonitor.LAG_QUERY
+    assert "COALESCE" not in ReplicaLagMonitor.LAG_QUERY
+
+
+@pytest.mark.asyncio
+async def test_samples_are_cached_for_the_check_interval():
+    monitor = StubMonitor([0.5, 30.0])
+    assert await monitor.is_usable()
+    assert await monitor.is_usable()
+    assert monitor.queries == 1
+
+    monitor.expire()
+    assert not await monitor.is_usable()
+    assert monitor.status()["lag_seconds"] == 30.0
+
+
+@pytest.mark.asyncio
+async def test_unknown_lag_and_errors_are_unusable():
+    """No replayed transaction yet, or an unreachable replica, means primary reads"""
+    monitor = StubMonitor([None, 1.0, ConnectionError("replica down")])
+    assert not await monitor.is_usable()
+
+    monitor.expire()
+    assert await monitor.is_usable()
+
+    monitor.expire()
+    assert not await monitor.is_usable()
+    assert monitor.lag_seconds is None
+
+
+@pytest.mark.asyncio
+async def test_read_sessions_fall_back_to_primary(monkeypatch):
+    """get_read_sessionmaker / get_read_db use the replica only while it is fresh"""
+    replica_factory = object()
+    monitor = StubMonitor([0.0, 10.0])
+    monkeypatch.setattr(database, "replica_monitor", monitor)
+    monkeypatch.setattr(database, "AsyncReadSessionLocal", replica_factory)
+
+    assert await database.get_read_sessionmaker() is replica_factory
+
+    monitor.expire()
+    assert await database.get_read_sessionmaker() is database.AsyncSessionLocal
+    assert monitor.fallbacks == 1
+
+    sessions = database.get_read_db()
+    session = await anext(sessions)
+    assert session.bind is database.engine
+    await sessions.aclose()
+    assert monitor.fallbacks == 2
+
+
+@pytest.mark.asyncio
+async def test_no_replica_configured_reads_from_primary(monkeypatch):
+    monkeypatch.setattr(database, "replica_monitor", None)
+    assert await database.get_read_sessionmaker() is database.AsyncSessionLocal
@@ -0,0 +1,70 @@
+"""
+Tests for per-route request latency and status instrumentation
+"""
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from middleware.request_metrics import IN_FLIGHT_GAUGE, RequestMetricsMiddleware
+from monitoring_service import MonitoringService
+
+
+def _app(monkeypatch):
+    monitoring = MonitoringService()
+    monkeypatch.setattr("middleware.request_metrics.get_monitoring_service", lambda: monitoring)
+
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware)
+
+    @app.post("/items/{item_id}")
+    async def update(item_id: int, request: Request):
+        assert monitoring.metrics.gauges[IN_FLIGHT_GAUGE] == 1
+        return {"id": item_id, "size": len(await request.body())}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    return app, monitoring
+
+
+def test_requests_labeled_by_template_with_status_and_sizes(monkeypatch):
+    app, monitoring = _app(monkeypatch)
+    with TestClient(app, raise_server_exceptions=False) as client:
+        client.post("/items/1", content=b"x" * 300)
+        client.post("/items/2", content=b"y" * 5)
+        client.post("/items/abc")
+        client.get("/boom")
+        client.get("/missing")
+
+    counters = monitoring.metrics.get_metrics()["labeled_counters"]["http_requests_total"]
+    assert counters == {
+        "method=POST,route=/items/{item_id},status=200": 2,
+        "method=POST,route=/items/{item_id},status=422": 1,
+        "method=GET,route=/boom,status=500": 1,
+        "method=GET,route=unmatched,status=404": 1,
+    }
+    assert monitoring.metrics.gauges[IN_FLIGHT_GAUGE] == 0
+
+    sizes = monitoring.metrics.get_metrics()["labeled_histograms"]["http_request_size_bytes"]
+    assert sizes["method=POST,route=/items/{item_id}"]["sum"] == 305
+
+    exposition = monitoring.render_prometheus()
+    assert "# TYPE http_requests_total counter" in exposition
+    assert 'http_requests_total{method="GET",route="/boom",status="500"} 1' in exposition
+    assert 'http_request_duration_ms_count{method="POST",route="/items/{item_id}"} 3' in exposition
+    assert 'http_response_size_bytes_bucket{method="GET",route="unmatched",le="+Inf"} 1' in exposition
+    assert "http_requests_in_flight 0" in exposition
+
+
+def test_route_latency_stats(monkeypatch):
+    app, monitoring = _app(monkeypatch)
+    with TestClient(app, raise_server_exceptions=False) as client:
+        client.get("/boom")
+        client.post("/items/1")
+
+    routes = {row["route"]: row for row in monitoring.get_route_latency_stats()}
+    assert routes["/boom"]["error_rate"] == 1.0
+    assert routes["/boom"]["statuses"] == {"500": 1}
+    assert routes["/items/{item_id}"]["error_rate"] == 0.0
+    assert routes["/items/{item_id}"]["p99_ms"] > 0
@@ -0,0 +1,92 @@
+"""
+Tests for ring membership stored in ring_members
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update
+
+from models import Ring
+from ring_service import RingService
+
+
+@pytest_asyncio.fixture
+async def db(db_session):
+    db_session.add_all([
+        Ring(genre="news", pubkeys=["aa", "bb"], epoch=1, active=True),
+        Ring(genre="tech", pubkeys=["bb"], epoch=1, active=False),
+    ])
+    await db_session.commit()
+    return db_session
+
+
+async def _ring(db, ring_id):
+    result = await db.execute(
+        select(Ring).where(Ring.id == ring_id).execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_add_member_appends_and_bumps_version(db):
+    service = RingService()
+    success, membership, error = await service.add_member(db, 1, bytes.fromhex("cc"))
+
+    assert success and error is None
+    assert membership == {"version": 2, "member_count": 3}
+    assert (await _ring(db, 1)).pubkeys == ["aa", "bb", "cc"]
+
+    success, _, error = await service.add_member(db, 1, bytes.fromhex("aa"))
+    assert not success and error == "Public key already exists in ring"
+    assert (await _ring(db, 1)).version == 2
+
+
+@pytest.mark.asyncio
+async def test_remove_member_keeps_order_and_last_member(db):
+    service = RingService()
+    success, membership, _ = await service.remove_member(db, 1, bytes.fromhex("aa"))
+    assert success and membership["member_count"] == 1
+    assert (await _ring(db, 1)).pubkeys == ["bb"]
+
+    success, _, error = await service.remove_member(db, 1, bytes.fromhex("bb"))
+    assert not success and error == "Cannot remove all members from ring"
+    assert (await _ring(db, 1)).pubkeys == ["bb"]
+
+    success, _, error = await service.remove_member(db, 1, bytes.fromhex("ff"))
+    assert error == "Public key not found in ring"
+
+
+@pytest.mark.asyncio
+async def test_rings_for_key(db):
+    service = RingService()
+    rings = await service.rings_for_key(db, bytes.fromhex("bb"))
+    assert [r["ring_id"] for r in rings] == [1, 2]
+
+    rings = await service.rings_for_key(db, bytes.fromhex("bb"), active_only=True)
+    assert [r["ring_id"] for r in rings] == [1]
+
+
+@pytest.mark.asyncio
+async def test_replace_members(db):
+    service = RingService()
+    version, member_count = await service.replace_members(
+        db, 1, [bytes.fromhex(k) for k in ("bb", "dd", "aa")]
+    )
+    await db.commit()
+
+    ring = await _ring(db, 1)
+    assert (version, member_count) == (2, 3)
+    assert ring.pubkeys == ["bb", "dd", "aa"]
+
+
+@pytest.mark.asyncio
+async def test_replace_members_sets_count_absolutely(db):
+    """The count is written from the new membership, not adjusted from a stale read"""
+    await db.execute(update(Ring).where(Ring.id == 1).values(member_count=7))
+    service = RingService()
+    _, member_count = await service.replace_members(db, 1, [bytes.fromhex("ee")])
+    await db.commit()
+
+    assert member_count == 1
+    assert (await _ring(db, 1)).member_count == 1
+    assert await service.replace_members(db, 99, [bytes.fromhex("ee")]) is None
@@ -0,0 +1,89 @@
+"""
+Tests for the cached statistics snapshot
+"""
+
+import asyncio
+
+import pytest
+
+import stats_service
+from models import Ring, Submission, SubmissionStatus, Vote, VoteType
+from stats_service import StatsService
+
+
+@pytest.fixture
+def session_factory(session_factory, monkeypatch):
+    """The shared test database, also used by StatsService for its read sessions"""
+    async def get_read_sessionmaker():
+        return session_factory
+
+    monkeypatch.setattr(stats_service, "get_read_sessionmaker", get_read_sessionmaker)
+    return session_factory
+
+
+async def _seed(factory):
+    async with factory() as db:
+        ring = Ring(genre="news", pubkeys=[], epoch=1, active=True)
+        db.add(ring)
+        db.add_all([
+            Submission(genre="news", content_ref="a", submitter_ip_hash="x"),
+            Submission(genre="news", content_ref="b", submitter_ip_hash="x",
+                       status=SubmissionStatus.APPROVED),
+            Submission(genre="tech", content_ref="c", submitter_ip_hash="x"),
+        ])
+        await db.flush()
+        db.add_all([
+            Vote(submission_id=1, ring_id=ring.id, signature_blob="{}", key_image="k1",
+                 vote_type=VoteType.APPROVE, token_id="t1", verified=True),
+            Vote(submission_id=1, ring_id=ring.id, signature_blob="{}", key_image="k2",
+                 vote_type=VoteType.FLAG, token_id="t2", verified=False),
+        ])
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_counts(session_factory):
+    """One aggregate pass yields the same numbers as per-status COUNTs"""
+    await _seed(session_factory)
+    snapshot = await StatsService(ttl=60).get_snapshot()
+
+    assert snapshot["submissions"]["total"] == 3
+    assert snapshot["submissions"]["pending"] == 2
+    assert snapshot["submissions"]["approved"] == 1
+    assert snapshot["submissions"]["by_genre"] == {"news": 2, "tech": 1}
+    assert snapshot["votes"]["total"] == 2
+    assert snapshot["votes"]["verified"] == 1
+    assert snapshot["votes"]["flag"] == 1
+    assert snapshot["votes"]["verified_by_type"]["flag"] == 0
+    assert snapshot["rings"] == {"total": 1, "active": 1}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_readers_share_one_refresh(session_factory):
+    """Readers of a cold snapshot wait on a single refresh"""
+    service = StatsService(ttl=60)
+    await asyncio.gather(*(service.get_snapshot() for _ in range(10)))
+    assert service.refreshes == 1
+
+    await service.get_snapshot()
+    assert service.refreshes == 1
+
+
+@pytest.mark.asyncio
+async def test_incremental_updates(session_factory):
+    """Vote and tally events adjust the snapshot without a refresh"""
+    await _seed(session_factory)
+    service = StatsService(ttl=60)
+    await service.get_snapshot()
+
+    service.record_vote(VoteType.REJECT)
+    service.record_status_change(SubmissionStatus.PENDING, "rejected")
+    service.record_submission("sports")
+
+    snapshot = await service.get_snapshot()
+    assert service.refreshes == 1
+    assert snapshot["votes"]["total"] == 3
+    assert snapshot["votes"]["reject"] == 1
+    assert snapshot["submissions"]["pending"] == 2
+    assert snapshot["submissions"]["rejected"] == 1
+    assert snapshot["submissions"]["by_genre"]["sports"] == 1
@@ -0,0 +1,200 @@
+"""
+Tests for the tally read cache
+"""
+
+import asyncio
+
+import pytest
+
+from tally_service import TallyCache
+
+
+class MemoryRedis:
+    """The handful of Redis commands TallyCache uses, shared like a server"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+
+class MemoryPipeline:
+    def __init__(self, redis):
+        self.redis, self.commands = redis, []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def incr(self, key):
+        self.commands.append(key)
+
+    def expire(self, key, seconds):
+        pass
+
+    async def execute(self):
+        for key in self.commands:
+            await self.redis.incr(key)
+
+
+def _loader(results, calls, delay=0):
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return results.pop(0)
+    return load
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    """Single-flight: many pollers of one submission cause one computation"""
+    cache = TallyCache()
+    calls = []
+    load = _loader([{"success": True, "decision": "approved"}], calls, delay=0.01)
+
+    results = await asyncio.gather(*[cache.get_or_load(1, load) for _ in range(20)])
+    assert len(calls) == 1
+    assert all(result["decision"] == "approved" for result in results)
+    assert cache.coalesced == 19
+
+    assert (await cache.get_or_load(1, load))["decision"] == "approved"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_and_failures():
+    """Votes invalidate cached tallies; failed loads are never cached"""
+    cache = TallyCache()
+    calls = []
+    load = _loader([
+        {"success": False, "error": "Submission not found"},
+        {"success": True, "decision": "approved"},
+        {"success": True, "decision": "rejected"},
+    ], calls)
+
+    assert not (await cache.get_or_load(1, load))["success"]
+    assert (await cache.get_or_load(1, load))["decision"] == "approved"
+    await cache.invalidate(1)
+    assert (await cache.get_or_load(1, load))["decision"] == "rejected"
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_load_racing_a_vote_is_not_cached():
+    """A tally loaded before a concurrent vote is stale as soon as it lands"""
+    cache = TallyCache()
+    calls = []
+    load = _loader([{"success": True, "decision": "old"}, {"success": True, "decision": "new"}], calls, delay=0.02)
+
+    pending = asyncio.create_task(cache.get_or_load(1, load))
+    await asyncio.sleep(0.005)
+    await cache.invalidate(1)
+    assert (await pending)["decision"] == "old"
+    assert (await cache.get_or_load(1, load))["decision"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_workers_share_tallies_and_invalidations_through_redis():
+    """A vote on one worker invalidates the copy cached by another"""
+    redis = MemoryRedis()
+    worker_a, worker_b = TallyCache(), TallyCache()
+    worker_a.attach_redis(redis)
+    worker_b.attach_redis(redis)
+    calls = []
+    load = _loader([{"success": True, "decision": "approved"}, {"success": True, "decision": "flagged"}], calls)
+
+    await worker_a.get_or_load(7, load)
+    assert (await worker_b.get_or_load(7, load))["decision"] == "approved"
+    assert len(calls) == 1
+
+    await worker_a.invalidate(7)
+    assert (await worker_b.get_or_load(7, load))["decision"] == "flagged"
+    assert (await worker_a.get_or_load(7, load))["decision"] == "flagged"
+    assert len(calls) == 2
+
+    await worker_b.invalidate_all()
+    assert (await worker_a.get(7))[1] is None
+
+
+class FlakyRedis(MemoryRedis):
+    """MemoryRedis that fails every command while ``down`` is set"""
+
+    def __init__(self):
+        super().__init__()
+        self.down = False
+
+    def _check(self):
+        if self.down:
+            raise ConnectionError("redis down")
+
+    async def mget(self, *keys):
+        self._check()
+        return await super().mget(*keys)
+
+    async def get(self, key):
+        self._check()
+        return await super().get(key)
+
+    async def incr(self, key):
+        self._check()
+        await super().incr(key)
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_is_temporary(monkeypatch):
+    """A Redis error degrades to local caching only until the retry backoff passes"""
+    monkeypatch.setattr(TallyCache, "REDIS_RETRY_SECONDS", 0.01)
+    redis = FlakyRedis()
+    worker_a, worker_b = TallyCache(), TallyCache()
+    worker_a.attach_redis(redis)
+    worker_b.attach_redis(redis)
+    calls = []
+    load = _loader([{"success": True, "decision": d} for d in ("a1", "b1", "a2", "a3")], calls)
+
+    assert (await worker_a.get_or_load(1, load))["decision"] == "a1"
+    assert (await worker_b.get_or_load(1, load))["decision"] == "a1"
+
+    redis.down = True
+    assert (await worker_b.get_or_load(1, load))["decision"] == "b1"  # local-only, reloaded
+    await worker_b.invalidate(1)  # never reaches Redis
+    redis.down = False
+
+    # Still backing off: worker_a keeps serving the shared copy
+    assert (await worker_a.get_or_load(1, load))["decision"] == "a1"
+
+    await asyncio.sleep(0.02)
+    # On reconnect worker_b bumps the shared epoch for the invalidation it missed
+    assert (await worker_b.get_or_load(1, load))["decision"] == "a2"
+    assert worker_b.redis_client is redis
+    assert (await worker_a.get_or_load(1, load))["decision"] == "a2"
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_misses_read_the_primary(db_session):
+    """get_or_compute_tally loads through the session it is given (the primary)"""
+    from models import Submission, Tally
+    from tally_service import TallyService
+
+    db_session.add(Submission(id=1, genre="news", content_ref="ref", submitter_ip_hash="hash"))
+    db_session.add(Tally(submission_id=1, count_approve=4, final_decision="approved"))
+    await db_session.commit()
+
+    service = TallyService()
+    result = await service.get_or_compute_tally(1, db_session)
+    assert result["success"] and result["counts"]["approve"] == 4
@@ -0,0 +1,124 @@
+"""
+Tests for the tally decision rules and the vectorized rule simulator
+"""
+
+import itertools
+import time
+
+import numpy as np
+import pytest
+import pytest_asyncio
+
+import tally_rules
+import tally_simulator
+from models import Ring, Submission, Vote, WeightedTally
+from tally_rules import DECISIONS, decide_counts
+from tally_simulator import VoteArrays, decide_weights, simulate
+
+# Every count combination up to 6 votes of each type
+ALL_COUNTS = np.array(list(itertools.product(range(7), repeat=4)), dtype=np.int64)
+
+
+def _as_dict(row):
+    return dict(zip(tally_simulator.VOTE_TYPE_KEYS, row.tolist()))
+
+
+@pytest.mark.parametrize("limit,share,min_votes", [(3, 0.2, 3), (1, 0.2, 0), (5, 0.35, 4), (2, 0.1, 1)])
+def test_count_rules_match_scalar(limit, share, min_votes, monkeypatch):
+    """The NumPy rules agree with tally_rules.decide on every small count vector"""
+    monkeypatch.setattr(tally_rules, "FLAG_SHARE", share)
+    codes = decide_counts(ALL_COUNTS, [limit], [share], [min_votes])[0]
+
+    expected = [
+        tally_rules.PENDING if row.sum() < min_votes else tally_rules.decide(_as_dict(row), limit)
+        for row in ALL_COUNTS
+    ]
+    assert [DECISIONS[c] for c in codes] == expected
+
+
+@pytest.mark.parametrize("percent", [20, 30, 45])
+def test_weighted_rules_match_scalar(percent, monkeypatch):
+    """The NumPy rules agree with tally_rules.decide_weighted, including empty and tied rows"""
+    monkeypatch.setattr(tally_rules, "WEIGHTED_FLAG_PERCENT", percent)
+    rng = np.random.default_rng(7)
+    weights = np.round(rng.choice([0.0, 0.5, 1.0, 1.5, 2.0], size=(2000, 4)) * rng.integers(0, 4, (2000, 4)), 2)
+    weights = np.vstack([weights, [[0, 0, 0, 0], [1.0, 0, 1.0, 0], [0.7, 0, 0, 0.3]]])
+
+    codes = decide_weights(weights, [percent])[0]
+    assert [DECISIONS[c] for c in codes] == [tally_rules.decide_weighted(_as_dict(row)) for row in weights]
+
+
+def test_simulate_reports_changes_against_baseline():
+    """Variants cover the parameter grid and count moves from the current policy"""
+    arrays = VoteArrays(
+        submission_ids=np.arange(4),
+        counts=np.array([[2, 0, 1, 0], [2, 0, 1, 0], [3, 0, 1, 1], [1, 0, 0, 0]]),
+        weights=np.array([[2.0, 0, 1.0, 0], [2.0, 0, 1.0, 0], [3.0, 0, 1.0, 1.0], [0, 0, 0, 0]]),
+    )
+    report = simulate(arrays, flag_share=[0.2, 0.5], min_votes=[3, 5], weighted_flag_percent=[20, 30])
+
+    assert report["submissions"] == 4
+    assert [v["params"]["flag_share"] for v in report["count_rules"]] == [0.2, 0.2, 0.5, 0.5]
+
+    current = report["count_rules"][0]
+    assert current["changed"] == 0
+    assert current["decisions"] == {"pending": 1, "approved": 2, "rejected": 0, "escalated": 0, "flagged": 1}
+
+    assert report["count_rules"][1]["transitions"] == {"approved->pending": 2}
+    assert report["count_rules"][2]["transitions"] == {"flagged->approved": 1}
+
+    low_percent = report["weighted_rules"][0]
+    assert low_percent["transitions"] == {"approved->flagged": 1}
+    assert report["weighted_rules"][1]["changed"] == 0
+
+
+def test_simulate_large_grid_is_fast():
+    """Thousands of variants over many submissions evaluate in seconds"""
+    rng = np.random.default_rng(1)
+    n = 200_000
+    arrays = VoteArrays(
+        submission_ids=np.arange(n),
+        counts=rng.integers(0, 8, (n, 4)),
+        weights=np.round(rng.integers(0, 8, (n, 4)) * rng.choice([0.5, 1.0, 1.5], (n, 4)), 2),
+    )
+    start = time.monotonic()
+    report = simulate(
+        arrays,
+        urgent_flag_limit=range(1, 11),
+        flag_share=np.linspace(0.05, 0.5, 10).tolist(),
+        min_votes=range(1, 11),
+        weighted_flag_percent=range(10, 60, 5),
+    )
+    assert len(report["count_rules"]) == 1000
+    assert all(sum(v["decisions"].values()) == n for v in report["count_rules"])
+    assert time.monotonic() - start < 30
+
+
+@pytest_asyncio.fixture
+async def db(db_session):
+    db_session.add(Ring(genre="news", pubkeys=["aa"], epoch=1, active=True))
+    for submission_id, genre in [(1, "news"), (2, "tech"), (3, "news")]:
+        db_session.add(Submission(id=submission_id, genre=genre, content_ref="ref", submitter_ip_hash="hash"))
+    db_session.add_all(
+        Vote(
+            submission_id=submission_id, ring_id=1, signature_blob="{}", key_image=f"k{i}",
+            vote_type=vote_type, token_id="t", verified=verified
+        )
+        for i, (submission_id, vote_type, verified) in enumerate([
+            (1, "approve", True), (1, "flag", True), (1, "reject", False), (2, "reject", True)
+        ])
+    )
+    db_session.add(WeightedTally(submission_id=1, weight_approve=1.5, count_approve=1))
+    await db_session.commit()
+    return db_session
+
+
+@pytest.mark.asyncio
+async def test_load_vote_arrays(db):
+    """Verified counts and weighted sums load as aligned arrays"""
+    arrays = await tally_simulator.load_vote_arrays(db)
+    assert arrays.submission_ids.tolist() == [1, 2]
+    assert arrays.counts.tolist() == [[1, 0, 0, 1], [0, 0, 1, 0]]
+    assert arrays.weights.tolist() == [[1.5, 0, 0, 0], [0, 0, 0, 0]]
+
+    assert (await tally_simulator.load_vote_arrays(db, genre="tech")).submission_ids.tolist() == [2]
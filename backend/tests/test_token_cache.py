@@ -0,0 +1,100 @@
+"""
+Tests for the decoded-JWT verification cache in AuthService
+"""
+
+import time
+from datetime import timedelta
+
+import jwt
+
+from auth_service import AuthService, TokenCache
+
+
+def test_verify_token_uses_cache(monkeypatch):
+    """Second verification of the same token should not decode again"""
+    auth = AuthService()
+    token = auth.create_access_token(user_id=1, username="alice", role="reviewer")
+
+    first = auth.verify_token(token)
+    assert first["sub"] == "1"
+
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("jwt.decode called on cache hit")
+
+    monkeypatch.setattr(jwt, "decode", fail_decode)
+    assert auth.verify_token(token) is first
+    assert auth.token_cache.hits == 1
+
+
+def test_cached_claims_expire_with_token():
+    """Cached claims must not outlive the token's exp claim"""
+    cache = TokenCache(max_size=10)
+    key = cache.digest("token")
+    cache.put(key, {"sub": "1", "exp": 100})
+
+    assert cache.get(key, now=99) is not None
+    assert cache.get(key, now=100) is None
+    assert len(cache) == 0
+
+
+def test_expired_token_rejected():
+    """Expired tokens are rejected and never cached"""
+    auth = AuthService()
+    token = auth.create_access_token(
+        user_id=1, username="alice", role="reviewer",
+        expires_delta=timedelta(seconds=-1)
+    )
+
+    assert auth.verify_token(token) is None
+    assert len(auth.token_cache) == 0
+
+
+def test_cache_is_bounded():
+    """Least recently used entries are evicted past max_size"""
+    cache = TokenCache(max_size=2)
+    exp = time.time() + 60
+    keys = [cache.digest(f"token-{i}") for i in range(3)]
+    cache.put(keys[0], {"sub": "1", "exp": exp})
+    cache.put(keys[1], {"sub": "2", "exp": exp})
+    cache.get(keys[0])
+    cache.put(keys[2], {"sub": "3", "exp": exp})
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+def test_revoke_token():
+    """A revoked token fails verification even though its signature is valid"""
+    auth = AuthService()
+    token = auth.create_access_token(user_id=1, username="alice", role="reviewer")
+    other = auth.create_access_token(user_id=2, username="bob", role="reviewer")
+
+    assert auth.revoke_token(token) is True
+    assert auth.verify_token(token) is None
+    assert auth.verify_token(other) is not None
+
+
+def test_revoke_user_tokens():
+    """Revoking a user invalidates all tokens issued to them so far"""
+    auth = AuthService()
+    access = auth.create_access_token(user_id=7, username="carol", role="reviewer")
+    refresh = auth.create_refresh_token(user_id=7, username="carol")
+    assert auth.verify_token(access) is not None
+
+    auth.revoke_user_tokens(7)
+
+    assert auth.verify_token(access) is None
+    assert auth.verify_token(refresh) is None
+
+
+def test_tokens_issued_after_revocation_are_valid():
+    """Revoke all, then log in again within the same second"""
+    auth = AuthService()
+    old = auth.create_access_token(user_id=7, username="carol", role="reviewer")
+
+    auth.revoke_user_tokens(7)
+    new = auth.create_access_token(user_id=7, username="carol", role="reviewer")
+
+    assert auth.verify_token(old) is None
+    assert auth.verify_token(new) is not None
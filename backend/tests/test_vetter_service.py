@@ -0,0 +1,272 @@
+"""
+Tests for the vetter's persisted issuer key and blind signature issuance
+"""
+
+import hashlib
+import hmac
+import os
+import stat
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+import main
+import vetter_service
+from config import settings
+from database import get_db
+from middleware.auth_middleware import require_admin, require_vetter
+from models import AuditLog
+from schemas.auth_schemas import CurrentUser, UserRoleEnum
+from vetter_service import VetterService
+
+
+class FakeBlindSignature:
+    def __init__(self, signature):
+        self.signature = signature
+
+    def get_signature(self):
+        return self.signature
+
+
+class EphemeralBlindRsaKeyPair:
+    """Stands in for a pp_clsag_core.BlindRsaKeyPair that cannot be serialized"""
+
+    def __init__(self, bits, secret=None):
+        self.bits = bits
+        self.secret = secret or os.urandom(16)  # the "key" is an HMAC secret
+
+    def export_public_key(self):
+        return hashlib.sha256(self.secret).digest()
+
+    def sign_blinded_message(self, blinded_message):
+        if not blinded_message:
+            raise ValueError("empty blinded message")
+        return FakeBlindSignature(hmac.digest(self.secret, blinded_message, "sha256"))
+
+
+class FakeBlindRsaKeyPair(EphemeralBlindRsaKeyPair):
+    """Stands in for pp_clsag_core.BlindRsaKeyPair"""
+
+    @classmethod
+    def from_pkcs8_der(cls, der):
+        return cls(int.from_bytes(der[:2], "big"), der[2:])
+
+    def export_private_key_pkcs8_der(self):
+        return self.bits.to_bytes(2, "big") + self.secret
+
+    def sign_blinded_messages(self, blinded_messages):
+        return [self.sign_blinded_message(message) for message in blinded_messages]
+
+
+@pytest.fixture
+def crypto(monkeypatch):
+    monkeypatch.setattr(
+        vetter_service, "pp_clsag_core", SimpleNamespace(BlindRsaKeyPair=FakeBlindRsaKeyPair), raising=False
+    )
+    monkeypatch.setattr(vetter_service, "CRYPTO_AVAILABLE", True)
+    return vetter_service.pp_clsag_core
+
+
+@pytest.fixture
+def key_path(tmp_path):
+    return str(tmp_path / "keys" / "issuer.pk8")
+
+
+def _worker(key_path):
+    """A VetterService as started by one worker process"""
+    service = VetterService()
+    service.load_or_create_server_keypair(key_path, bits=512)
+    return service
+
+
+def test_key_is_created_once_and_shared(crypto, key_path):
+    first = _worker(key_path)
+    assert stat.S_IMODE(os.stat(key_path).st_mode) == 0o600
+    assert first.key_id == hashlib.sha256(first.public_key_bytes).hexdigest()[:16]
+
+    # A restart or a second worker signs with the same issuer key
+    second = _worker(key_path)
+    assert second.key_id == first.key_id
+    assert second.server_keypair.secret == first.server_keypair.secret
+
+
+def test_losing_the_creation_race_loads_the_winner(crypto, key_path):
+    winner = _worker(key_path)
+    loser = VetterService()
+    assert not loser._write_key_file(key_path, FakeBlindRsaKeyPair(512), replace=False)
+    assert os.listdir(os.path.dirname(key_path)) == ["issuer.pk8"]
+
+    loser.load_or_create_server_keypair(key_path, bits=512)
+    assert loser.key_id == winner.key_id
+
+
+def test_rotation_archives_the_retired_key(crypto, key_path):
+    service = _worker(key_path)
+    old_public_key = service.get_public_key()
+
+    old_key_id, new_key_id = service.rotate_server_keypair()
+    assert new_key_id == service.key_id != old_key_id
+    assert service.get_public_key() != old_public_key
+
+    with open(f"{key_path}.{old_key_id}", "rb") as f:
+        retired = FakeBlindRsaKeyPair.from_pkcs8_der(f.read())
+    assert retired.export_public_key() == old_public_key
+    assert stat.S_IMODE(os.stat(key_path).st_mode) == 0o600
+
+
+def test_other_workers_reload_a_rotated_key(crypto, key_path):
+    rotating, other = _worker(key_path), _worker(key_path)
+    rotating.rotate_server_keypair()
+
+    assert other.get_public_key() == rotating.get_public_key()
+    assert other.key_id == rotating.key_id
+
+    # No rotation, no reload
+    loaded = other.server_keypair
+    other.get_public_key()
+    assert other.server_keypair is loaded
+
+
+def test_ephemeral_key_cannot_be_rotated(crypto, key_path, monkeypatch):
+    monkeypatch.setattr(crypto, "BlindRsaKeyPair", EphemeralBlindRsaKeyPair)
+    service = _worker(key_path)
+    assert service.key_path is None
+    assert not os.path.exists(key_path)
+
+    with pytest.raises(RuntimeError):
+        service.rotate_server_keypair()
+
+
+@pytest.fixture
+def client(crypto, key_path, db_session, monkeypatch):
+    """The API with an admin/vetter caller and the test database"""
+    service = _worker(key_path)
+    monkeypatch.setattr(main, "get_vetter_service", lambda: service)
+
+    async def override_get_db():
+        yield db_session
+
+    main.app.dependency_overrides[get_db] = override_get_db
+    main.app.dependency_overrides[require_admin] = lambda: CurrentUser(
+        id=1, username="admin", role=UserRoleEnum.ADMIN
+    )
+    main.app.dependency_overrides[require_vetter] = lambda: CurrentUser(
+        id=2, username="vetter", role=UserRoleEnum.VETTER
+    )
+    yield TestClient(main.app), service
+    main.app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_rotate_key_endpoint_is_audited(client, db_session):
+    api, service = client
+    old_key_id = service.key_id
+
+    response = api.post("/api/v1/admin/vetter/rotate-key")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["old_key_id"] == old_key_id
+    assert body["key_id"] == service.key_id != old_key_id
+    assert body["public_key"] == service.public_key_bytes.hex()
+
+    audit = (await db_session.execute(
+        select(AuditLog).where(AuditLog.event_type == "vetter_key_rotated")
+    )).scalar_one()
+    assert audit.entity_id == service.key_id
+    assert audit.details["old_key_id"] == old_key_id
+
+
+def test_rotate_key_endpoint_rejects_ephemeral_keys(client):
+    api, service = client
+    service.key_path = None
+
+    response = api.post("/api/v1/admin/vetter/rotate-key")
+    assert response.status_code == 400
+
+
+async def _issued(db):
+    return (await db.execute(
+        select(AuditLog).where(AuditLog.event_type == "blind_signature_issued")
+    )).scalars().all()
+
+
+def _expected_signature(service, message):
+    return bytes(service.server_keypair.sign_blinded_message(message).get_signature())
+
+
+@pytest.mark.asyncio
+async def test_batch_signatures_are_returned_in_order(crypto, key_path, db_session):
+    service = _worker(key_path)
+    messages = [b"first", b"second", b"third"]
+
+    success, signatures, error = await service.issue_blind_signatures_batch(
+        messages, 2, db_session, {"cohort": "a"}
+    )
+    assert success and error is None
+    assert signatures == [_expected_signature(service, m) for m in messages]
+
+    audits = await _issued(db_session)
+    assert len(audits) == 3
+    assert {a.details["batch_size"] for a in audits} == {3}
+    assert {a.details["key_id"] for a in audits} == {service.key_id}
+
+
+@pytest.mark.asyncio
+async def test_batch_without_native_batch_signing(crypto, key_path, db_session):
+    """Crypto builds without sign_blinded_messages sign one message at a time"""
+    service = _worker(key_path)
+    service.server_keypair = EphemeralBlindRsaKeyPair(512, service.server_keypair.secret)
+
+    success, signatures, _ = await service.issue_blind_signatures_batch([b"a", b"b"], 2, db_session)
+    assert success
+    assert signatures == [_expected_signature(service, m) for m in (b"a", b"b")]
+
+
+@pytest.mark.asyncio
+async def test_one_unsignable_message_fails_the_whole_batch(crypto, key_path, db_session):
+    service = _worker(key_path)
+
+    success, signatures, error = await service.issue_blind_signatures_batch(
+        [b"a", b"", b"c"], 2, db_session
+    )
+    assert not success and signatures is None
+    assert "empty blinded message" in error
+    assert await _issued(db_session) == []
+
+
+def test_batch_endpoint_signs_hex_messages(client):
+    api, service = client
+    response = api.post("/api/v1/vetter/blind-sign/batch", json={"blinded_messages": ["aa", "bbcc"]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 2
+    assert body["key_id"] == service.key_id
+    assert body["blind_signatures"] == [
+        _expected_signature(service, bytes.fromhex(m)).hex() for m in ("aa", "bbcc")
+    ]
+
+
+@pytest.mark.parametrize("blinded_messages, detail", [
+    ([], "non-empty list"),
+    ("aa", "non-empty list"),
+    (["aa", "zz"], "blinded_messages[1]"),
+    (["aa", 5], "blinded_messages[1]"),
+    (["aa", ""], "empty blinded message"),
+])
+def test_batch_endpoint_rejects_bad_items(client, blinded_messages, detail):
+    api, _ = client
+    response = api.post("/api/v1/vetter/blind-sign/batch", json={"blinded_messages": blinded_messages})
+    assert response.status_code == 400
+    assert detail in response.json()["error"]
+
+
+def test_batch_endpoint_enforces_the_size_limit(client, monkeypatch):
+    api, _ = client
+    monkeypatch.setattr(settings, "VETTER_MAX_BATCH_SIZE", 2)
+
+    response = api.post("/api/v1/vetter/blind-sign/batch", json={"blinded_messages": ["aa"] * 3})
+    assert response.status_code == 400
+    assert "max 2" in response.json()["error"]
+    assert api.post("/api/v1/vetter/blind-sign/batch", json={"blinded_messages": ["aa"] * 2}).status_code == 200
@@ -0,0 +1,49 @@
+"""
+Tests for cold vote signature storage
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from models import Ring, Submission, Vote, VoteSignature
+from vote_service import VoteService
+
+SIGNATURE = '{"key_image": "ab", "c_0": "cd", "responses": ["ef", "01"]}'
+
+
+@pytest_asyncio.fixture
+async def db(db_session):
+    submission = Submission(genre="news", content_ref="ref", submitter_ip_hash="hash")
+    ring = Ring(genre="news", pubkeys=["aa"], epoch=1, active=True)
+    db_session.add_all([submission, ring])
+    await db_session.flush()
+    db_session.add(Vote(
+        submission_id=submission.id, ring_id=ring.id, signature_blob=SIGNATURE,
+        key_image="k1", vote_type="approve", token_id="t1", verified=True
+    ))
+    await db_session.commit()
+    return db_session
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_signature_round_trip(compress):
+    """Stored bytes decode to the original JSON with or without compression"""
+    row = VoteSignature.from_blob(SIGNATURE, compress=compress)
+    assert row.compression == ("zlib" if compress else None)
+    assert row.signature_blob == SIGNATURE
+
+
+@pytest.mark.asyncio
+async def test_signature_is_loaded_only_on_request(db):
+    """Plain vote loads never touch vote_signatures"""
+    db.expunge_all()
+    vote = (await db.execute(select(Vote))).scalar_one()
+    with pytest.raises(InvalidRequestError):
+        vote.signature
+
+    stored = await db.get(VoteSignature, vote.id)
+    assert stored.submission_id == vote.submission_id
+    assert await VoteService().get_vote_signature(vote.id, db) == SIGNATURE
+    assert await VoteService().get_vote_signature(vote.id + 1, db) is None
@@ -0,0 +1,85 @@
+"""
+Tests for materialized reputation-weighted tallies
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+
+from models import Reviewer, Ring, Submission, Token, Vote
+from tally_service import TallyService, reputation_weight
+
+
+@pytest_asyncio.fixture
+async def db(db_session):
+    db_session.add_all([
+        Submission(genre="news", content_ref="ref", submitter_ip_hash="hash"),
+        Ring(genre="news", pubkeys=["aa"], epoch=1, active=True),
+        Reviewer(credential_hash="high", reputation_score=150),
+        Reviewer(credential_hash="low", reputation_score=50),
+        Token(token_id="t-high", credential_hash="high", epoch=1),
+        Token(token_id="t-low", credential_hash="low", epoch=1),
+    ])
+    await db_session.commit()
+    return db_session
+
+
+async def _vote(db, tally, token_id, vote_type, key_image):
+    vote = Vote(
+        submission_id=1, ring_id=1, signature_blob="{}", key_image=key_image,
+        vote_type=vote_type, token_id=token_id, verified=True
+    )
+    db.add(vote)
+    weight = await tally.record_vote_weight(db, vote)
+    await db.commit()
+    return weight
+
+
+def test_reputation_weight_clamps():
+    """Missing or zero reputation counts as the default; extremes are clamped"""
+    assert reputation_weight(None) == reputation_weight(0) == 1.0
+    assert reputation_weight(-5) == 0.01
+    assert reputation_weight(500) == 2.0
+
+
+@pytest.mark.asyncio
+async def test_accepted_votes_increment_weighted_sums(db):
+    """Weights are captured at acceptance; reviewer-less tokens are not counted"""
+    tally = TallyService()
+    assert await _vote(db, tally, "t-high", "approve", "k1") == 1.5
+    assert await _vote(db, tally, "t-low", "reject", "k2") == 0.5
+    assert await _vote(db, tally, "t-high", "approve", "k3") == 1.5
+    assert await _vote(db, tally, "t-unknown", "reject", "k4") is None
+
+    result = await tally.compute_weighted_tally(1, db)
+    assert result["success"]
+    assert result["weighted_counts"] == {"approve": 3.0, "escalate": 0.0, "reject": 0.5, "flag": 0.0}
+    assert result["unweighted_counts"] == {"approve": 2, "escalate": 0, "reject": 1, "flag": 0}
+    assert result["total_reputation_weight"] == 3.5
+    assert result["decision"] == "approved"
+
+    empty = await tally.compute_weighted_tally(999, db)
+    assert empty["total_reputation_weight"] == 0
+    assert empty["decision"] == "pending"
+
+
+@pytest.mark.asyncio
+async def test_recompute_follows_reputation_changes(db):
+    """The bulk job re-derives weights and sums from current reputations"""
+    tally = TallyService()
+    await _vote(db, tally, "t-high", "approve", "k1")
+    await _vote(db, tally, "t-low", "reject", "k2")
+
+    await db.execute(
+        update(Reviewer).where(Reviewer.credential_hash == "low").values(reputation_score=200)
+    )
+    result = await tally.recompute_vote_weights(db, credential_hash="low")
+    assert result == {"votes_updated": 1, "submissions_rebuilt": 1}
+
+    weighted = await tally.compute_weighted_tally(1, db)
+    assert weighted["weighted_counts"]["approve"] == 1.5
+    assert weighted["weighted_counts"]["reject"] == 2.0
+    assert weighted["decision"] == "rejected"
+
+    assert (await tally.recompute_vote_weights(db))["submissions_rebuilt"] == 1
+    assert (await tally.compute_weighted_tally(1, db))["weighted_counts"] == weighted["weighted_counts"]
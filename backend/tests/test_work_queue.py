@@ -0,0 +1,93 @@
+"""
+Tests for the lease-based reviewer work queue
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from models import Submission, SubmissionStatus
+from work_queue_service import WorkQueueService
+
+
+@pytest_asyncio.fixture
+async def db(db_session):
+    start = datetime(2025, 1, 1)
+    db_session.add_all([
+        Submission(
+            genre="tech" if i % 2 else "news", content_ref=f"ref{i}",
+            submitter_ip_hash="hash", created_at=start + timedelta(minutes=i)
+        )
+        for i in range(6)
+    ])
+    db_session.add(Submission(
+        genre="news", content_ref="done", submitter_ip_hash="hash",
+        status=SubmissionStatus.APPROVED, created_at=start - timedelta(days=1)
+    ))
+    await db_session.commit()
+    return db_session
+
+
+def _ids(items):
+    return [item["id"] for item in items]
+
+
+@pytest.mark.asyncio
+async def test_reviewers_get_disjoint_oldest_work(db):
+    """Each claim takes the oldest unleased pending items"""
+    queue = WorkQueueService(lease_seconds=60)
+
+    first = await queue.claim(db, "1", limit=2)
+    second = await queue.claim(db, "2", limit=2)
+    assert _ids(first) == [1, 2]
+    assert _ids(second) == [3, 4]
+
+    # Retrying returns the leases already held instead of more work
+    assert _ids(await queue.claim(db, "1", limit=2)) == [1, 2]
+    assert await queue.queue_depth(db) == {"available": 2, "leased": 4}
+
+
+@pytest.mark.asyncio
+async def test_genre_filter_and_exclude(db):
+    """Claims can be limited to a genre and skip already handled items"""
+    queue = WorkQueueService(lease_seconds=60)
+
+    assert _ids(await queue.claim(db, "1", genre="tech", limit=5)) == [2, 4, 6]
+    assert _ids(await queue.claim(db, "2", genre="news", exclude=[1], limit=5)) == [3, 5]
+
+
+@pytest.mark.asyncio
+async def test_released_and_expired_leases_are_claimable(db):
+    """Only the holder can release; expired leases go back to the queue"""
+    queue = WorkQueueService(lease_seconds=60)
+    assert _ids(await queue.claim(db, "1")) == [1]
+
+    assert not await queue.release(db, 1, "2")
+    assert await queue.release(db, 1, "1")
+    assert _ids(await queue.claim(db, "2")) == [1]
+
+    expired = WorkQueueService(lease_seconds=-1)
+    assert _ids(await expired.claim(db, "3")) == [2]
+    assert _ids(await queue.claim(db, "4")) == [2]
+
+
+@pytest.mark.asyncio
+async def test_repeated_claims_do_not_extend_leases(db):
+    """Polling keeps returning held work but never pushes its expiry out"""
+    queue = WorkQueueService(lease_seconds=60)
+    first = await queue.claim(db, "1", limit=2)
+    again = await queue.claim(db, "1", limit=2)
+    assert [item["lease_expires_at"] for item in again] == [item["lease_expires_at"] for item in first]
+
+
+@pytest.mark.asyncio
+async def test_list_available_has_no_side_effects(db):
+    """Browsing shows free work and the caller's own leases, and leases nothing"""
+    queue = WorkQueueService(lease_seconds=60)
+    await queue.claim(db, "1", limit=1)
+    await queue.claim(db, "2", limit=1)
+
+    assert _ids(await queue.list_available(db, "1", limit=3)) == [1, 3, 4]
+    assert _ids(await queue.list_available(db, "3", genre="news")) == [3, 5]
+    assert await queue.queue_depth(db) == {"available": 4, "leased": 2}
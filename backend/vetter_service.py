@@ -4,9 +4,11 @@ ProofPals Vetter Service
 Handles blind signature issuance for reviewer credentials
 """
 
+import asyncio
 import logging
 import hashlib
-from typing import Optional, Dict, Any, Tuple
+import os
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -36,23 +38,149 @@ class VetterService:
         # Server keypair for blind signatures (2048-bit RSA)
         self.server_keypair = None
         self.public_key_bytes = None
+        self.key_id = None
+        self.key_path = None
+        self._key_version = None  # (inode, mtime) of the loaded key file
     
     def initialize_server_keypair(self, bits: int = 2048):
         """
-        Initialize server RSA keypair for blind signatures
+        Initialize an ephemeral server RSA keypair for blind signatures
         
         Args:
             bits: RSA key size (default 2048)
         """
         try:
             self.logger.info(f"Generating {bits}-bit RSA keypair for blind signatures...")
-            self.server_keypair = pp_clsag_core.BlindRsaKeyPair(bits)
-            self.public_key_bytes = self.server_keypair.export_public_key()
+            self._set_keypair(pp_clsag_core.BlindRsaKeyPair(bits))
             self.logger.info("Server keypair initialized successfully")
         except Exception as e:
             self.logger.error(f"Failed to initialize server keypair: {e}", exc_info=True)
             raise
     
+    def load_or_create_server_keypair(self, path: str, bits: int = 2048):
+        """
+        Load the persisted issuer keypair, creating it on first start
+        
+        The key is stored as PKCS#8 DER so every worker (and every restart)
+        signs with the same issuer key. When several workers start at once,
+        only one creates the file; the rest load it.
+        
+        Args:
+            path: PKCS#8 key file path
+            bits: RSA key size used if the key has to be created
+        """
+        if not hasattr(pp_clsag_core.BlindRsaKeyPair, "from_pkcs8_der"):
+            self.logger.warning("pp_clsag_core cannot serialize RSA keys; using an ephemeral keypair")
+            self.initialize_server_keypair(bits)
+            return
+        
+        self.key_path = path
+        if not os.path.exists(path):
+            self.logger.info(f"No issuer key at {path}, generating {bits}-bit RSA keypair...")
+            keypair = pp_clsag_core.BlindRsaKeyPair(bits)
+            if self._write_key_file(path, keypair, replace=False):
+                self._set_keypair(keypair)
+                self._key_version = self._file_version(os.stat(path))
+                self.logger.info(f"Created issuer key {self.key_id} at {path}")
+                return
+        
+        self._load_key_file(path)
+        self.logger.info(f"Loaded issuer key {self.key_id} from {path}")
+    
+    def rotate_server_keypair(self, bits: Optional[int] = None) -> Tuple[str, str]:
+        """
+        Replace the persisted issuer key with a freshly generated one
+        
+        The retired key is kept next to the active one as
+        ``<path>.<key_id>`` for audit. Other workers pick up the new key
+        on their next signing or public-key request.
+        
+        Args:
+            bits: RSA key size (defaults to the current key size)
+            
+        Returns:
+            Tuple of (old_key_id, new_key_id)
+        """
+        if not self.key_path:
+            raise RuntimeError("Issuer key is not persisted; rotation unavailable")
+        
+        old_key_id = self.key_id
+        keypair = pp_clsag_core.BlindRsaKeyPair(bits or self.server_keypair.bits)
+        
+        if os.path.exists(self.key_path):
+            os.replace(self.key_path, f"{self.key_path}.{old_key_id}")
+        self._write_key_file(self.key_path, keypair, replace=True)
+        self._set_keypair(keypair)
+        self._key_version = self._file_version(os.stat(self.key_path))
+        
+        self.logger.info(f"Rotated issuer key {old_key_id} -> {self.key_id}")
+        return old_key_id, self.key_id
+    
+    def _set_keypair(self, keypair):
+        """Install a keypair and derive its public key and key id"""
+        self.server_keypair = keypair
+        self.public_key_bytes = bytes(keypair.export_public_key())
+        self.key_id = hashlib.sha256(self.public_key_bytes).hexdigest()[:16]
+    
+    def _load_key_file(self, path: str):
+        """Load the issuer keypair from a PKCS#8 DER file"""
+        with open(path, "rb") as f:
+            der = f.read()
+            self._key_version = self._file_version(os.fstat(f.fileno()))
+        self._set_keypair(pp_clsag_core.BlindRsaKeyPair.from_pkcs8_der(der))
+    
+    def _write_key_file(self, path: str, keypair, replace: bool) -> bool:
+        """
+        Atomically write a keypair to disk with owner-only permissions
+        
+        Returns:
+            False if replace is off and another process created the file first
+        """
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(bytes(keypair.export_private_key_pkcs8_der()))
+                f.flush()
+                os.fsync(f.fileno())
+            if replace:
+                os.replace(tmp_path, path)
+                return True
+            try:
+                # link() fails if the target exists, so exactly one worker wins
+                os.link(tmp_path, path)
+                return True
+            except FileExistsError:
+                return False
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    
+    @staticmethod
+    def _file_version(st: os.stat_result) -> Tuple[int, int]:
+        """
+        Identify one write of the key file
+        
+        Rotation replaces the file, so the inode changes even when the new
+        file lands within the same (coarse) mtime tick as the old one.
+        """
+        return st.st_ino, st.st_mtime_ns
+    
+    def _reload_if_rotated(self):
+        """Pick up a key rotated by another worker"""
+        if not self.key_path:
+            return
+        try:
+            version = self._file_version(os.stat(self.key_path))
+        except FileNotFoundError:
+            return
+        if version != self._key_version:
+            self._load_key_file(self.key_path)
+            self.logger.info(f"Reloaded rotated issuer key {self.key_id}")
+    
     def get_public_key(self) -> bytes:
         """
         Get server's public key for client blinding
@@ -60,6 +188,7 @@ class VetterService:
         Returns:
             Public key bytes
         """
+        self._reload_if_rotated()
         if not self.public_key_bytes:
             raise RuntimeError("Server keypair not initialized")
         
@@ -88,12 +217,15 @@ class VetterService:
             Tuple of (success, signature_bytes, error_message)
         """
         try:
+            self._reload_if_rotated()
             if not self.server_keypair:
                 return False, None, "Server keypair not initialized"
             
-            # Sign the blinded message
-            blind_signature = self.server_keypair.sign_blinded_message(blinded_message)
-            signature_bytes = blind_signature.get_signature()
+            # Sign the blinded message (releases the GIL, so run it off the event loop)
+            blind_signature = await asyncio.to_thread(
+                self.server_keypair.sign_blinded_message, blinded_message
+            )
+            signature_bytes = bytes(blind_signature.get_signature())
             
             # Log the issuance for audit
             await self._log_audit(
@@ -103,6 +235,7 @@ class VetterService:
                 f"vetter_{vetter_id}",
                 {
                     "vetter_id": vetter_id,
+                    "key_id": self.key_id,
                     "blinded_message_hash": hashlib.sha256(blinded_message).hexdigest()[:16],
                     "metadata": metadata or {}
                 }
@@ -118,6 +251,75 @@ class VetterService:
             self.logger.error(f"Error issuing blind signature: {e}", exc_info=True)
             return False, None, f"Failed to issue signature: {str(e)}"
     
+    async def issue_blind_signatures_batch(
+        self,
+        blinded_messages: List[bytes],
+        vetter_id: int,
+        db: AsyncSession,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Tuple[bool, Optional[List[bytes]], Optional[str]]:
+        """
+        Issue blind signatures for many blinded messages at once
+        
+        Messages are signed in parallel by the crypto library and the
+        issuances are audited in a single commit.
+        
+        Args:
+            blinded_messages: Blinded messages from clients
+            vetter_id: ID of vetter issuing signatures
+            db: Database session
+            metadata: Optional metadata about the issuance
+            
+        Returns:
+            Tuple of (success, signatures in input order, error_message)
+        """
+        try:
+            self._reload_if_rotated()
+            if not self.server_keypair:
+                return False, None, "Server keypair not initialized"
+            
+            if hasattr(self.server_keypair, "sign_blinded_messages"):
+                blind_signatures = await asyncio.to_thread(
+                    self.server_keypair.sign_blinded_messages, blinded_messages
+                )
+            else:
+                blind_signatures = [
+                    await asyncio.to_thread(self.server_keypair.sign_blinded_message, message)
+                    for message in blinded_messages
+                ]
+            signatures = [bytes(sig.get_signature()) for sig in blind_signatures]
+            
+            # One audit row per issuance, committed together
+            now = datetime.utcnow()
+            db.add_all([
+                AuditLog(
+                    event_type="blind_signature_issued",
+                    entity_type="blind_signature",
+                    entity_id=f"vetter_{vetter_id}",
+                    details={
+                        "vetter_id": vetter_id,
+                        "key_id": self.key_id,
+                        "blinded_message_hash": hashlib.sha256(message).hexdigest()[:16],
+                        "batch_size": len(blinded_messages),
+                        "metadata": metadata or {}
+                    },
+                    timestamp=now
+                )
+                for message in blinded_messages
+            ])
+            await db.commit()
+            
+            self.logger.info(
+                f"{len(signatures)} blind signatures issued by vetter {vetter_id}"
+            )
+            
+            return True, signatures, None
+            
+        except Exception as e:
+            self.logger.error(f"Error issuing blind signature batch: {e}", exc_info=True)
+            await db.rollback()
+            return False, None, f"Failed to issue signatures: {str(e)}"
+    
     async def register_credential(
         self,
         credential_hash: str,
@@ -387,6 +589,9 @@ def get_vetter_service() -> VetterService:
     global _vetter_service
     if _vetter_service is None:
         _vetter_service = VetterService()
-        # Initialize with 2048-bit RSA (production-ready)
-        _vetter_service.initialize_server_keypair(2048)
+        # Shared, persisted issuer key (2048-bit RSA by default)
+        _vetter_service.load_or_create_server_keypair(
+            settings.VETTER_KEY_PATH,
+            settings.VETTER_KEY_BITS
+        )
     return _vetter_service
@@ -8,10 +8,14 @@ from typing import Optional, Dict, Any
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
-from models import Vote, Ring, Submission, VoteType, AuditLog
+from models import Vote, VoteNullifier, VoteSignature, Ring, Submission, VoteType, AuditLog
 from crypto_service import get_crypto_service
 from token_service import get_token_service
+from stats_service import get_stats_service
+from tally_service import get_tally_service
+from event_bus import get_event_bus
 
 logger = logging.getLogger(__name__)
 
@@ -120,29 +124,13 @@ class VoteService:
             
             key_image = verification_result.key_image
             
-            # STEP 4: Check for duplicate vote (same key_image + submission)
-            result = await db.execute(
-                select(Vote).where(
-                    Vote.submission_id == submission_id,
-                    Vote.key_image == key_image
-                )
-            )
-            existing_vote = result.scalar_one_or_none()
+            # STEP 4: Check for duplicate vote (same key_image + submission).
+            # vote_nullifiers is keyed on exactly this pair, so this is a
+            # primary key lookup regardless of how votes is partitioned.
+            existing_vote = await db.get(VoteNullifier, (submission_id, key_image))
             
             if existing_vote:
-                self.logger.warning(
-                    f"Duplicate vote detected: submission={submission_id}, "
-                    f"key_image={key_image[:16]}..."
-                )
-                await self._log_audit(
-                    db, "vote_failed", "vote", str(submission_id),
-                    {"reason": "duplicate_vote", "key_image": key_image[:16]},
-                    ip_address
-                )
-                return {
-                    "success": False,
-                    "error": "Duplicate vote: This credential has already voted on this submission"
-                }
+                return await self._duplicate_vote(db, submission_id, key_image, ip_address)
             
             # STEP 5: Verify submission exists
             result = await db.execute(
@@ -170,8 +158,18 @@ class VoteService:
             )
             
             db.add(vote)
-            await db.commit()
+            db.add(VoteNullifier(submission_id=submission_id, key_image=key_image))
+            try:
+                await get_tally_service().record_vote_weight(db, vote)
+                await db.commit()
+            except IntegrityError:
+                # A concurrent request recorded the same key image first
+                await db.rollback()
+                return await self._duplicate_vote(db, submission_id, key_image, ip_address)
             await db.refresh(vote)
+            get_stats_service().record_vote(vote_type)
+            await get_tally_service().cache.invalidate(submission_id)
+            await get_event_bus().publish_vote(submission_id, vote_type)
             
             # STEP 7: Log successful vote
             await self._log_audit(
@@ -206,6 +204,28 @@ class VoteService:
                 "error": f"Vote submission failed: {str(e)}"
             }
     
+    async def _duplicate_vote(
+        self,
+        db: AsyncSession,
+        submission_id: int,
+        key_image: str,
+        ip_address: Optional[str]
+    ) -> Dict[str, Any]:
+        """Log and build the response for a repeated key image"""
+        self.logger.warning(
+            f"Duplicate vote detected: submission={submission_id}, "
+            f"key_image={key_image[:16]}..."
+        )
+        await self._log_audit(
+            db, "vote_failed", "vote", str(submission_id),
+            {"reason": "duplicate_vote", "key_image": key_image[:16]},
+            ip_address
+        )
+        return {
+            "success": False,
+            "error": "Duplicate vote: This credential has already voted on this submission"
+        }
+    
     async def get_vote_count(
         self,
         submission_id: int,
@@ -297,21 +317,35 @@ class VoteService:
             True if already voted, False otherwise
         """
         try:
-            result = await db.execute(
-                select(Vote).where(
-                    Vote.submission_id == submission_id,
-                    Vote.key_image == key_image,
-                    Vote.verified == True
-                )
-            )
-            
-            vote = result.scalar_one_or_none()
-            return vote is not None
+            nullifier = await db.get(VoteNullifier, (submission_id, key_image))
+            return nullifier is not None
             
         except Exception as e:
             self.logger.error(f"Error checking vote status: {e}", exc_info=True)
             return False
     
+    async def get_vote_signature(
+        self,
+        vote_id: int,
+        db: AsyncSession
+    ) -> Optional[str]:
+        """
+        Load the stored signature of a vote for audit or re-verification
+        
+        Args:
+            vote_id: Vote ID
+            db: Database session
+            
+        Returns:
+            Signature JSON string, or None if not stored
+        """
+        result = await db.execute(
+            select(VoteSignature.signature, VoteSignature.compression)
+            .where(VoteSignature.vote_id == vote_id)
+        )
+        row = result.first()
+        return VoteSignature.decode(row.signature, row.compression) if row else None
+    
     async def _log_audit(
         self,
         db: AsyncSession,
@@ -0,0 +1,196 @@
+"""
+ProofPals Work Queue Service
+Hands pending submissions to reviewers under short leases so concurrent
+reviewers get disjoint work
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Submission, SubmissionStatus
+from config import settings
+
+
+class WorkQueueService:
+    """
+    Lease-based reviewer work queue over pending submissions
+
+    A claim picks the oldest pending submissions whose lease is free or
+    expired with ``FOR UPDATE SKIP LOCKED``, so concurrent claims never
+    wait on or receive the same rows, and stamps them with the caller's
+    lease in the same statement. The partial pending indexes keep the scan
+    proportional to the items returned, not to the table size. Leases are
+    never extended, so work a reviewer abandons returns to the queue after
+    WORK_QUEUE_LEASE_SECONDS however often they poll; accepting their vote
+    releases it at once. Expired leases need no sweeper: they are simply
+    claimable again.
+    """
+
+    def __init__(self, lease_seconds: Optional[int] = None):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.lease_seconds = settings.WORK_QUEUE_LEASE_SECONDS if lease_seconds is None else lease_seconds
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    def _lease_free(self, now: datetime):
+        return or_(Submission.lease_expires_at.is_(None), Submission.lease_expires_at < now)
+
+    async def claim(
+        self,
+        db: AsyncSession,
+        owner: str,
+        genre: Optional[str] = None,
+        limit: int = 1,
+        exclude: Sequence[int] = ()
+    ) -> List[Dict[str, Any]]:
+        """
+        Lease up to ``limit`` pending submissions to ``owner``
+
+        Leases the owner still holds are returned first, unchanged, so
+        retrying a claim neither hands out more work nor keeps old work
+        reserved past its original expiry.
+
+        Args:
+            db: Database session
+            owner: Lease holder (reviewer user id)
+            genre: Only claim submissions of this genre
+            limit: Maximum number of submissions
+            exclude: Submission IDs the reviewer has already handled
+
+        Returns:
+            List of {"id", "genre", "content_ref", "created_at", "lease_expires_at"}
+        """
+        now = self._now()
+        expires = now + timedelta(seconds=self.lease_seconds)
+        returning = (
+            Submission.id, Submission.genre, Submission.content_ref,
+            Submission.created_at, Submission.lease_expires_at
+        )
+
+        held_filter = [
+            Submission.status == SubmissionStatus.PENDING,
+            Submission.lease_owner == owner,
+            Submission.lease_expires_at >= now,
+        ]
+        if genre:
+            held_filter.append(Submission.genre == genre)
+        if exclude:
+            held_filter.append(Submission.id.notin_(exclude))
+
+        result = await db.execute(select(*returning).where(*held_filter))
+        claimed = [dict(row._mapping) for row in result]
+
+        remaining = limit - len(claimed)
+        if remaining > 0:
+            candidates = (
+                select(Submission.id)
+                .where(Submission.status == SubmissionStatus.PENDING, self._lease_free(now))
+                .order_by(Submission.created_at, Submission.id)
+                .limit(remaining)
+                .with_for_update(skip_locked=True)
+            )
+            if genre:
+                candidates = candidates.where(Submission.genre == genre)
+            if exclude:
+                candidates = candidates.where(Submission.id.notin_(exclude))
+
+            result = await db.execute(
+                update(Submission)
+                .where(Submission.id.in_(candidates.scalar_subquery()))
+                .values(lease_owner=owner, lease_expires_at=expires)
+                .returning(*returning)
+                .execution_options(synchronize_session=False)
+            )
+            claimed.extend(dict(row._mapping) for row in result)
+
+        await db.commit()
+        claimed.sort(key=lambda item: (item["created_at"], item["id"]))
+        claimed = claimed[:limit]
+        if claimed:
+            self.logger.debug(f"Leased submissions {[item['id'] for item in claimed]} to {owner}")
+        return claimed
+
+    async def list_available(
+        self,
+        db: AsyncSession,
+        owner: str,
+        genre: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Pending submissions ``owner`` could review, without leasing anything
+
+        Includes free submissions and those leased to ``owner``; work leased
+        to other reviewers is hidden.
+
+        Returns:
+            List of {"id", "genre", "content_ref", "created_at", "lease_expires_at"}
+        """
+        now = self._now()
+        stmt = (
+            select(
+                Submission.id, Submission.genre, Submission.content_ref,
+                Submission.created_at, Submission.lease_expires_at
+            )
+            .where(
+                Submission.status == SubmissionStatus.PENDING,
+                or_(self._lease_free(now), Submission.lease_owner == owner)
+            )
+            .order_by(Submission.created_at, Submission.id)
+            .limit(limit)
+        )
+        if genre:
+            stmt = stmt.where(Submission.genre == genre)
+        return [dict(row._mapping) for row in await db.execute(stmt)]
+
+    async def release(self, db: AsyncSession, submission_id: int, owner: str) -> bool:
+        """
+        Give a leased submission back to the queue
+
+        Returns:
+            True if ``owner`` held the lease
+        """
+        result = await db.execute(
+            update(Submission)
+            .where(Submission.id == submission_id, Submission.lease_owner == owner)
+            .values(lease_owner=None, lease_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount > 0
+
+    async def queue_depth(self, db: AsyncSession, genre: Optional[str] = None) -> Dict[str, int]:
+        """
+        Count pending submissions that are free to claim and currently leased
+
+        Returns:
+            {"available", "leased"}
+        """
+        now = self._now()
+        stmt = select(
+            func.count(Submission.id).filter(self._lease_free(now)),
+            func.count(Submission.id).filter(Submission.lease_expires_at >= now)
+        ).where(Submission.status == SubmissionStatus.PENDING)
+        if genre:
+            stmt = stmt.where(Submission.genre == genre)
+
+        available, leased = (await db.execute(stmt)).one()
+        return {"available": available, "leased": leased}
+
+
+# Global work queue service instance
+_work_queue_service: Optional[WorkQueueService] = None
+
+
+def get_work_queue_service() -> WorkQueueService:
+    """Get global work queue service instance"""
+    global _work_queue_service
+    if _work_queue_service is None:
+        _work_queue_service = WorkQueueService()
+    return _work_queue_service
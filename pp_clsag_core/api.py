@@ -58,6 +58,26 @@ class PPCLSAGCore:
         """
         return pp_clsag_core.derive_keypair(seed)
     
+    @staticmethod
+    def derive_keypairs(n: int) -> List[Tuple[bytes, bytes, bytes]]:
+        """
+        Generate many fresh keypairs in a single call.
+        
+        Args:
+            n (int): Number of keypairs to generate
+            
+        Returns:
+            List[Tuple[bytes, bytes, bytes]]: (seed, secret_key, public_key) triples,
+            each derived exactly as derive_keypair(seed) would
+            
+        Example:
+            >>> keypairs = PPCLSAGCore.derive_keypairs(100)
+            >>> seed, sk, pk = keypairs[0]
+            >>> print(len(keypairs))
+            100
+        """
+        return pp_clsag_core.derive_keypairs(n)
+    
     @staticmethod
     def key_image(secret_key: bytes, public_key: bytes, context: bytes) -> bytes:
         """
@@ -303,6 +323,26 @@ class BlindRSASigner:
         """
         return keypair.sign_blinded_message(blinded_data)
     
+    @staticmethod
+    def sign_blinded_batch(blinded_data: List[bytes], 
+                           keypair: pp_clsag_core.BlindRsaKeyPair) -> List[pp_clsag_core.BlindSignature]:
+        """
+        Sign many blinded messages in parallel (server-side operation).
+        
+        Args:
+            blinded_data (List[bytes]): The blinded messages
+            keypair (BlindRsaKeyPair): Server's keypair
+            
+        Returns:
+            List[BlindSignature]: Blind signatures in input order
+            
+        Example:
+            >>> sigs = BlindRSASigner.sign_blinded_batch([b.get_blinded_message() for b in blinded], keypair)
+            >>> print(len(sigs) == len(blinded))
+            True
+        """
+        return keypair.sign_blinded_messages(blinded_data)
+    
     @staticmethod
     def unblind_signature(blinded_message: pp_clsag_core.BlindedMessage, 
                          blind_signature: pp_clsag_core.BlindSignature, 
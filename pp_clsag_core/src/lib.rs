@@ -15,6 +15,7 @@ use rsa::{RsaPrivateKey, RsaPublicKey};
 use rsa::traits::PublicKeyParts;
 use merlin::Transcript;
 use rsa::pkcs1v15::{SigningKey, VerifyingKey};
+use rsa::pkcs8::{DecodePrivateKey, EncodePrivateKey};
 use rsa::signature::{Signer, Verifier, SignatureEncoding};
 use num_bigint::BigUint;
 
@@ -427,6 +428,8 @@ pub struct BlindRsaKeyPair {
     pub bits: usize,
     private_key: RsaPrivateKey,
     public_key: RsaPublicKey,
+    // Built once so signing does not clone the private key per call
+    signing_key: SigningKey<Sha512>,
 }
 
 /// Represents a blinded message from the client
@@ -456,13 +459,30 @@ impl BlindRsaKeyPair {
         let mut rng = OsRng;
         let private_key = RsaPrivateKey::new(&mut rng, bits)
             .map_err(|e| PyValueError::new_err(format!("Failed to generate RSA key: {}", e)))?;
-        let public_key = RsaPublicKey::from(&private_key);
         
-        Ok(BlindRsaKeyPair {
-            bits,
-            private_key,
-            public_key,
-        })
+        Self::from_private_key(bits, private_key)
+    }
+    
+    /// Load a keypair from a PKCS#8 DER-encoded RSA private key
+    #[staticmethod]
+    pub fn from_pkcs8_der(der: &[u8]) -> PyResult<Self> {
+        let private_key = RsaPrivateKey::from_pkcs8_der(der)
+            .map_err(|e| PyValueError::new_err(format!("Invalid PKCS#8 RSA key: {}", e)))?;
+        let bits = private_key.size() * 8;
+        if bits < 512 || bits > 8192 {
+            return Err(PPCLSAGError::InvalidKeySize(
+                format!("Key size {} bits is not supported. Must be between 512 and 8192 bits", bits)
+            ).into());
+        }
+        
+        Self::from_private_key(bits, private_key)
+    }
+    
+    /// Export the private key as PKCS#8 DER for persistence
+    pub fn export_private_key_pkcs8_der(&self) -> PyResult<Vec<u8>> {
+        let document = self.private_key.to_pkcs8_der()
+            .map_err(|e| PyValueError::new_err(format!("Failed to encode RSA key: {}", e)))?;
+        Ok(document.as_bytes().to_vec())
     }
     
     /// Export the public key for distribution to clients
@@ -481,13 +501,61 @@ impl BlindRsaKeyPair {
     }
     
     /// Sign a blinded message using the server's private key
-    pub fn sign_blinded_message(&self, blinded_message: &[u8]) -> PyResult<BlindSignature> {
-        let signing_key = SigningKey::<Sha512>::new_unprefixed(self.private_key.clone());
+    pub fn sign_blinded_message(&self, py: Python<'_>, blinded_message: &[u8]) -> PyResult<BlindSignature> {
+        let signing_key = &self.signing_key;
+        let signature = py.allow_threads(|| signing_key.sign(blinded_message).to_vec());
+        
+        Ok(BlindSignature { signature })
+    }
+    
+    /// Sign many blinded messages, spread across CPU cores without the GIL.
+    /// Signatures are returned in input order.
+    pub fn sign_blinded_messages(&self, py: Python<'_>, blinded_messages: Vec<Vec<u8>>) -> PyResult<Vec<BlindSignature>> {
+        if blinded_messages.is_empty() {
+            return Ok(Vec::new());
+        }
+        
+        let signing_key = &self.signing_key;
+        let signatures = py.allow_threads(|| {
+            let threads = std::thread::available_parallelism()
+                .map(|n| n.get())
+                .unwrap_or(1)
+                .min(blinded_messages.len());
+            let chunk_size = (blinded_messages.len() + threads - 1) / threads;
+            
+            std::thread::scope(|scope| {
+                let handles: Vec<_> = blinded_messages
+                    .chunks(chunk_size)
+                    .map(|chunk| scope.spawn(move || {
+                        chunk.iter()
+                            .map(|message| signing_key.sign(message).to_vec())
+                            .collect::<Vec<_>>()
+                    }))
+                    .collect();
+                
+                handles.into_iter()
+                    .flat_map(|handle| handle.join().expect("signing thread panicked"))
+                    .collect::<Vec<_>>()
+            })
+        });
         
-        let signature = signing_key.sign(blinded_message);
+        Ok(signatures.into_iter().map(|signature| BlindSignature { signature }).collect())
+    }
+}
+
+impl BlindRsaKeyPair {
+    /// Build a keypair with CRT parameters precomputed and the signing key cached
+    fn from_private_key(bits: usize, mut private_key: RsaPrivateKey) -> PyResult<Self> {
+        private_key.precompute()
+            .map_err(|e| PyValueError::new_err(format!("Failed to precompute RSA CRT values: {}", e)))?;
+        let public_key = RsaPublicKey::from(&private_key);
+        let signing_key = SigningKey::<Sha512>::new_unprefixed(private_key.clone());
         
-        Ok(BlindSignature {
-            signature: signature.to_vec(),
+        Ok(BlindRsaKeyPair {
+            bits,
+            private_key,
+            public_key,
+            signing_key,
         })
     }
 }
@@ -645,6 +713,11 @@ mod tests {
     use super::*;
     use rand::rngs::OsRng;
     
+    fn sign_blinded(keypair: &BlindRsaKeyPair, blinded_data: &[u8]) -> BlindSignature {
+        pyo3::prepare_freethreaded_python();
+        Python::with_gil(|py| keypair.sign_blinded_message(py, blinded_data)).unwrap()
+    }
+    
     // Blind RSA tests
     #[test]
     fn test_blind_rsa_end_to_end() {
@@ -658,7 +731,7 @@ mod tests {
         let blinded_data = blinded_message.get_blinded_message();
         
         // Server: Sign the blinded message
-        let blind_signature = server_keypair.sign_blinded_message(&blinded_data).unwrap();
+        let blind_signature = sign_blinded(&server_keypair, &blinded_data);
         
         // Client: Unblind the signature
         let unblinded_signature = blinded_message.unblind(&blind_signature, &public_key).unwrap();
@@ -686,8 +759,8 @@ mod tests {
         assert_ne!(blinded_data1, blinded_data2);
         
         // Server: Sign both blinded messages
-        let blind_signature1 = server_keypair.sign_blinded_message(&blinded_data1).unwrap();
-        let blind_signature2 = server_keypair.sign_blinded_message(&blinded_data2).unwrap();
+        let blind_signature1 = sign_blinded(&server_keypair, &blinded_data1);
+        let blind_signature2 = sign_blinded(&server_keypair, &blinded_data2);
         
         // Client: Unblind both signatures
         let unblinded_signature1 = blinded_message1.unblind(&blind_signature1, &public_key).unwrap();
@@ -716,7 +789,7 @@ mod tests {
         let blinded_data = blinded_message.get_blinded_message();
         
         // Server: Sign the blinded message
-        let blind_signature = server_keypair.sign_blinded_message(&blinded_data).unwrap();
+        let blind_signature = sign_blinded(&server_keypair, &blinded_data);
         
         // Client: Unblind the signature
         let unblinded_signature = blinded_message.unblind(&blind_signature, &public_key).unwrap();
@@ -729,6 +802,26 @@ mod tests {
         assert!(!is_valid);
     }
     
+    #[test]
+    fn test_blind_rsa_batch_matches_single() {
+        let server_keypair = BlindRsaKeyPair::new(1024).unwrap();
+        let public_key = server_keypair.export_public_key();
+        
+        let blinded: Vec<Vec<u8>> = (0..9)
+            .map(|i| BlindedMessage::blind(format!("message {}", i).as_bytes(), &public_key)
+                .unwrap()
+                .get_blinded_message())
+            .collect();
+        
+        pyo3::prepare_freethreaded_python();
+        let batch = Python::with_gil(|py| server_keypair.sign_blinded_messages(py, blinded.clone())).unwrap();
+        
+        assert_eq!(batch.len(), blinded.len());
+        for (data, signature) in blinded.iter().zip(batch.iter()) {
+            assert_eq!(sign_blinded(&server_keypair, data).signature, signature.signature);
+        }
+    }
+    
     // Property-based tests using proptest
     #[cfg(feature = "proptest")]
     mod proptest_tests {
@@ -874,6 +967,27 @@ fn derive_keypair(seed: Vec<u8>) -> PyResult<(Vec<u8>, Vec<u8>)> {
     keygen_from_seed(&seed, b"")
 }
 
+/// Generate `n` fresh (seed, sk, pk) triples in one call.
+/// Seeds come from OsRng and keys are derived exactly as in `derive_keypair`;
+/// the work runs without holding the GIL so a background refill does not
+/// stall request handling.
+#[pyfunction]
+fn derive_keypairs(py: Python<'_>, n: usize) -> PyResult<Vec<(Vec<u8>, Vec<u8>, Vec<u8>)>> {
+    if n > 100_000 {
+        return Err(PyValueError::new_err("n must be at most 100000"));
+    }
+    py.allow_threads(|| {
+        let mut keypairs = Vec::with_capacity(n);
+        for _ in 0..n {
+            let mut seed = vec![0u8; 32];
+            OsRng.fill_bytes(&mut seed);
+            let (sk, pk) = keygen_from_seed(&seed, b"")?;
+            keypairs.push((seed, sk, pk));
+        }
+        Ok(keypairs)
+    })
+}
+
 /// Canonicalize a ring of public keys by sorting them lexicographically
 #[pyfunction]
 fn canonicalize_ring(pubkeys: Vec<Vec<u8>>) -> PyResult<Vec<Vec<u8>>> {
@@ -2334,6 +2448,7 @@ fn pp_clsag_core(_py: Python<'_>, m: &Bound<'_, PyModule>) -> PyResult<()> {
     // New canonical API wrappers
     m.add_function(wrap_pyfunction!(generate_seed, m)?)?;
     m.add_function(wrap_pyfunction!(derive_keypair, m)?)?;
+    m.add_function(wrap_pyfunction!(derive_keypairs, m)?)?;
     m.add_function(wrap_pyfunction!(canonicalize_ring, m)?)?;
     m.add_function(wrap_pyfunction!(canonical_message, m)?)?;
     